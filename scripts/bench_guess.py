@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Compare validated and trusted model construction on the guess path.
+
+Run from the repository root: ``python -m scripts.bench_guess``. Each case
+builds the same objects twice, once through pydantic validation (how the
+code used to do it) and once through the trusted path it uses now, and
+reports CPU time and memory per object. "guess body" is the API boundary:
+FastAPI revalidating a returned model versus serializing it directly.
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.gungle.database import FirearmDB
+from src.gungle.models.firearm import (
+    ActionType,
+    AttributeComparison,
+    Caliber,
+    ComparisonResult,
+    Firearm,
+    FirearmType,
+    GuessResult,
+    ModelType,
+)
+from src.gungle.repositories.db_firearm_repository import (
+    firearm_from_db,
+    firearm_to_db,
+)
+from src.gungle.repositories.test_firearm_repository import TestFirearmRepository
+from src.gungle.services.comparison import (
+    _DISPLAY,
+    ATTRIBUTES,
+    AttributeEncoder,
+    build_comparisons,
+    compare_codes,
+)
+from src.gungle.utils.models import construct_trusted
+
+
+def validated_firearm_from_db(firearm_db: FirearmDB) -> Firearm:
+    return Firearm(
+        id=str(firearm_db.id),
+        name=str(firearm_db.name),
+        manufacturer=str(firearm_db.manufacturer),
+        type=FirearmType(str(firearm_db.type)),
+        caliber=Caliber(str(firearm_db.caliber)),
+        country_of_origin=str(firearm_db.country_of_origin),
+        model_type=ModelType(str(firearm_db.model_type)),
+        action_type=ActionType(str(firearm_db.action_type)),
+        year_introduced=int(firearm_db.year_introduced),
+        description=str(firearm_db.description),
+        image_url=str(firearm_db.image_url),
+        aliases=json.loads(str(firearm_db.aliases or "[]")),
+    )
+
+
+def validated_guess_result(guess: Firearm, target: Firearm, mask: int) -> GuessResult:
+    return GuessResult(
+        is_correct=guess.id == target.id,
+        guess_firearm=guess,
+        target_firearm=target,
+        comparisons=[
+            AttributeComparison(
+                attribute=attribute,
+                guess_value=display(guess),
+                correct_value=display(target),
+                result=(
+                    ComparisonResult.CORRECT
+                    if mask >> bit & 1
+                    else ComparisonResult.INCORRECT
+                ),
+            )
+            for bit, (attribute, display) in enumerate(zip(ATTRIBUTES, _DISPLAY))
+        ],
+        remaining_guesses=3,
+        game_completed=False,
+    )
+
+
+def trusted_guess_result(guess: Firearm, target: Firearm, mask: int) -> GuessResult:
+    # Mirrors GameService._build_guess_result without needing a session.
+    return construct_trusted(
+        GuessResult,
+        {
+            "is_correct": guess.id == target.id,
+            "guess_firearm": guess,
+            "target_firearm": target,
+            "comparisons": build_comparisons(guess, target, mask),
+            "remaining_guesses": 3,
+            "game_completed": False,
+        },
+    )
+
+
+def revalidated_body(result: GuessResult) -> bytes:
+    # Roughly what FastAPI does with a returned model and a response_model.
+    checked = GuessResult.model_validate(result.model_dump())
+    return json.dumps(checked.model_dump(mode="json")).encode()
+
+
+def measure(
+    build: Callable[[], List[Any]], objects: int, repeat: int
+) -> Tuple[float, float]:
+    """Best CPU microseconds and retained bytes per built object."""
+    seconds = min(timeit.repeat(build, number=1, repeat=repeat))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return seconds / objects * 1e6, retained / objects
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    firearms = TestFirearmRepository().get_all_firearms()
+    rows = [firearm_to_db(firearm) for firearm in firearms] * args.rounds
+    encoder = AttributeEncoder()
+    codes = {firearm.id: encoder.encode(firearm) for firearm in firearms}
+    guesses = [
+        (guess, target, compare_codes(codes[guess.id], codes[target.id]))
+        for guess in firearms
+        for target in firearms
+    ] * max(1, args.rounds // len(firearms))
+    results = [trusted_guess_result(*guess) for guess in guesses]
+
+    cases: Dict[str, Tuple[int, Callable[[], List[Any]], Callable[[], List[Any]]]] = {
+        "firearm row": (
+            len(rows),
+            lambda: [validated_firearm_from_db(row) for row in rows],
+            lambda: [firearm_from_db(row) for row in rows],
+        ),
+        "guess result": (
+            len(guesses),
+            lambda: [validated_guess_result(*guess) for guess in guesses],
+            lambda: [trusted_guess_result(*guess) for guess in guesses],
+        ),
+        "guess body": (
+            len(guesses),
+            lambda: [revalidated_body(result) for result in results],
+            lambda: [result.model_dump_json().encode() for result in results],
+        ),
+    }
+
+    print(f"{'case':<14}{'path':<11}{'us/object':>11}{'bytes/object':>14}")
+    for name, (objects, validated, trusted) in cases.items():
+        timings = {}
+        for path, build in (("validated", validated), ("trusted", trusted)):
+            timings[path] = measure(build, objects, args.repeat)
+            micros, retained = timings[path]
+            print(f"{name:<14}{path:<11}{micros:>11.2f}{retained:>14.0f}")
+        speedup = timings["validated"][0] / timings["trusted"][0]
+        print(f"{name:<14}{'speedup':<11}{speedup:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
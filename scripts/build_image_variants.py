@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Encode resized AVIF/WebP copies of every catalog image.
+
+Run from the repository root, e.g. after importing firearms or uploading
+images: ``python -m scripts.build_image_variants``. Unchanged images are
+skipped, so it is cheap to rerun.
+"""
+
+import argparse
+import sys
+import time
+
+from src.gungle.config import settings
+from src.gungle.database import create_tables
+from src.gungle.services.firearm_service import firearm_service
+from src.gungle.services.image_variants import build_image_variants
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--upload-dir", default=settings.UPLOAD_DIR)
+    parser.add_argument(
+        "--widths", type=int, nargs="+", default=settings.IMAGE_VARIANT_WIDTHS
+    )
+    parser.add_argument("--formats", nargs="+", default=settings.IMAGE_VARIANT_FORMATS)
+    parser.add_argument(
+        "--workers", type=int, default=settings.IMAGE_VARIANT_WORKERS or None
+    )
+    args = parser.parse_args()
+
+    create_tables()
+    image_urls = [
+        firearm.image_url
+        for firearm in firearm_service.get_catalog().firearms
+        if firearm.image_url
+    ]
+    started = time.perf_counter()
+    try:
+        encoded = build_image_variants(
+            args.upload_dir, image_urls, args.widths, args.formats, args.workers
+        )
+    except (RuntimeError, ValueError) as e:
+        print(f"Error building image variants: {e}")
+        sys.exit(1)
+    print(
+        f"Encoded variants for {encoded} of {len(set(image_urls))} images "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Simulate concurrent players against the app in-process and report latency.
+
+Run from the repository root, e.g.::
+
+    python -m scripts.load_test --players 5000 --concurrency 100 500 2000
+    python -m scripts.load_test --session-backend sqlite --think-ms 50
+
+Every player starts a game, guesses until it wins or runs out of guesses,
+then fetches the status and the answer. Requests go through httpx's ASGI
+transport, so no server or network is involved and the numbers are the
+app's own: one event loop, like one worker. Each concurrency level runs
+after the last, which shows where latency turns up (the knee of the curve).
+By default the database, catalog snapshot and uploads live in a temporary
+directory, so the run never touches a real database.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import httpx
+
+OPERATIONS = ("new", "guess", "status", "reveal")
+
+
+class Stats:
+    """Latencies and failures per operation for one concurrency level."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.games = 0
+        self.wins = 0
+
+    @property
+    def requests(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Player:
+    def __init__(
+        self,
+        client: "httpx.AsyncClient",
+        stats: Stats,
+        names: Sequence[str],
+        weights: Sequence[float],
+        think_seconds: float,
+        rng: random.Random,
+    ):
+        self.client = client
+        self.stats = stats
+        self.names = names
+        self.weights = weights
+        self.think_seconds = think_seconds
+        self.rng = rng
+
+    async def request(
+        self, operation: str, method: str, url: str, **kwargs: Any
+    ) -> Any:
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.stats.latencies[operation].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.stats.errors[operation] += 1
+            return None
+        return response.json()
+
+    async def think(self) -> None:
+        if self.think_seconds > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_seconds))
+
+    async def play(self) -> None:
+        game = await self.request("new", "POST", "/api/v1/game/new")
+        if game is None:
+            return
+        session_id = game["session_id"]
+        guesses = self.rng.choices(self.names, cum_weights=self.weights, k=8)
+        for name in guesses:
+            await self.think()
+            result = await self.request(
+                "guess",
+                "POST",
+                f"/api/v1/game/{session_id}/guess",
+                json={"firearm_name": name},
+            )
+            if result is None or result["game_completed"]:
+                self.stats.wins += bool(result and result["is_correct"])
+                break
+        await self.request("status", "GET", f"/api/v1/game/{session_id}/status")
+        await self.request("reveal", "GET", f"/api/v1/game/{session_id}/reveal")
+        self.stats.games += 1
+
+
+def cumulative_weights(count: int, distribution: str, skew: float) -> List[float]:
+    """Uniform, or Zipf-like so a few popular names get most guesses."""
+    weights: List[float] = []
+    total = 0.0
+    for rank in range(1, count + 1):
+        total += 1.0 if distribution == "uniform" else 1 / rank**skew
+        weights.append(total)
+    return weights
+
+
+async def run_level(
+    client: "httpx.AsyncClient",
+    players: int,
+    concurrency: int,
+    names: Sequence[str],
+    weights: Sequence[float],
+    think_seconds: float,
+    seed: int,
+) -> Stats:
+    stats = Stats()
+    rng = random.Random(seed)
+    pending = iter(range(players))
+
+    async def worker() -> None:
+        player = Player(client, stats, names, weights, think_seconds, rng)
+        for _ in pending:
+            await player.play()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return stats
+
+
+def report(
+    concurrency: int, stats: Stats, elapsed: float, rss_before: int, rss_after: int
+) -> None:
+    print(
+        f"\nconcurrency {concurrency}: {stats.games} games, {stats.wins} won, "
+        f"{stats.requests} requests in {elapsed:.1f}s = "
+        f"{stats.requests / elapsed:.0f} req/s, {stats.games / elapsed:.0f} games/s"
+    )
+    print(
+        f"{'operation':<10}{'count':>8}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}"
+    )
+    for operation in OPERATIONS:
+        ordered = sorted(stats.latencies.get(operation, []))
+        print(
+            f"{operation:<10}{len(ordered):>8}{stats.errors.get(operation, 0):>8}"
+            + "".join(
+                f"{percentile(ordered, fraction) * 1000:>8.2f}ms"
+                for fraction in (0.5, 0.95, 0.99)
+            )
+        )
+    growth = (rss_after - rss_before) / 2**20
+    print(f"RSS {rss_after / 2**20:.1f}MiB ({growth:+.1f}MiB over this level)")
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
+
+    from src.gungle.main import app
+    from src.gungle.services.firearm_service import firearm_service
+
+    # Seed and cache the catalog before the startup task races to load it.
+    firearm_service.get_catalog()
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load-test"
+        ) as client:
+            names = (await client.get("/api/v1/game/firearm-names")).json()
+            if not names:
+                print("Error: the catalog is empty")
+                sys.exit(1)
+            weights = cumulative_weights(len(names), args.guesses, args.skew)
+            print(
+                f"{len(names)} firearms, {args.players} players per level, "
+                f"think time {args.think_ms}ms, {args.guesses} guesses"
+            )
+            for level, concurrency in enumerate(args.concurrency):
+                rss_before = rss_bytes()
+                started = time.perf_counter()
+                stats = await run_level(
+                    client,
+                    args.players,
+                    concurrency,
+                    names,
+                    weights,
+                    args.think_ms / 1000,
+                    args.seed + level,
+                )
+                elapsed = time.perf_counter() - started
+                report(concurrency, stats, elapsed, rss_before, rss_bytes())
+
+
+def configure_environment(args: argparse.Namespace) -> Optional[str]:
+    """Point the app at throwaway storage; returns the directory to remove."""
+    # Settings are read when the app is imported, so this must come first.
+    workspace: Optional[str] = None
+    if args.database_url is None:
+        workspace = tempfile.mkdtemp(prefix="gungle-load-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{workspace}/gungle.db"
+        os.environ["CATALOG_SNAPSHOT_PATH"] = f"{workspace}/gungle-catalog.bin"
+        os.environ["UPLOAD_DIR"] = f"{workspace}/uploads"
+    else:
+        os.environ["DATABASE_URL"] = args.database_url
+    if args.session_backend:
+        os.environ["SESSION_BACKEND"] = args.session_backend
+        if args.session_backend == "sqlite" and workspace is not None:
+            os.environ["SESSION_SQLITE_PATH"] = f"{workspace}/sessions.db"
+        elif args.session_backend == "shared_memory":
+            os.environ["SESSION_SHM_NAME"] = f"gungle-load-{os.getpid()}"
+    if args.max_sessions:
+        os.environ["MAX_ACTIVE_SESSIONS"] = str(args.max_sessions)
+    return workspace
+
+
+def remove_shared_sessions(name: str) -> None:
+    from multiprocessing.shared_memory import SharedMemory
+
+    try:
+        SharedMemory(name).unlink()
+        os.unlink(os.path.join(tempfile.gettempdir(), f"{name}.lock"))
+    except FileNotFoundError:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=2000, help="games per level")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="simultaneous players; one run per value",
+    )
+    parser.add_argument(
+        "--think-ms", type=float, default=0.0, help="mean pause before each guess"
+    )
+    parser.add_argument("--guesses", choices=("uniform", "zipf"), default="zipf")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument(
+        "--session-backend", choices=("memory", "sqlite", "shared_memory")
+    )
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--max-sessions", type=int)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    workspace = configure_environment(args)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if args.session_backend == "shared_memory":
+            remove_shared_sessions(os.environ["SESSION_SHM_NAME"])
+        if workspace is not None:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
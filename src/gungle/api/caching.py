@@ -0,0 +1,22 @@
+from fastapi import Request, Response
+
+from ..services.catalog import EncodedBody
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_json_response(request: Request, body: EncodedBody) -> Response:
+    """Serve a pre-serialized body, or 304 if the client already has it."""
+    headers = {"ETag": body.etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, body.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=body.content, media_type="application/json", headers=headers
+    )
@@ -0,0 +1,33 @@
+from typing import AsyncGenerator, Optional
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database import (
+    current_async_db_session,
+    current_db_session,
+    get_async_db,
+    get_db,
+)
+
+
+async def use_db_session(
+    db: Session = Depends(get_db),
+) -> AsyncGenerator[Session, None]:
+    """Bind one session to the request so repositories share it."""
+    token = current_db_session.set(db)
+    try:
+        yield db
+    finally:
+        current_db_session.reset(token)
+
+
+async def use_async_db_session(
+    db: Optional[AsyncSession] = Depends(get_async_db),
+) -> AsyncGenerator[Optional[AsyncSession], None]:
+    token = current_async_db_session.set(db)
+    try:
+        yield db
+    finally:
+        current_async_db_session.reset(token)
@@ -0,0 +1,77 @@
+import time
+
+from fastapi import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..services.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    metrics,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _route_label(scope: Scope, root_path: str) -> str:
+    """The matched route's template, e.g. ``/api/v1/game/{session_id}/status``.
+
+    Templates rather than raw paths, so session and firearm ids do not each
+    start a new time series. Routers record the match in ``scope`` in place,
+    but an included router's route only knows its own relative path, so the
+    template is rebuilt from the full path and the matched parameters.
+    """
+    if scope.get("route") is None:
+        mounted = scope.get("root_path", root_path)
+        if mounted != root_path:
+            return f"{mounted[len(root_path):]}/{{path}}"
+        return UNMATCHED_ROUTE
+    path = str(scope.get("path", ""))
+    params = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    if not params:
+        return path
+    return "/".join(
+        f"{{{params[segment]}}}" if segment in params else segment
+        for segment in path.split("/")
+    )
+
+
+class MetricsMiddleware:
+    """Times every HTTP request and counts it by route and status.
+
+    A plain ASGI middleware: it only wraps ``send`` to see the status code,
+    so streamed bodies pass through untouched and are timed to their end.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root_path = scope.get("root_path", "")
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            method = scope["method"]
+            route = _route_label(scope, root_path)
+            HTTP_REQUEST_DURATION.observe(elapsed, method, route)
+            HTTP_REQUESTS.inc(method, route, str(status))
+
+
+def metrics_response() -> Response:
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,29 @@
+import os
+from typing import Any
+
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files whose names change with their content.
+
+    Clients and CDNs may keep them for ``max_age`` seconds without
+    revalidating, since an updated image is published under a new name.
+    """
+
+    def __init__(self, *args: Any, max_age: int = 31536000, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.cache_control = f"public, max-age={max_age}, immutable"
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str] | str",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
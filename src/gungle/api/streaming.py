@@ -0,0 +1,62 @@
+from contextlib import aclosing
+from typing import AsyncGenerator, AsyncIterable, AsyncIterator, Iterable, Union
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from ..config import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+Items = Union[Iterable[BaseModel], AsyncIterable[BaseModel]]
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _iterate(items: Items) -> AsyncIterator[BaseModel]:
+    if isinstance(items, AsyncGenerator):
+        # Close the source as soon as the response stops, not at collection.
+        async with aclosing(items) as source:
+            async for item in source:
+                yield item
+    elif isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def encode_json_stream(
+    items: Items, ndjson: bool, chunk_items: int
+) -> AsyncIterator[bytes]:
+    """Encode ``items`` as a JSON array or NDJSON, ``chunk_items`` at a time."""
+    separator = b"\n" if ndjson else b","
+    chunk = bytearray() if ndjson else bytearray(b"[")
+    count = 0
+    async for item in _iterate(items):
+        if count and not ndjson:
+            chunk += separator
+        chunk += item.__pydantic_serializer__.to_json(item)
+        if ndjson:
+            chunk += separator
+        count += 1
+        if count % chunk_items == 0:
+            yield bytes(chunk)
+            chunk.clear()
+    if not ndjson:
+        chunk += b"]"
+    if chunk:
+        yield bytes(chunk)
+
+
+def streaming_json_response(request: Request, items: Items) -> StreamingResponse:
+    """Stream ``items`` as NDJSON if the client accepts it, else a JSON array."""
+    ndjson = wants_ndjson(request)
+    return StreamingResponse(
+        encode_json_stream(items, ndjson, settings.STREAM_CHUNK_ITEMS),
+        media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+    )
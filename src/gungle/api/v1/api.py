@@ -1,8 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from ..deps import use_async_db_session, use_db_session
 from .endpoints import firearms, game
 
-api_router = APIRouter()
+api_router = APIRouter(
+    dependencies=[Depends(use_db_session), Depends(use_async_db_session)]
+)
 
 api_router.include_router(game.router, prefix="/game", tags=["game"])
 api_router.include_router(firearms.router, prefix="/firearms", tags=["firearms"])
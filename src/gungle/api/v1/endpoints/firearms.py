@@ -1,42 +1,235 @@
-from typing import Dict, List
+import codecs
+from tempfile import SpooledTemporaryFile
+from typing import IO, Dict, List, Optional, Sequence
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
-from ....models.firearm import Firearm
+from ....config import settings
+from ....models.firearm import (
+    BatchResponse,
+    Caliber,
+    CatalogImportResult,
+    Firearm,
+    FirearmFilter,
+    FirearmPatch,
+    FirearmType,
+    ImageUploadResponse,
+)
+from ....services.async_firearm_service import async_firearm_service
+from ....services.catalog import dump_firearms
+from ....services.catalog_io import (
+    MEDIA_TYPES,
+    CatalogFormat,
+    export_firearms,
+    import_firearms,
+)
 from ....services.firearm_service import firearm_service
+from ....services.image_store import (
+    ImageTooLargeError,
+    UnsupportedImageError,
+    save_image_stream,
+)
+from ....utils.cursor import decode_cursor, encode_cursor
+from ...caching import conditional_json_response
+from ...streaming import streaming_json_response, wants_ndjson
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Firearm])
-async def get_all_firearms() -> List[Firearm]:
-    return firearm_service.get_all_firearms()
+async def get_all_firearms(
+    request: Request,
+    type: Optional[FirearmType] = None,
+    caliber: Optional[Caliber] = None,
+    country: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.FIREARM_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
+    filters = FirearmFilter(
+        type=type,
+        caliber=caliber,
+        country_of_origin=country,
+        year_min=year_min,
+        year_max=year_max,
+    )
+    if limit is None and cursor is None and filters == FirearmFilter():
+        if wants_ndjson(request):
+            # Rows stream straight from a server-side cursor.
+            return streaming_json_response(
+                request,
+                async_firearm_service.iter_firearms(settings.STREAM_CHUNK_ITEMS),
+            )
+        catalog = await async_firearm_service.get_catalog()
+        return conditional_json_response(request, catalog.firearms_body)
+
+    after = None
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        if after is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    page_size = limit or settings.FIREARM_PAGE_SIZE
+    # One extra row tells whether another page follows without a COUNT.
+    page = await async_firearm_service.list_firearms(filters, page_size + 1, after)
+    headers = {}
+    if len(page) > page_size:
+        page = page[:page_size]
+        headers["X-Next-Cursor"] = encode_cursor(page[-1].name, page[-1].id)
+    return Response(
+        content=dump_firearms(page), media_type="application/json", headers=headers
+    )
+
+
+@router.get("/export")
+async def export_catalog(
+    format: CatalogFormat = Query(CatalogFormat.JSONL),
+) -> StreamingResponse:
+    catalog = await async_firearm_service.get_catalog()
+    return StreamingResponse(
+        export_firearms(catalog.firearms, format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="firearms.{format.value}"'
+        },
+    )
+
+
+@router.post("/import", response_model=CatalogImportResult)
+async def import_catalog(
+    request: Request,
+    format: CatalogFormat = Query(CatalogFormat.JSONL),
+) -> CatalogImportResult:
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > settings.IMPORT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Import too large")
+
+    # The body is spooled rather than buffered, so memory stays bounded for
+    # large files; parsing and batched upserts then run off the event loop.
+    with SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MAX_BYTES) as spool:
+        await _spool_utf8_body(request, spool)
+        spool.seek(0)
+        return await run_in_threadpool(
+            import_firearms,
+            firearm_service,
+            spool,
+            format,
+            settings.IMPORT_BATCH_SIZE,
+        )
+
+
+async def _spool_utf8_body(request: Request, spool: IO[bytes]) -> None:
+    """Copy the request body to ``spool``, checking its size and encoding.
+
+    Both are checked before any row is imported, so a bad body is rejected
+    outright instead of failing partway through with earlier batches written.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=413, detail="Import too large")
+        try:
+            decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            offset = size - len(chunk) + e.start
+            raise HTTPException(
+                status_code=400, detail=f"Import is not valid UTF-8 at byte {offset}"
+            )
+        spool.write(chunk)
+    try:
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import ends mid-character")
+
+
+def _check_batch_size(items: Sequence[object]) -> None:
+    if len(items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batches are limited to {settings.BATCH_MAX_ITEMS} items",
+        )
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch_upsert_firearms(firearms: List[Firearm]) -> BatchResponse:
+    _check_batch_size(firearms)
+    return await run_in_threadpool(firearm_service.batch_upsert, firearms)
+
+
+@router.patch("/batch", response_model=BatchResponse)
+async def batch_patch_firearms(patches: List[FirearmPatch]) -> BatchResponse:
+    _check_batch_size(patches)
+    return await run_in_threadpool(firearm_service.batch_patch, patches)
+
+
+@router.post("/batch/delete", response_model=BatchResponse)
+async def batch_delete_firearms(firearm_ids: List[str]) -> BatchResponse:
+    _check_batch_size(firearm_ids)
+    return await run_in_threadpool(firearm_service.batch_delete, firearm_ids)
 
 
 @router.get("/{firearm_id}", response_model=Firearm)
 async def get_firearm(firearm_id: str) -> Firearm:
-    firearm = firearm_service.get_firearm_by_id(firearm_id)
+    firearm = await async_firearm_service.get_firearm_by_id(firearm_id)
     if not firearm:
         raise HTTPException(status_code=404, detail="Firearm not found")
     return firearm
 
 
+@router.put("/{firearm_id}/image", response_model=ImageUploadResponse)
+async def upload_firearm_image(
+    firearm_id: str, request: Request
+) -> ImageUploadResponse:
+    # The raw body is streamed to disk; reject oversized uploads up front
+    # when the client declares a length.
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="Upload too large")
+    if not await async_firearm_service.firearm_exists(firearm_id):
+        raise HTTPException(status_code=404, detail="Firearm not found")
+
+    try:
+        stored = await save_image_stream(
+            request.stream(), settings.UPLOAD_DIR, settings.MAX_UPLOAD_SIZE
+        )
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedImageError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    if not await run_in_threadpool(
+        firearm_service.set_image_url, firearm_id, stored.url
+    ):
+        raise HTTPException(status_code=404, detail="Firearm not found")
+    return ImageUploadResponse(
+        image_url=stored.url,
+        sha256=stored.sha256,
+        size=stored.size,
+        deduplicated=stored.deduplicated,
+    )
+
+
 @router.post("/", response_model=Firearm)
 async def add_firearm(firearm: Firearm) -> Firearm:
-    if not firearm_service.add_firearm(firearm):
+    if not await async_firearm_service.add_firearm(firearm):
         raise HTTPException(status_code=400, detail="Firearm already exists")
     return firearm
 
 
 @router.put("/{firearm_id}", response_model=Firearm)
 async def update_firearm(firearm_id: str, firearm: Firearm) -> Firearm:
-    if not firearm_service.update_firearm(firearm_id, firearm):
+    if not await async_firearm_service.update_firearm(firearm_id, firearm):
         raise HTTPException(status_code=404, detail="Firearm not found")
     return firearm
 
 
 @router.delete("/{firearm_id}")
 async def delete_firearm(firearm_id: str) -> Dict[str, str]:
-    if not firearm_service.delete_firearm(firearm_id):
+    if not await async_firearm_service.delete_firearm(firearm_id):
         raise HTTPException(status_code=404, detail="Firearm not found")
     return {"message": "Firearm deleted successfully"}
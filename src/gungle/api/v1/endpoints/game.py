@@ -1,74 +1,160 @@
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter
 
+from ....config import settings
 from ....models.firearm import (
+    DailyFirearmResponse,
     GameRevealResponse,
-    GameSession,
+    GameSessionSummary,
     GameStatusResponse,
     GuessResult,
     NameGuessRequest,
     NewGameResponse,
+    SessionFilter,
+    SessionStats,
 )
+from ....services.async_firearm_service import async_firearm_service
 from ....services.game_service import game_service
+from ....utils.cursor import decode_session_cursor, encode_session_cursor
+from ....utils.threads import iterate_in_thread
+from ...caching import conditional_json_response
+from ...streaming import streaming_json_response, wants_ndjson
 
-router = APIRouter()
+_SESSION_SUMMARIES = TypeAdapter(List[GameSessionSummary])
+
+
+def _model_response(model: BaseModel) -> Response:
+    # The game service builds these from trusted data, so they are serialized
+    # straight to JSON instead of FastAPI dumping and revalidating them first.
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+async def load_catalog() -> None:
+    # Fill the catalog cache off the event loop. The session store may still
+    # hit a database, so game service calls that touch sessions or the daily
+    # schedule run in the threadpool too.
+    await async_firearm_service.get_catalog()
+
+
+router = APIRouter(dependencies=[Depends(load_catalog)])
 
 
 @router.post("/new", response_model=NewGameResponse)
-async def start_new_game() -> NewGameResponse:
+async def start_new_game() -> Response:
     try:
-        return game_service.start_new_game()
+        content = await run_in_threadpool(game_service.start_new_game_json)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/firearm-names", response_model=List[str])
-async def get_firearm_names() -> List[str]:
-    return game_service.get_available_firearm_names()
+async def get_firearm_names(request: Request) -> Response:
+    catalog = await async_firearm_service.get_catalog()
+    return conditional_json_response(request, catalog.names_body)
+
+
+@router.get("/firearm-names/suggest", response_model=List[str])
+async def suggest_firearm_names(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+) -> List[str]:
+    return game_service.suggest_firearm_names(q, limit)
 
 
 @router.post("/{session_id}/guess", response_model=GuessResult)
 async def make_guess_by_name(
     session_id: str, guess_request: NameGuessRequest
-) -> GuessResult:
+) -> Response:
     try:
-        return game_service.make_guess_by_name(session_id, guess_request.firearm_name)
+        result = await run_in_threadpool(
+            game_service.make_guess_by_name, session_id, guess_request.firearm_name
+        )
     except ValueError as e:
         if "not found" in str(e).lower():
             raise HTTPException(status_code=404, detail=str(e))
         else:
             raise HTTPException(status_code=400, detail=str(e))
+    return _model_response(result)
 
 
 @router.get("/{session_id}/status", response_model=GameStatusResponse)
-async def get_game_status(session_id: str) -> GameStatusResponse:
-    status = game_service.get_game_status(session_id)
+async def get_game_status(session_id: str) -> Response:
+    status = await run_in_threadpool(game_service.get_game_status, session_id)
     if not status:
         raise HTTPException(status_code=404, detail="Game session not found")
-    return status
+    return _model_response(status)
 
 
 @router.get("/{session_id}/reveal", response_model=GameRevealResponse)
-async def reveal_answer(session_id: str) -> GameRevealResponse:
+async def reveal_answer(session_id: str) -> Response:
     try:
-        result = game_service.reveal_answer(session_id)
+        result = await run_in_threadpool(game_service.reveal_answer, session_id)
         if not result:
             raise HTTPException(status_code=404, detail="Game session not found")
-        return result
+        return _model_response(result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/admin/sessions", response_model=List[GameSession])
-async def get_all_sessions() -> List[GameSession]:
-    return game_service.get_all_sessions()
-
-
-@router.get("/daily-firearm")
-async def get_daily_firearm() -> Dict[str, Any]:
+@router.get("/admin/sessions", response_model=List[GameSessionSummary])
+async def get_all_sessions(
+    request: Request,
+    completed: Optional[bool] = None,
+    won: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.SESSION_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+) -> Response:
+    filters = SessionFilter(
+        is_completed=completed,
+        is_won=won,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    unpaged = limit is None and cursor is None and filters == SessionFilter()
+    if unpaged and wants_ndjson(request):
+        # The store may read sessions through a live database cursor.
+        summaries = iterate_in_thread(
+            game_service.iter_session_summaries,
+            settings.STREAM_CHUNK_ITEMS,
+            thread_name="session-stream",
+        )
+        return streaming_json_response(request, summaries)
+
+    after = None
+    if cursor is not None:
+        after = decode_session_cursor(cursor)
+        if after is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    page, next_position = await run_in_threadpool(
+        game_service.list_sessions, filters, limit or settings.SESSION_PAGE_SIZE, after
+    )
+    headers = {}
+    if next_position is not None:
+        headers["X-Next-Cursor"] = encode_session_cursor(*next_position)
+    return Response(
+        content=_SESSION_SUMMARIES.dump_json(page),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.get("/admin/sessions/summary", response_model=SessionStats)
+async def get_session_stats() -> SessionStats:
+    return await run_in_threadpool(game_service.get_session_stats)
+
+
+@router.get("/daily-firearm", response_model=DailyFirearmResponse)
+async def get_daily_firearm(request: Request) -> Response:
     try:
-        daily_firearm = game_service.get_daily_firearm()
-        return {"firearm": daily_firearm, "message": "Today's firearm"}
+        body = await run_in_threadpool(game_service.get_daily_firearm_body)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return conditional_json_response(request, body)
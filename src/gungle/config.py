@@ -10,6 +10,8 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Gungle Backend"
     DEBUG: bool = True
+    # Prometheus text at /metrics, fed by a middleware timing every request.
+    METRICS_ENABLED: bool = True
 
     # Security
     SECRET_KEY: str = "secret-key-here-change-in-production"
@@ -18,6 +20,17 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./gungle.db"
+    # Compiled catalog read at boot instead of the database; empty disables it.
+    CATALOG_SNAPSHOT_PATH: str = "./gungle-catalog.bin"
+    # How often each worker checks for catalog writes made by other processes.
+    CATALOG_SYNC_SECONDS: float = 1.0
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256MB
+    SQLITE_CACHE_SIZE: int = -65536  # negative means KiB, so 64MB
 
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8080"]
@@ -25,10 +38,37 @@ class Settings(BaseSettings):
     # File Storage
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
+    # Resized copies written under UPLOAD_DIR/variants; needs the images extra.
+    IMAGE_VARIANT_WIDTHS: List[int] = [160, 320, 640, 1280]
+    IMAGE_VARIANT_FORMATS: List[str] = ["avif", "webp"]
+    IMAGE_VARIANT_WORKERS: int = 0  # 0 uses every core
+    IMAGE_VARIANT_MAX_AGE_SECONDS: int = 31536000
+    IMPORT_BATCH_SIZE: int = 1000
+    BATCH_MAX_ITEMS: int = 1000
+    FIREARM_PAGE_SIZE: int = 50
+    FIREARM_MAX_PAGE_SIZE: int = 500
+    STREAM_CHUNK_ITEMS: int = 500
+    SESSION_PAGE_SIZE: int = 50
+    SESSION_MAX_PAGE_SIZE: int = 500
+    IMPORT_SPOOL_MAX_BYTES: int = 8388608  # 8MB held in memory, the rest on disk
+    IMPORT_MAX_BYTES: int = 104857600  # 100MB
 
     # Game Settings
     MAX_GUESSES: int = 5
     SESSION_TIMEOUT_HOURS: int = 24
+    COMPLETED_SESSION_TTL_MINUTES: int = 30
+    MAX_ACTIVE_SESSIONS: int = 100000
+    SESSION_FLUSH_INTERVAL_SECONDS: float = 1.0
+    SESSION_FLUSH_BATCH_SIZE: int = 500
+    # memory: per-process (one worker only); sqlite and shared_memory are
+    # shared by every worker on the host.
+    SESSION_BACKEND: str = "memory"
+    SESSION_SQLITE_PATH: str = ""  # empty keeps sessions in DATABASE_URL
+    SESSION_SHM_NAME: str = "gungle-sessions"
+    SESSION_SHM_SLOTS: int = 65536
+    DAILY_SCHEDULE_DAYS_AHEAD: int = 30
+    DAILY_NO_REPEAT_DAYS: int = 30
+    DAILY_SCHEDULE_REFRESH_SECONDS: float = 3600.0
 
     class Config:
         env_file = ".env"
@@ -1,12 +1,48 @@
-from .database import Base, SessionLocal, create_tables, engine, get_db
-from .models import FirearmDB, GameSessionDB
+from .database import (
+    USE_ASYNC_DB,
+    AsyncSessionLocal,
+    Base,
+    SessionLocal,
+    async_engine,
+    create_sqlite_engine,
+    create_tables,
+    current_async_db_session,
+    current_db_session,
+    engine,
+    get_async_db,
+    get_db,
+    session_scope,
+)
+from .models import (
+    DailyScheduleDB,
+    FirearmArchiveDB,
+    FirearmDB,
+    GameSessionDB,
+    SessionStatDB,
+    utcnow,
+)
+from .upsert import increment_statement, upsert_statement
 
 __all__ = [
     "get_db",
+    "get_async_db",
+    "session_scope",
+    "current_db_session",
+    "current_async_db_session",
     "create_tables",
+    "create_sqlite_engine",
     "engine",
     "SessionLocal",
+    "async_engine",
+    "AsyncSessionLocal",
+    "USE_ASYNC_DB",
     "Base",
     "FirearmDB",
+    "FirearmArchiveDB",
     "GameSessionDB",
+    "DailyScheduleDB",
+    "SessionStatDB",
+    "upsert_statement",
+    "increment_statement",
+    "utcnow",
 ]
@@ -1,22 +1,109 @@
-from typing import Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Dict, Generator, Iterator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from ..config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
-    if "sqlite" in settings.DATABASE_URL
-    else {},
+# Async driver -> sync driver used for the threaded paths (seeding, the session
+# writer) when DATABASE_URL selects an asyncio driver.
+_SYNC_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+    "postgresql+psycopg_async": "postgresql+psycopg",
+}
+
+database_url = make_url(settings.DATABASE_URL)
+USE_ASYNC_DB = database_url.drivername in _SYNC_DRIVERS
+
+
+def _sync_url(url: URL) -> URL:
+    return url.set(drivername=_SYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+def _is_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return _is_sqlite(url) and url.database in (None, "", ":memory:")
+
+
+def _engine_options(url: URL) -> Dict[str, Any]:
+    if _is_memory_sqlite(url):
+        # Every connection to :memory: is a new database; share one instead.
+        return {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+
+    options: Dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": not _is_sqlite(url),
+    }
+    if _is_sqlite(url):
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE_SECONDS
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def _configure(engine: Engine, url: URL) -> Engine:
+    if _is_sqlite(url) and not _is_memory_sqlite(url):
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+engine = _configure(
+    create_engine(_sync_url(database_url), **_engine_options(database_url)),
+    database_url,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+if USE_ASYNC_DB:
+    async_engine = create_async_engine(database_url, **_engine_options(database_url))
+    _configure(async_engine.sync_engine, database_url)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
 Base = declarative_base()
 
+# The session bound to the current request, if any. Repositories reuse it
+# instead of opening their own; see api.deps.
+current_db_session: ContextVar[Optional[Session]] = ContextVar(
+    "current_db_session", default=None
+)
+current_async_db_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "current_async_db_session", default=None
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -26,5 +113,63 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def create_tables() -> None:
-    Base.metadata.create_all(bind=engine)
+async def get_async_db() -> AsyncGenerator[Optional[AsyncSession], None]:
+    if AsyncSessionLocal is None:
+        yield None
+        return
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """The request's session if one is bound, otherwise a short-lived one."""
+    db = current_db_session.get()
+    if db is not None:
+        yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def create_sqlite_engine(path: str) -> Engine:
+    """A separate SQLite file with the same pool settings and WAL pragmas."""
+    url = make_url(f"sqlite:///{path}")
+    return _configure(create_engine(url, **_engine_options(url)), url)
+
+
+# Columns added to existing tables since the baseline schema. create_all skips
+# tables that already exist, so older databases get these through ALTER TABLE;
+# each DDL fragment carries a default that backfills the existing rows.
+_ADDED_COLUMNS: Dict[str, Dict[str, str]] = {
+    "firearms": {"aliases": "TEXT NOT NULL DEFAULT '[]'"},
+}
+
+
+def _add_missing_columns(bind: Engine) -> None:
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as connection:
+        for table_name, columns in _ADDED_COLUMNS.items():
+            if table_name not in existing_tables:
+                continue
+            present = {column["name"] for column in inspector.get_columns(table_name)}
+            for column_name, ddl in columns.items():
+                if column_name in present:
+                    continue
+                statement = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}"
+                connection.execute(text(statement))
+
+
+def create_tables(bind: Optional[Engine] = None) -> None:
+    bind = bind or engine
+    _add_missing_columns(bind)
+    Base.metadata.create_all(bind=bind)
+    # create_all skips existing tables, so add indexes introduced since.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
@@ -1,14 +1,45 @@
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Date, DateTime, Index, Integer, String, Text
 from sqlalchemy.sql import func
 
 from .database import Base
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class FirearmDB(Base):
     __tablename__ = "firearms"
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
     manufacturer = Column(String, nullable=False)
+    type = Column(String, nullable=False, index=True)
+    caliber = Column(String, nullable=False, index=True)
+    country_of_origin = Column(String, nullable=False, index=True)
+    model_type = Column(String, nullable=False)
+    year_introduced = Column(Integer, nullable=False, index=True)
+    description = Column(Text, nullable=False)
+    action_type = Column(String, nullable=False)
+    image_url = Column(String, nullable=False)
+    aliases = Column(Text, nullable=False, default="[]")
+    created_at = Column(DateTime, default=func.now())
+    # Stamped in Python rather than by CURRENT_TIMESTAMP, which only has
+    # second precision, so the catalog fingerprint changes on every write.
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
+
+    # Keyset pagination walks the catalog in (name, id) order.
+    __table_args__ = (Index("ix_firearms_name_id", "name", "id"),)
+
+
+class FirearmArchiveDB(Base):
+    """Deleted firearms as they last were, so older game sessions still render."""
+
+    __tablename__ = "firearm_archive"
+    id = Column(String, primary_key=True)
+    name = Column(String, nullable=False)
+    manufacturer = Column(String, nullable=False)
     type = Column(String, nullable=False)
     caliber = Column(String, nullable=False)
     country_of_origin = Column(String, nullable=False)
@@ -17,8 +48,8 @@ class FirearmDB(Base):
     description = Column(Text, nullable=False)
     action_type = Column(String, nullable=False)
     image_url = Column(String, nullable=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    aliases = Column(Text, nullable=False, default="[]")
+    deleted_at = Column(DateTime, default=utcnow)
 
 
 class GameSessionDB(Base):
@@ -30,3 +61,23 @@ class GameSessionDB(Base):
     is_won = Column(String, nullable=False)
     created_at = Column(DateTime, default=func.now())
     max_guesses = Column(Integer, default=5)
+
+    # Newest-first keyset pagination of the admin listing.
+    __table_args__ = (
+        Index("ix_game_sessions_created_at_id", "created_at", "session_id"),
+    )
+
+
+class SessionStatDB(Base):
+    """Running totals over game sessions, bumped as games start and finish."""
+
+    __tablename__ = "session_stats"
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+class DailyScheduleDB(Base):
+    __tablename__ = "daily_schedule"
+    puzzle_date = Column(Date, primary_key=True)
+    firearm_id = Column(String, nullable=False)
+    created_at = Column(DateTime, default=func.now())
@@ -0,0 +1,55 @@
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+_UPSERT_DIALECTS: Dict[str, Callable[..., Any]] = {
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
+def upsert_statement(
+    dialect_name: str,
+    model: Any,
+    key_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> Optional[Any]:
+    """INSERT ... ON CONFLICT DO UPDATE for ``model``, if the dialect has one.
+
+    Execute it with a list of row dicts for a single executemany round trip.
+    With no ``update_columns`` conflicting rows are left as they are (DO
+    NOTHING). Returns None for dialects without native upsert; callers fall
+    back to ``Session.merge``.
+    """
+    insert = _UPSERT_DIALECTS.get(dialect_name)
+    if insert is None:
+        return None
+
+    statement = insert(model)
+    if not update_columns:
+        return statement.on_conflict_do_nothing(index_elements=list(key_columns))
+    return statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={column: statement.excluded[column] for column in update_columns},
+    )
+
+
+def increment_statement(
+    dialect_name: str, model: Any, key_columns: Sequence[str], counter_column: str
+) -> Optional[Any]:
+    """INSERT ... ON CONFLICT that adds the inserted value to ``counter_column``.
+
+    Concurrent writers never lose an increment, since the addition happens in
+    the database. Returns None for dialects without native upsert.
+    """
+    insert = _UPSERT_DIALECTS.get(dialect_name)
+    if insert is None:
+        return None
+
+    statement = insert(model)
+    counter = model.__table__.c[counter_column]
+    return statement.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={counter_column: counter + statement.excluded[counter_column]},
+    )
@@ -1,16 +1,60 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from .api.metrics import MetricsMiddleware, metrics_response
+from .api.static import ImmutableStaticFiles
 from .api.v1.api import api_router
 from .config import settings
-from .database import create_tables
+from .database import async_engine, create_tables, engine
+from .services.async_firearm_service import async_firearm_service
+from .services.firearm_service import firearm_service
+from .services.game_service import game_service
+from .services.image_variants import VARIANTS_DIR
+from .services.metrics import GAMES, SESSIONS, instrument_engine, metrics
 
 create_tables()
 
+
+async def extend_daily_schedule_periodically() -> None:
+    while True:
+        try:
+            await async_firearm_service.get_catalog()
+            await asyncio.to_thread(game_service.extend_daily_schedule)
+        except Exception as e:
+            print(f"Error extending daily schedule: {e}")
+        await asyncio.sleep(settings.DAILY_SCHEDULE_REFRESH_SECONDS)
+
+
+async def sync_catalog_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.CATALOG_SYNC_SECONDS)
+        try:
+            await asyncio.to_thread(firearm_service.catalog.sync)
+        except Exception as e:
+            print(f"Error checking the catalog for changes: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    schedule_task = asyncio.create_task(extend_daily_schedule_periodically())
+    sync_task = asyncio.create_task(sync_catalog_periodically())
+    yield
+    tasks = (sync_task, schedule_task)
+    for task in tasks:
+        task.cancel()
+    # Let a thread mid-extend finish before the session store closes under it.
+    await asyncio.gather(*tasks, return_exceptions=True)
+    game_service.close()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
@@ -18,11 +62,22 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 os.makedirs(f"{settings.UPLOAD_DIR}/images", exist_ok=True)
-
+os.makedirs(f"{settings.UPLOAD_DIR}/{VARIANTS_DIR}", exist_ok=True)
+
+# Mounted first so it wins over the plain /uploads mount below.
+app.mount(
+    f"/uploads/{VARIANTS_DIR}",
+    ImmutableStaticFiles(
+        directory=f"{settings.UPLOAD_DIR}/{VARIANTS_DIR}",
+        max_age=settings.IMAGE_VARIANT_MAX_AGE_SECONDS,
+    ),
+    name="image-variants",
+)
 app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 app.add_middleware(
@@ -31,9 +86,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
+def collect_session_metrics() -> None:
+    for kind, count in game_service.get_session_counts().items():
+        SESSIONS.set(count, kind)
+    totals = game_service.get_session_totals()
+    for event in ("started", "completed", "won"):
+        GAMES.set(totals.get(event, 0), event)
+
+
+if settings.METRICS_ENABLED:
+    # Added last, so it is outermost and times the other middleware too.
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+    metrics.add_collector(collect_session_metrics)
+
+
 class GameInfo(BaseModel):
     max_guesses: int
     description: str
@@ -78,3 +151,11 @@ async def health_check() -> HealthResponse:
     return HealthResponse(
         status="healthy", debug=settings.DEBUG, upload_dir=settings.UPLOAD_DIR
     )
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def get_metrics() -> Response:
+        # Collectors may query the session store's database.
+        return await run_in_threadpool(metrics_response)
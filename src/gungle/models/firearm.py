@@ -1,8 +1,10 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
+
+from .session import SessionRecord
 
 
 class FirearmType(str, Enum):
@@ -110,6 +112,45 @@ class Firearm(BaseModel):
     action_type: ActionType
     description: Optional[str] = None
     image_url: Optional[str] = None
+    aliases: List[str] = []
+
+
+class FirearmFilter(BaseModel):
+    type: Optional[FirearmType] = None
+    caliber: Optional[Caliber] = None
+    country_of_origin: Optional[str] = None
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+
+    def matches(self, firearm: Firearm) -> bool:
+        year = firearm.year_introduced
+        return (
+            (self.type is None or firearm.type == self.type)
+            and (self.caliber is None or firearm.caliber == self.caliber)
+            and (
+                self.country_of_origin is None
+                or firearm.country_of_origin == self.country_of_origin
+            )
+            and (self.year_min is None or (year is not None and year >= self.year_min))
+            and (self.year_max is None or (year is not None and year <= self.year_max))
+        )
+
+
+class FirearmPatch(BaseModel):
+    """Partial update for one firearm; only the fields that are set change."""
+
+    id: str
+    name: Optional[str] = None
+    manufacturer: Optional[str] = None
+    type: Optional[FirearmType] = None
+    caliber: Optional[Caliber] = None
+    country_of_origin: Optional[str] = None
+    model_type: Optional[ModelType] = None
+    year_introduced: Optional[int] = None
+    action_type: Optional[ActionType] = None
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    aliases: Optional[List[str]] = None
 
 
 class AttributeComparison(BaseModel):
@@ -138,10 +179,90 @@ class GameSession(BaseModel):
     max_guesses: int = 5
 
 
+class GameSessionSummary(BaseModel):
+    """One row of the admin session listing; ids only, no firearm details."""
+
+    session_id: str
+    target_firearm_id: str
+    guesses_made: int
+    max_guesses: int
+    is_completed: bool
+    is_won: bool
+    created_at: datetime
+
+    @classmethod
+    def from_record(cls, record: SessionRecord) -> "GameSessionSummary":
+        return cls(
+            session_id=record.session_id,
+            target_firearm_id=record.target_id,
+            guesses_made=record.guess_count,
+            max_guesses=record.max_guesses,
+            is_completed=record.is_completed,
+            is_won=record.is_won,
+            created_at=record.created_datetime,
+        )
+
+
+class SessionFilter(BaseModel):
+    is_completed: Optional[bool] = None
+    is_won: Optional[bool] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def _local_naive(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Sessions are stamped in naive local time.
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value
+
+    def matches(self, record: SessionRecord) -> bool:
+        created_at = record.created_datetime
+        return (
+            (self.is_completed is None or record.is_completed == self.is_completed)
+            and (self.is_won is None or record.is_won == self.is_won)
+            and (self.created_after is None or created_at >= self.created_after)
+            and (self.created_before is None or created_at < self.created_before)
+        )
+
+
+class SessionStats(BaseModel):
+    active: int
+    started: int
+    completed: int
+    won: int
+    lost: int
+    win_rate: float
+    # Games won, keyed by the number of guesses it took.
+    guess_histogram: Dict[int, int]
+
+
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    format: str
+
+
+class ImageUploadResponse(BaseModel):
+    image_url: str
+    sha256: str
+    size: int
+    # True when identical bytes were already stored and the file was reused.
+    deduplicated: bool
+
+
 class NewGameResponse(BaseModel):
     session_id: str
     firearm_image_url: Optional[str]
     max_guesses: int
+    # Smaller, re-encoded copies of the image, narrowest first.
+    firearm_image_variants: List[ImageVariant] = []
+
+
+class DailyFirearmResponse(BaseModel):
+    firearm: Firearm
+    message: str
 
 
 class GameStatusResponse(BaseModel):
@@ -164,3 +285,33 @@ class GameRevealResponse(BaseModel):
 
 class NameGuessRequest(BaseModel):
     firearm_name: str
+
+
+class CatalogImportError(BaseModel):
+    line: int
+    message: str
+
+
+class CatalogImportResult(BaseModel):
+    imported: int = 0
+    rejected: int = 0
+    errors: List[CatalogImportError] = []
+
+
+class BatchStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+
+class BatchItemStatus(BaseModel):
+    id: str
+    status: BatchStatus
+    detail: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemStatus]
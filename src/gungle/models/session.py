@@ -0,0 +1,83 @@
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+COMPLETED = 0x1
+WON = 0x2
+
+
+class SessionRecord:
+    """Compact server-side state for one game session.
+
+    Only ids and per-guess comparison bitmasks are kept; the verbose
+    ``GameSession``/``GuessResult`` models are rebuilt from the catalog when a
+    response needs them. A mask records the result as first reported; rebuilt
+    history compares the firearms it shows, which may have been edited since.
+    """
+
+    __slots__ = (
+        "session_id",
+        "target_id",
+        "guess_ids",
+        "masks",
+        "created_at",
+        "max_guesses",
+        "flags",
+    )
+
+    def __init__(
+        self,
+        session_id: str,
+        target_id: str,
+        created_at: float,
+        max_guesses: int = 5,
+        guess_ids: Optional[List[str]] = None,
+        masks: Optional[bytearray] = None,
+        flags: int = 0,
+    ):
+        self.session_id = session_id
+        self.target_id = target_id
+        self.created_at = created_at
+        self.max_guesses = max_guesses
+        self.guess_ids: List[str] = guess_ids if guess_ids is not None else []
+        self.masks = masks if masks is not None else bytearray()
+        self.flags = flags
+
+    @property
+    def is_completed(self) -> bool:
+        return bool(self.flags & COMPLETED)
+
+    @property
+    def is_won(self) -> bool:
+        return bool(self.flags & WON)
+
+    @property
+    def guess_count(self) -> int:
+        return len(self.guess_ids)
+
+    @property
+    def created_datetime(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at)
+
+    def add_guess(self, firearm_id: str, mask: int) -> bool:
+        """Record a guess and return whether it finished the game."""
+        self.guess_ids.append(firearm_id)
+        self.masks.append(mask)
+        if firearm_id == self.target_id:
+            self.flags |= COMPLETED | WON
+        elif len(self.guess_ids) >= self.max_guesses:
+            self.flags |= COMPLETED
+        return self.is_completed
+
+    def guesses(self) -> Iterator[Tuple[str, int]]:
+        return zip(self.guess_ids, self.masks)
+
+    def copy(self) -> "SessionRecord":
+        return SessionRecord(
+            self.session_id,
+            self.target_id,
+            self.created_at,
+            self.max_guesses,
+            list(self.guess_ids),
+            bytearray(self.masks),
+            self.flags,
+        )
@@ -0,0 +1,174 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..database import (
+    AsyncSessionLocal,
+    FirearmArchiveDB,
+    FirearmDB,
+    current_async_db_session,
+)
+from ..models.firearm import Firearm, FirearmFilter
+from .async_firearm_repository import AsyncFirearmRepository
+from .db_firearm_repository import (
+    archive_row,
+    build_sample_firearms,
+    firearm_columns,
+    firearm_from_db,
+    firearm_to_db,
+)
+from .firearm_queries import select_firearms
+
+
+class AsyncDbFirearmRepository(AsyncFirearmRepository):
+    def __init__(
+        self, session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+    ):
+        factory = session_factory or AsyncSessionLocal
+        if factory is None:
+            raise ValueError("DATABASE_URL does not use an asyncio driver")
+        self.session_factory = factory
+        self._sample_data_initialized = False
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        db = current_async_db_session.get()
+        if db is not None:
+            yield db
+            return
+        async with self.session_factory() as db:
+            yield db
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[AsyncSession]:
+        """``_session`` that rolls back on error, leaving a shared one usable."""
+        async with self._session() as db:
+            try:
+                yield db
+            except Exception:
+                await db.rollback()
+                raise
+
+    async def _ensure_sample_data(self) -> None:
+        if self._sample_data_initialized:
+            return
+        # Seeding is attempted once; a failure is logged, not retried per call.
+        self._sample_data_initialized = True
+
+        try:
+            async with self._session() as db:
+                count = await db.scalar(select(func.count()).select_from(FirearmDB))
+                if not count:
+                    print("Loading sample firearm data...")
+                    sample_firearms = build_sample_firearms()
+                    db.add_all(sample_firearms)
+                    await db.commit()
+                    print(f"Loaded {len(sample_firearms)} sample firearms")
+
+        except Exception as e:
+            print(f"Error loading sample data: {e}")
+
+    async def get_all_firearms(self) -> List[Firearm]:
+        try:
+            await self._ensure_sample_data()
+            async with self._session() as db:
+                firearms_db = await db.scalars(select(FirearmDB))
+                return [firearm_from_db(f) for f in firearms_db]
+        except Exception as e:
+            print(f"Error getting firearms: {e}")
+            return []
+
+    async def iter_firearms(self, batch_size: int = 500) -> AsyncIterator[Firearm]:
+        await self._ensure_sample_data()
+        # Streamed bodies outlive the request scope, so this never borrows
+        # the request's session.
+        async with self.session_factory() as db:
+            columns = FirearmDB.__table__.c
+            statement = (
+                select(FirearmDB)
+                .order_by(columns.name, columns.id)
+                .execution_options(yield_per=batch_size)
+            )
+            async for firearm_db in await db.stream_scalars(statement):
+                yield firearm_from_db(firearm_db)
+
+    async def list_firearms(
+        self,
+        filters: FirearmFilter,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Firearm]:
+        try:
+            await self._ensure_sample_data()
+            async with self._session() as db:
+                statement = select_firearms(filters, limit, after)
+                return [firearm_from_db(f) for f in await db.scalars(statement)]
+        except Exception as e:
+            print(f"Error listing firearms: {e}")
+            return []
+
+    async def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
+        try:
+            await self._ensure_sample_data()
+            async with self._session() as db:
+                firearm_db = await db.get(FirearmDB, firearm_id)
+                return firearm_from_db(firearm_db) if firearm_db else None
+        except Exception as e:
+            print(f"Error getting firearm {firearm_id}: {e}")
+            return None
+
+    async def firearm_exists(self, firearm_id: str) -> bool:
+        try:
+            await self._ensure_sample_data()
+            async with self._session() as db:
+                return await db.get(FirearmDB, firearm_id) is not None
+        except Exception as e:
+            print(f"Error checking firearm existence: {e}")
+            return False
+
+    async def add_firearm(self, firearm: Firearm) -> bool:
+        try:
+            await self._ensure_sample_data()
+            async with self._transaction() as db:
+                if await db.get(FirearmDB, firearm.id) is not None:
+                    return False
+                db.add(firearm_to_db(firearm))
+                await db.commit()
+                return True
+        except Exception as e:
+            print(f"Error adding firearm: {e}")
+            return False
+
+    async def update_firearm(self, firearm_id: str, firearm: Firearm) -> bool:
+        try:
+            await self._ensure_sample_data()
+            async with self._transaction() as db:
+                columns = firearm_columns(firearm)
+                del columns["id"]
+                id_column = FirearmDB.__table__.c.id
+                result = await db.execute(
+                    update(FirearmDB).where(id_column == firearm_id).values(columns)
+                )
+                await db.commit()
+                return bool(getattr(result, "rowcount", 0))
+        except Exception as e:
+            print(f"Error updating firearm: {e}")
+            return False
+
+    async def delete_firearm(self, firearm_id: str) -> bool:
+        try:
+            await self._ensure_sample_data()
+            async with self._transaction() as db:
+                firearm_db = await db.get(FirearmDB, firearm_id)
+                if firearm_db is None:
+                    return False
+                # Archived for game sessions that still refer to it.
+                await db.merge(FirearmArchiveDB(**archive_row(firearm_db)))
+                await db.delete(firearm_db)
+                await db.commit()
+                return True
+        except Exception as e:
+            print(f"Error deleting firearm: {e}")
+            return False
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional, Tuple
+
+from ..models.firearm import Firearm, FirearmFilter
+
+
+class AsyncFirearmRepository(ABC):
+    @abstractmethod
+    async def get_all_firearms(self) -> List[Firearm]:
+        pass
+
+    @abstractmethod
+    def iter_firearms(self, batch_size: int = 500) -> AsyncIterator[Firearm]:
+        """All firearms in (name, id) order, fetched ``batch_size`` rows at a time."""
+        pass
+
+    @abstractmethod
+    async def list_firearms(
+        self,
+        filters: FirearmFilter,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Firearm]:
+        """Up to ``limit`` matches ordered by (name, id), starting after ``after``."""
+        pass
+
+    @abstractmethod
+    async def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
+        pass
+
+    @abstractmethod
+    async def firearm_exists(self, firearm_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def add_firearm(self, firearm: Firearm) -> bool:
+        pass
+
+    @abstractmethod
+    async def update_firearm(self, firearm_id: str, firearm: Firearm) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete_firearm(self, firearm_id: str) -> bool:
+        pass
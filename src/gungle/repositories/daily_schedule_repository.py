@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, Mapping
+
+
+class DailyScheduleRepository(ABC):
+    @abstractmethod
+    def get_range(self, start: date, end: date) -> Dict[date, str]:
+        """Scheduled firearm ids for ``start <= day <= end``."""
+        pass
+
+    @abstractmethod
+    def add_entries(self, entries: Mapping[date, str]) -> None:
+        """Insert entries, keeping any day that is already scheduled."""
+        pass
+
+    @abstractmethod
+    def replace_entry(self, day: date, previous_id: str, firearm_id: str) -> None:
+        """Schedule ``firearm_id`` on ``day`` if ``previous_id`` still holds it."""
+        pass
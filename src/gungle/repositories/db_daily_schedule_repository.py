@@ -0,0 +1,57 @@
+from datetime import date
+from typing import Callable, Dict, Mapping, Optional, cast
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..database import DailyScheduleDB, SessionLocal, upsert_statement
+from .daily_schedule_repository import DailyScheduleRepository
+
+
+class DbDailyScheduleRepository(DailyScheduleRepository):
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory or SessionLocal
+
+    def get_range(self, start: date, end: date) -> Dict[date, str]:
+        columns = DailyScheduleDB.__table__.c
+        statement = select(columns.puzzle_date, columns.firearm_id).where(
+            columns.puzzle_date >= start, columns.puzzle_date <= end
+        )
+        with self.session_factory() as db:
+            return {
+                cast(date, day): str(firearm_id)
+                for day, firearm_id in db.execute(statement)
+            }
+
+    def add_entries(self, entries: Mapping[date, str]) -> None:
+        if not entries:
+            return
+        rows = [{"puzzle_date": day, "firearm_id": fid} for day, fid in entries.items()]
+        with self.session_factory() as db:
+            statement = upsert_statement(
+                db.get_bind().dialect.name, DailyScheduleDB, ["puzzle_date"], []
+            )
+            if statement is None:
+                self._add_missing(db, entries)
+            else:
+                # Another worker may have scheduled the same days first; its
+                # picks win so every process serves the same puzzle.
+                db.execute(statement, rows)
+            db.commit()
+
+    def replace_entry(self, day: date, previous_id: str, firearm_id: str) -> None:
+        columns = DailyScheduleDB.__table__.c
+        # Conditional, so a day another worker already replaced keeps its pick.
+        statement = (
+            update(DailyScheduleDB)
+            .where(columns.puzzle_date == day, columns.firearm_id == previous_id)
+            .values(firearm_id=firearm_id)
+        )
+        with self.session_factory() as db:
+            db.execute(statement)
+            db.commit()
+
+    def _add_missing(self, db: Session, entries: Mapping[date, str]) -> None:
+        for day, firearm_id in entries.items():
+            if db.get(DailyScheduleDB, day) is None:
+                db.add(DailyScheduleDB(puzzle_date=day, firearm_id=firearm_id))
@@ -1,191 +1,326 @@
-from typing import List, Optional
-
+import json
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
 
-from ..database import FirearmDB, get_db
-from ..models.firearm import ActionType, Caliber, Firearm, FirearmType, ModelType
+from ..database import (
+    FirearmArchiveDB,
+    FirearmDB,
+    SessionLocal,
+    session_scope,
+    upsert_statement,
+    utcnow,
+)
+from ..models.firearm import (
+    ActionType,
+    Caliber,
+    Firearm,
+    FirearmFilter,
+    FirearmType,
+    ModelType,
+)
+from ..utils.models import construct_trusted
+from .firearm_queries import select_firearms
 from .firearm_repository import FirearmRepository
 
+E = TypeVar("E", bound=Enum)
+
+
+def build_sample_firearms() -> List[FirearmDB]:
+    return [
+        FirearmDB(
+            id="ak47",
+            name="AK-47",
+            manufacturer="Kalashnikov Concern",
+            type=FirearmType.RIFLE.value,
+            caliber=Caliber.SEVEN_SIX_TWO_X39.value,
+            country_of_origin="Soviet Union",
+            model_type=ModelType.MILITARY.value,
+            year_introduced=1947,
+            action_type=ActionType.LONG_STROKE_GAS_PISTON.value,
+            description="Selective-fire assault rifle",
+            image_url="/uploads/images/ak47.jpg",
+            aliases=json.dumps(["AK", "Kalashnikov"]),
+        ),
+        FirearmDB(
+            id="mp40",
+            name="MP 40",
+            manufacturer="Erma Werke",
+            type=FirearmType.SMG.value,
+            caliber=Caliber.NINE_MM.value,
+            country_of_origin="Germany",
+            model_type=ModelType.MILITARY.value,
+            year_introduced=1940,
+            action_type=ActionType.SIMPLE_BLOWBACK.value,
+            description="German submachine gun used in WWII",
+            image_url="/uploads/images/mp40.jpg",
+            aliases=json.dumps(["MP40", "Schmeisser"]),
+        ),
+        FirearmDB(
+            id="colt_1911",
+            name="Colt M1911",
+            manufacturer="Colt's Manufacturing Company",
+            type=FirearmType.PISTOL.value,
+            caliber=Caliber.FORTY_FIVE_ACP.value,
+            country_of_origin="United States",
+            model_type=ModelType.MILITARY.value,
+            year_introduced=1911,
+            action_type=ActionType.SHOT_RECOIL.value,
+            description="Semi-automatic pistol",
+            image_url="/uploads/images/colt_1911.jpg",
+            aliases=json.dumps(["M1911", "1911"]),
+        ),
+        FirearmDB(
+            id="thompson_m1928",
+            name="Thompson M1928",
+            manufacturer="Auto-Ordnance Corporation",
+            type=FirearmType.SMG.value,
+            caliber=Caliber.FORTY_FIVE_ACP.value,
+            country_of_origin="United States",
+            model_type=ModelType.MILITARY.value,
+            year_introduced=1928,
+            action_type=ActionType.SIMPLE_BLOWBACK.value,
+            description="Submachine gun known as Tommy Gun",
+            image_url="/uploads/images/thompson.jpg",
+            aliases=json.dumps(["Tommy Gun"]),
+        ),
+        FirearmDB(
+            id="lee_enfield",
+            name="Lee-Enfield",
+            manufacturer="Royal Small Arms Factory",
+            type=FirearmType.RIFLE.value,
+            caliber=Caliber.THREE_OH_THREE_BRITISH.value,
+            country_of_origin="United Kingdom",
+            model_type=ModelType.MILITARY.value,
+            year_introduced=1895,
+            action_type=ActionType.ROTATING_BOLT_ACTION.value,
+            description="Bolt-action rifle used by British forces",
+            image_url="/uploads/images/lee_enfield.jpg",
+            aliases=json.dumps(["SMLE"]),
+        ),
+        FirearmDB(
+            id="m1_garand",
+            name="M1 Garand",
+            manufacturer="Springfield Armory",
+            type=FirearmType.RIFLE.value,
+            caliber=Caliber.THIRTY_OH_SIX.value,
+            country_of_origin="United States",
+            model_type=ModelType.MILITARY.value,
+            year_introduced=1936,
+            action_type=ActionType.ROTATING_BOLT_ACTION.value,
+            description=("Semi-automatic rifle used by US forces in WWII"),
+            image_url="/uploads/images/m1_garand.jpg",
+            aliases=json.dumps(["Garand"]),
+        ),
+    ]
+
+
+def firearm_from_db(firearm_db: Union[FirearmDB, FirearmArchiveDB]) -> Firearm:
+    # Every column is NOT NULL and was written from a validated ``Firearm``
+    # (see ``firearm_columns``), so the row is trusted rather than revalidated.
+    return construct_trusted(
+        Firearm,
+        {
+            "id": firearm_db.id,
+            "name": firearm_db.name,
+            "manufacturer": firearm_db.manufacturer,
+            "type": _enum_member(FirearmType, firearm_db.type),
+            "caliber": _enum_member(Caliber, firearm_db.caliber),
+            "country_of_origin": firearm_db.country_of_origin,
+            "model_type": _enum_member(ModelType, firearm_db.model_type),
+            "year_introduced": firearm_db.year_introduced,
+            "action_type": _enum_member(ActionType, firearm_db.action_type),
+            "description": firearm_db.description,
+            "image_url": firearm_db.image_url,
+            "aliases": json.loads(str(firearm_db.aliases or "[]")),
+        },
+    )
+
+
+def _enum_member(enum: Type[E], value: Any) -> E:
+    member = enum._value2member_map_.get(value)
+    # A value no enum member has still fails loudly, as validation would.
+    return cast(E, member) if member is not None else enum(value)
+
+
+def firearm_change_columns(changes: Mapping[str, Any]) -> Dict[str, Any]:
+    """Map ``Firearm`` field values to column values, e.g. enums to strings."""
+    columns: Dict[str, Any] = {}
+    for field, value in changes.items():
+        if field == "aliases":
+            value = json.dumps(value)
+        elif isinstance(value, Enum):
+            value = value.value
+        columns[field] = value
+    return columns
+
+
+def firearm_columns(firearm: Firearm) -> Dict[str, Any]:
+    return firearm_change_columns(dict(firearm))
+
+
+FIREARM_COLUMNS = tuple(Firearm.model_fields)
+
+
+def firearm_to_db(firearm: Firearm) -> FirearmDB:
+    return FirearmDB(**firearm_columns(firearm))
+
+
+def archive_row(firearm_db: FirearmDB) -> Dict[str, Any]:
+    """The archive columns for a firearm row that is about to be deleted."""
+    row = {column: getattr(firearm_db, column) for column in FIREARM_COLUMNS}
+    row["deleted_at"] = utcnow()
+    return row
+
+
+def archive_firearms(db: Session, firearms_db: Sequence[FirearmDB]) -> None:
+    """Copy rows into ``firearm_archive`` within the caller's transaction.
+
+    Game sessions keep the ids of the firearms they were played with, so a
+    deleted firearm is archived for them to keep rendering.
+    """
+    rows = [archive_row(firearm_db) for firearm_db in firearms_db]
+    if not rows:
+        return
+    statement = upsert_statement(
+        db.get_bind().dialect.name,
+        FirearmArchiveDB,
+        ["id"],
+        [column for column in rows[0] if column != "id"],
+    )
+    if statement is None:
+        for row in rows:
+            db.merge(FirearmArchiveDB(**row))
+    else:
+        db.execute(statement, rows)
+
 
 class DbFirearmRepository(FirearmRepository):
-    def __init__(self, db_session: Optional[Session] = None):
+    def __init__(
+        self,
+        db_session: Optional[Session] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ):
         self.db_session = db_session
+        self.session_factory = session_factory
         self._sample_data_initialized = False
+        self._sample_data_lock = threading.Lock()
 
-    def _get_db(self) -> Session:
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
         if self.db_session:
-            return self.db_session
-        return next(get_db())
+            yield self.db_session
+            return
+        if self.session_factory is not None:
+            with self.session_factory() as db:
+                yield db
+            return
+        with session_scope() as db:
+            yield db
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Session]:
+        """``_session`` that rolls back on error, leaving a shared one usable."""
+        with self._session() as db:
+            try:
+                yield db
+            except Exception:
+                db.rollback()
+                raise
 
     def _ensure_sample_data(self) -> None:
         if self._sample_data_initialized:
             return
 
-        try:
-            db = self._get_db()
-
-            if db.query(FirearmDB).count() > 0:
-                if not self.db_session:
-                    db.close()
+        with self._sample_data_lock:
+            # Seeding is attempted once per repository; a failure is logged
+            # rather than retried with another count() on every call.
+            if not self._sample_data_initialized:
                 self._sample_data_initialized = True
-                return
-
-            print("Loading sample firearm data...")
-
-            sample_firearms = [
-                FirearmDB(
-                    id="ak47",
-                    name="AK-47",
-                    manufacturer="Kalashnikov Concern",
-                    type=FirearmType.RIFLE.value,
-                    caliber=Caliber.SEVEN_SIX_TWO_X39.value,
-                    country_of_origin="Soviet Union",
-                    model_type=ModelType.MILITARY.value,
-                    year_introduced=1947,
-                    action_type=ActionType.LONG_STROKE_GAS_PISTON.value,
-                    description="Selective-fire assault rifle",
-                    image_url="/uploads/images/ak47.jpg",
-                ),
-                FirearmDB(
-                    id="mp40",
-                    name="MP 40",
-                    manufacturer="Erma Werke",
-                    type=FirearmType.SMG.value,
-                    caliber=Caliber.NINE_MM.value,
-                    country_of_origin="Germany",
-                    model_type=ModelType.MILITARY.value,
-                    year_introduced=1940,
-                    action_type=ActionType.SIMPLE_BLOWBACK.value,
-                    description="German submachine gun used in WWII",
-                    image_url="/uploads/images/mp40.jpg",
-                ),
-                FirearmDB(
-                    id="colt_1911",
-                    name="Colt M1911",
-                    manufacturer="Colt's Manufacturing Company",
-                    type=FirearmType.PISTOL.value,
-                    caliber=Caliber.FORTY_FIVE_ACP.value,
-                    country_of_origin="United States",
-                    model_type=ModelType.MILITARY.value,
-                    year_introduced=1911,
-                    action_type=ActionType.SHOT_RECOIL.value,
-                    description="Semi-automatic pistol",
-                    image_url="/uploads/images/colt_1911.jpg",
-                ),
-                FirearmDB(
-                    id="thompson_m1928",
-                    name="Thompson M1928",
-                    manufacturer="Auto-Ordnance Corporation",
-                    type=FirearmType.SMG.value,
-                    caliber=Caliber.FORTY_FIVE_ACP.value,
-                    country_of_origin="United States",
-                    model_type=ModelType.MILITARY.value,
-                    year_introduced=1928,
-                    action_type=ActionType.SIMPLE_BLOWBACK.value,
-                    description="Submachine gun known as Tommy Gun",
-                    image_url="/uploads/images/thompson.jpg",
-                ),
-                FirearmDB(
-                    id="lee_enfield",
-                    name="Lee-Enfield",
-                    manufacturer="Royal Small Arms Factory",
-                    type=FirearmType.RIFLE.value,
-                    caliber=Caliber.THREE_OH_THREE_BRITISH.value,
-                    country_of_origin="United Kingdom",
-                    model_type=ModelType.MILITARY.value,
-                    year_introduced=1895,
-                    action_type=ActionType.ROTATING_BOLT_ACTION.value,
-                    description="Bolt-action rifle used by British forces",
-                    image_url="/uploads/images/lee_enfield.jpg",
-                ),
-                FirearmDB(
-                    id="m1_garand",
-                    name="M1 Garand",
-                    manufacturer="Springfield Armory",
-                    type=FirearmType.RIFLE.value,
-                    caliber=Caliber.THIRTY_OH_SIX.value,
-                    country_of_origin="United States",
-                    model_type=ModelType.MILITARY.value,
-                    year_introduced=1936,
-                    action_type=ActionType.ROTATING_BOLT_ACTION.value,
-                    description=("Semi-automatic rifle used by US forces in WWII"),
-                    image_url="/uploads/images/m1_garand.jpg",
-                ),
-            ]
-
-            for firearm_db in sample_firearms:
-                db.add(firearm_db)
-
-            db.commit()
-            print(f"Loaded {len(sample_firearms)} sample firearms")
-
-            if not self.db_session:
-                db.close()
+                self._load_sample_data()
+
+    def _load_sample_data(self) -> None:
+        try:
+            with self._session() as db:
+                if db.query(FirearmDB).count() > 0:
+                    return
 
-            self._sample_data_initialized = True
+                print("Loading sample firearm data...")
+                sample_firearms = build_sample_firearms()
+                db.add_all(sample_firearms)
+                db.commit()
+                print(f"Loaded {len(sample_firearms)} sample firearms")
 
         except Exception as e:
             print(f"Error loading sample data: {e}")
-            if not self.db_session and "db" in locals():
-                db.close()
-
-    def _db_to_pydantic(self, firearm_db: FirearmDB) -> Firearm:
-        return Firearm(
-            id=str(firearm_db.id),
-            name=str(firearm_db.name),
-            manufacturer=str(firearm_db.manufacturer),
-            type=FirearmType(str(firearm_db.type)),
-            caliber=Caliber(str(firearm_db.caliber)),
-            country_of_origin=str(firearm_db.country_of_origin),
-            model_type=ModelType(str(firearm_db.model_type)),
-            action_type=ActionType(str(firearm_db.action_type)),
-            year_introduced=int(firearm_db.year_introduced),
-            description=str(firearm_db.description),
-            image_url=str(firearm_db.image_url),
-        )
-
-    def _pydantic_to_db(self, firearm: Firearm) -> FirearmDB:
-        return FirearmDB(
-            id=firearm.id,
-            name=firearm.name,
-            manufacturer=firearm.manufacturer,
-            type=firearm.type.value,
-            caliber=firearm.caliber.value,
-            country_of_origin=firearm.country_of_origin,
-            model_type=firearm.model_type.value,
-            year_introduced=firearm.year_introduced,
-            action_type=firearm.action_type.value,
-            description=firearm.description,
-            image_url=firearm.image_url,
-        )
 
     def get_all_firearms(self) -> List[Firearm]:
         try:
             self._ensure_sample_data()
-            db = self._get_db()
-            firearms_db = db.query(FirearmDB).all()
-            result = [self._db_to_pydantic(f) for f in firearms_db]
+            with self._session() as db:
+                return [firearm_from_db(f) for f in db.query(FirearmDB).all()]
+        except Exception as e:
+            print(f"Error getting firearms: {e}")
+            return []
 
-            if not self.db_session:
+    def iter_firearms(self, batch_size: int = 500) -> Iterator[Firearm]:
+        self._ensure_sample_data()
+        # Streamed bodies outlive the request scope, so this never borrows
+        # the request's session.
+        db = self.db_session or (self.session_factory or SessionLocal)()
+        try:
+            columns = FirearmDB.__table__.c
+            statement = (
+                select(FirearmDB)
+                .order_by(columns.name, columns.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for firearm_db in db.scalars(statement):
+                yield firearm_from_db(firearm_db)
+        finally:
+            if db is not self.db_session:
                 db.close()
-            return result
+
+    def list_firearms(
+        self,
+        filters: FirearmFilter,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Firearm]:
+        try:
+            self._ensure_sample_data()
+            with self._session() as db:
+                statement = select_firearms(filters, limit, after)
+                return [firearm_from_db(f) for f in db.scalars(statement)]
         except Exception as e:
-            print(f"Error getting firearms: {e}")
+            print(f"Error listing firearms: {e}")
             return []
 
     def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
         try:
             self._ensure_sample_data()
-            db = self._get_db()
-            firearm_db = db.query(FirearmDB).filter(FirearmDB.id == firearm_id).first()
-
-            result = None
-            if firearm_db:
-                result = self._db_to_pydantic(firearm_db)
-
-            if not self.db_session:
-                db.close()
-            return result
+            with self._session() as db:
+                firearm_db = db.get(FirearmDB, firearm_id)
+                return firearm_from_db(firearm_db) if firearm_db else None
         except Exception as e:
             print(f"Error getting firearm {firearm_id}: {e}")
             return None
@@ -193,21 +328,12 @@ class DbFirearmRepository(FirearmRepository):
     def add_firearm(self, firearm: Firearm) -> bool:
         try:
             self._ensure_sample_data()
-            db = self._get_db()
-
-            existing = db.query(FirearmDB).filter(FirearmDB.id == firearm.id).first()
-            if existing:
-                if not self.db_session:
-                    db.close()
-                return False
-
-            firearm_db = self._pydantic_to_db(firearm)
-            db.add(firearm_db)
-            db.commit()
-
-            if not self.db_session:
-                db.close()
-            return True
+            with self._transaction() as db:
+                if db.get(FirearmDB, firearm.id) is not None:
+                    return False
+                db.add(firearm_to_db(firearm))
+                db.commit()
+                return True
 
         except Exception as e:
             print(f"Error adding firearm: {e}")
@@ -216,29 +342,15 @@ class DbFirearmRepository(FirearmRepository):
     def update_firearm(self, firearm_id: str, firearm: Firearm) -> bool:
         try:
             self._ensure_sample_data()
-            db = self._get_db()
-
-            firearm_db = db.query(FirearmDB).filter(FirearmDB.id == firearm_id).first()
-            if not firearm_db:
-                if not self.db_session:
-                    db.close()
-                return False
-
-            setattr(firearm_db, "name", firearm.name)
-            setattr(firearm_db, "manufacturer", firearm.manufacturer)
-            setattr(firearm_db, "type", firearm.type.value)
-            setattr(firearm_db, "caliber", firearm.caliber.value)
-            setattr(firearm_db, "country_of_origin", firearm.country_of_origin)
-            setattr(firearm_db, "model_type", firearm.model_type.value)
-            setattr(firearm_db, "year_introduced", firearm.year_introduced)
-            setattr(firearm_db, "description", firearm.description)
-            setattr(firearm_db, "action_type", firearm.action_type.value)
-            setattr(firearm_db, "image_url", firearm.image_url)
-
-            db.commit()
-            if not self.db_session:
-                db.close()
-            return True
+            with self._transaction() as db:
+                columns = firearm_columns(firearm)
+                del columns["id"]
+                id_column = FirearmDB.__table__.c.id
+                result = db.execute(
+                    update(FirearmDB).where(id_column == firearm_id).values(columns)
+                )
+                db.commit()
+                return bool(getattr(result, "rowcount", 0))
 
         except Exception as e:
             print(f"Error updating firearm: {e}")
@@ -247,20 +359,15 @@ class DbFirearmRepository(FirearmRepository):
     def delete_firearm(self, firearm_id: str) -> bool:
         try:
             self._ensure_sample_data()
-            db = self._get_db()
-
-            firearm_db = db.query(FirearmDB).filter(FirearmDB.id == firearm_id).first()
-            if not firearm_db:
-                if not self.db_session:
-                    db.close()
-                return False
-
-            db.delete(firearm_db)
-            db.commit()
+            with self._transaction() as db:
+                firearm_db = db.get(FirearmDB, firearm_id)
+                if not firearm_db:
+                    return False
 
-            if not self.db_session:
-                db.close()
-            return True
+                archive_firearms(db, [firearm_db])
+                db.delete(firearm_db)
+                db.commit()
+                return True
 
         except Exception as e:
             print(f"Error deleting firearm: {e}")
@@ -269,15 +376,117 @@ class DbFirearmRepository(FirearmRepository):
     def firearm_exists(self, firearm_id: str) -> bool:
         try:
             self._ensure_sample_data()
-            db = self._get_db()
-            exists = (
-                db.query(FirearmDB).filter(FirearmDB.id == firearm_id).first()
-                is not None
-            )
-
-            if not self.db_session:
-                db.close()
-            return exists
+            with self._session() as db:
+                return db.get(FirearmDB, firearm_id) is not None
         except Exception as e:
             print(f"Error checking firearm existence: {e}")
             return False
+
+    def get_archived_firearm(self, firearm_id: str) -> Optional[Firearm]:
+        try:
+            with self._session() as db:
+                archived = db.get(FirearmArchiveDB, firearm_id)
+                return firearm_from_db(archived) if archived else None
+        except Exception as e:
+            print(f"Error getting archived firearm {firearm_id}: {e}")
+            return None
+
+    def catalog_fingerprint(self) -> str:
+        self._ensure_sample_data()
+        columns = FirearmDB.__table__.c
+        with self._session() as db:
+            count, updated_at = db.execute(
+                select(func.count(), func.max(columns.updated_at))
+            ).one()
+        return f"{count}:{updated_at}"
+
+    def upsert_firearms(self, firearms: Sequence[Firearm]) -> Set[str]:
+        if not firearms:
+            return set()
+        self._ensure_sample_data()
+        now = utcnow()
+        # ON CONFLICT DO UPDATE skips onupdate defaults, so stamp rows here.
+        # One row per id, the last wins: a statement may not touch a row twice.
+        rows = list(
+            {
+                firearm.id: {**firearm_columns(firearm), "updated_at": now}
+                for firearm in firearms
+            }.values()
+        )
+        with self._session() as db:
+            statement = upsert_statement(
+                db.get_bind().dialect.name,
+                FirearmDB,
+                ["id"],
+                [column for column in FIREARM_COLUMNS if column != "id"]
+                + ["updated_at"],
+            )
+            try:
+                id_column = FirearmDB.__table__.c.id
+                existing = set(
+                    db.scalars(
+                        select(id_column).where(
+                            id_column.in_([row["id"] for row in rows])
+                        )
+                    )
+                )
+                if statement is None:
+                    for row in rows:
+                        db.merge(FirearmDB(**row))
+                else:
+                    db.execute(statement, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        return existing
+
+    def patch_firearms(self, changes: Mapping[str, Mapping[str, Any]]) -> Set[str]:
+        if not changes:
+            return set()
+        self._ensure_sample_data()
+        with self._session() as db:
+            try:
+                id_column = FirearmDB.__table__.c.id
+                existing = set(
+                    db.scalars(select(id_column).where(id_column.in_(list(changes))))
+                )
+                now = utcnow()
+                rows = [
+                    {
+                        "id": firearm_id,
+                        **firearm_change_columns(fields),
+                        "updated_at": now,
+                    }
+                    for firearm_id, fields in changes.items()
+                    if firearm_id in existing and fields
+                ]
+                if rows:
+                    # ORM bulk UPDATE by primary key: one executemany per
+                    # distinct set of patched columns.
+                    db.execute(update(FirearmDB), rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        return existing
+
+    def delete_firearms(self, firearm_ids: Sequence[str]) -> Set[str]:
+        if not firearm_ids:
+            return set()
+        self._ensure_sample_data()
+        with self._session() as db:
+            try:
+                id_column = FirearmDB.__table__.c.id
+                deleted = list(
+                    db.scalars(select(FirearmDB).where(id_column.in_(firearm_ids)))
+                )
+                existing = {cast(str, firearm_db.id) for firearm_db in deleted}
+                archive_firearms(db, deleted)
+                if existing:
+                    db.execute(delete(FirearmDB).where(id_column.in_(existing)))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        return existing
@@ -0,0 +1,212 @@
+import json
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..database import (
+    GameSessionDB,
+    SessionLocal,
+    SessionStatDB,
+    increment_statement,
+    upsert_statement,
+)
+from ..models.firearm import SessionFilter
+from ..models.session import COMPLETED, WON, SessionRecord
+from .game_session_repository import GameSessionRepository
+
+_UPDATED_COLUMNS = ("guesses_made", "is_completed", "is_won", "max_guesses")
+
+
+def _guesses_json(guesses: Sequence[Tuple[str, int]]) -> str:
+    return json.dumps(list(guesses))
+
+
+class DbGameSessionRepository(GameSessionRepository):
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory or SessionLocal
+
+    def _db_to_record(self, session_db: GameSessionDB) -> SessionRecord:
+        guesses = json.loads(str(session_db.guesses_made))
+        flags = (COMPLETED if str(session_db.is_completed) == "true" else 0) | (
+            WON if str(session_db.is_won) == "true" else 0
+        )
+        return SessionRecord(
+            session_id=str(session_db.session_id),
+            target_id=str(session_db.target_firearm_id),
+            created_at=cast(datetime, session_db.created_at).timestamp(),
+            max_guesses=int(session_db.max_guesses),
+            guess_ids=[firearm_id for firearm_id, _ in guesses],
+            masks=bytearray(mask for _, mask in guesses),
+            flags=flags,
+        )
+
+    def _record_to_row(self, record: SessionRecord) -> Dict[str, Any]:
+        return {
+            "session_id": record.session_id,
+            "target_firearm_id": record.target_id,
+            "guesses_made": _guesses_json(list(record.guesses())),
+            "is_completed": "true" if record.is_completed else "false",
+            "is_won": "true" if record.is_won else "false",
+            "created_at": record.created_datetime,
+            "max_guesses": record.max_guesses,
+        }
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        try:
+            with self.session_factory() as db:
+                session_db = db.get(GameSessionDB, session_id)
+                return self._db_to_record(session_db) if session_db else None
+        except Exception as e:
+            print(f"Error getting game session {session_id}: {e}")
+            return None
+
+    def iter_sessions(self, created_after: datetime) -> Iterator[SessionRecord]:
+        created_at = GameSessionDB.__table__.c.created_at
+        statement = (
+            select(GameSessionDB)
+            .where(created_at >= created_after)
+            .execution_options(yield_per=500)
+        )
+        with self.session_factory() as db:
+            for session_db in db.scalars(statement):
+                yield self._db_to_record(session_db)
+
+    def count_sessions(self, created_after: datetime) -> int:
+        created_at = GameSessionDB.__table__.c.created_at
+        statement = (
+            select(func.count())
+            .select_from(GameSessionDB)
+            .where(created_at >= created_after)
+        )
+        with self.session_factory() as db:
+            return int(db.scalar(statement) or 0)
+
+    def list_sessions(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[SessionRecord]:
+        columns = GameSessionDB.__table__.c
+        statement = select(GameSessionDB)
+        if filters.is_completed is not None:
+            flag = "true" if filters.is_completed else "false"
+            statement = statement.where(columns.is_completed == flag)
+        if filters.is_won is not None:
+            flag = "true" if filters.is_won else "false"
+            statement = statement.where(columns.is_won == flag)
+        if filters.created_after is not None:
+            statement = statement.where(columns.created_at >= filters.created_after)
+        if filters.created_before is not None:
+            statement = statement.where(columns.created_at < filters.created_before)
+        if after is not None:
+            created_at = datetime.fromtimestamp(after[0])
+            statement = statement.where(
+                or_(
+                    columns.created_at < created_at,
+                    and_(
+                        columns.created_at == created_at,
+                        columns.session_id < after[1],
+                    ),
+                )
+            )
+        statement = statement.order_by(
+            columns.created_at.desc(), columns.session_id.desc()
+        ).limit(limit)
+        with self.session_factory() as db:
+            return [self._db_to_record(row) for row in db.scalars(statement)]
+
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        rows = [{"name": name, "value": value} for name, value in deltas.items()]
+        if not rows:
+            return
+        with self.session_factory() as db:
+            statement = increment_statement(
+                db.get_bind().dialect.name, SessionStatDB, ["name"], "value"
+            )
+            if statement is not None:
+                db.execute(statement, rows)
+            else:
+                columns = SessionStatDB.__table__.c
+                for row in rows:
+                    result = db.execute(
+                        update(SessionStatDB)
+                        .where(columns.name == row["name"])
+                        .values(value=columns.value + row["value"])
+                    )
+                    if not getattr(result, "rowcount", 0):
+                        db.add(SessionStatDB(**row))
+            db.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        columns = SessionStatDB.__table__.c
+        with self.session_factory() as db:
+            return {
+                str(name): int(value)
+                for name, value in db.execute(select(columns.name, columns.value))
+            }
+
+    def save_sessions(self, sessions: Sequence[SessionRecord]) -> None:
+        if not sessions:
+            return
+        rows = [self._record_to_row(session) for session in sessions]
+        with self.session_factory() as db:
+            self._upsert(db, rows)
+            db.commit()
+
+    def replace_session(self, record: SessionRecord, guess_count: int) -> bool:
+        row = self._record_to_row(record)
+        # Guesses are only ever appended, so the stored row matches the one
+        # that was read exactly when it holds the same leading guesses.
+        previous = _guesses_json(list(record.guesses())[:guess_count])
+        columns = GameSessionDB.__table__.c
+        statement = (
+            update(GameSessionDB)
+            .where(
+                columns.session_id == record.session_id,
+                columns.guesses_made == previous,
+            )
+            .values({column: row[column] for column in _UPDATED_COLUMNS})
+        )
+        with self.session_factory() as db:
+            result = db.execute(statement)
+            db.commit()
+            return bool(getattr(result, "rowcount", 0))
+
+    def delete_sessions(self, session_ids: Sequence[str]) -> None:
+        if not session_ids:
+            return
+        with self.session_factory() as db:
+            session_id = GameSessionDB.__table__.c.session_id
+            db.execute(delete(GameSessionDB).where(session_id.in_(session_ids)))
+            db.commit()
+
+    def delete_sessions_created_before(self, cutoff: datetime) -> int:
+        with self.session_factory() as db:
+            created_at = GameSessionDB.__table__.c.created_at
+            result = db.execute(delete(GameSessionDB).where(created_at < cutoff))
+            db.commit()
+            return int(getattr(result, "rowcount", 0) or 0)
+
+    def _upsert(self, db: Session, rows: Sequence[Dict[str, Any]]) -> None:
+        statement = upsert_statement(
+            db.get_bind().dialect.name, GameSessionDB, ["session_id"], _UPDATED_COLUMNS
+        )
+        if statement is None:
+            for row in rows:
+                db.merge(GameSessionDB(**row))
+            return
+        db.execute(statement, rows)
@@ -0,0 +1,36 @@
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+
+from ..database import FirearmDB
+from ..models.firearm import FirearmFilter
+
+# (name, id) of the last firearm on the previous page.
+FirearmKey = Tuple[str, str]
+
+
+def select_firearms(
+    filters: FirearmFilter, limit: int, after: Optional[FirearmKey] = None
+) -> Any:
+    """Filtered page of firearms in (name, id) order, shared by both repositories.
+
+    Pages continue from ``after`` with a row-value comparison, which the
+    ``ix_firearms_name_id`` index answers without scanning skipped rows.
+    """
+    columns = FirearmDB.__table__.c
+    statement = select(FirearmDB)
+    if filters.type is not None:
+        statement = statement.where(columns.type == filters.type.value)
+    if filters.caliber is not None:
+        statement = statement.where(columns.caliber == filters.caliber.value)
+    if filters.country_of_origin is not None:
+        statement = statement.where(
+            columns.country_of_origin == filters.country_of_origin
+        )
+    if filters.year_min is not None:
+        statement = statement.where(columns.year_introduced >= filters.year_min)
+    if filters.year_max is not None:
+        statement = statement.where(columns.year_introduced <= filters.year_max)
+    if after is not None:
+        statement = statement.where(tuple_(columns.name, columns.id) > tuple_(*after))
+    return statement.order_by(columns.name, columns.id).limit(limit)
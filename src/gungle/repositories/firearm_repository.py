@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
-from ..models.firearm import Firearm
+from ..models.firearm import Firearm, FirearmFilter
 
 
 class FirearmRepository(ABC):
@@ -9,6 +9,21 @@ class FirearmRepository(ABC):
     def get_all_firearms(self) -> List[Firearm]:
         pass
 
+    @abstractmethod
+    def iter_firearms(self, batch_size: int = 500) -> Iterator[Firearm]:
+        """All firearms in (name, id) order, fetched ``batch_size`` rows at a time."""
+        pass
+
+    @abstractmethod
+    def list_firearms(
+        self,
+        filters: FirearmFilter,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Firearm]:
+        """Up to ``limit`` matches ordered by (name, id), starting after ``after``."""
+        pass
+
     @abstractmethod
     def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
         pass
@@ -28,3 +43,29 @@ class FirearmRepository(ABC):
     @abstractmethod
     def delete_firearm(self, firearm_id: str) -> bool:
         pass
+
+    @abstractmethod
+    def get_archived_firearm(self, firearm_id: str) -> Optional[Firearm]:
+        """A deleted firearm as it was when deleted, or None."""
+        pass
+
+    @abstractmethod
+    def catalog_fingerprint(self) -> str:
+        """A cheap token that changes whenever any stored firearm does."""
+        pass
+
+    @abstractmethod
+    def upsert_firearms(self, firearms: Sequence[Firearm]) -> Set[str]:
+        """Insert or replace ``firearms`` in one transaction, the last of any
+        repeated id winning; returns the ids that already existed."""
+        pass
+
+    @abstractmethod
+    def patch_firearms(self, changes: Mapping[str, Mapping[str, Any]]) -> Set[str]:
+        """Apply per-id field changes in one transaction; returns the ids found."""
+        pass
+
+    @abstractmethod
+    def delete_firearms(self, firearm_ids: Sequence[str]) -> Set[str]:
+        """Delete ``firearm_ids`` in one transaction; returns the ids found."""
+        pass
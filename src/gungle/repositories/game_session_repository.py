@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..models.firearm import SessionFilter
+from ..models.session import SessionRecord
+
+
+class GameSessionRepository(ABC):
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        pass
+
+    @abstractmethod
+    def iter_sessions(self, created_after: datetime) -> Iterator[SessionRecord]:
+        pass
+
+    @abstractmethod
+    def count_sessions(self, created_after: datetime) -> int:
+        pass
+
+    @abstractmethod
+    def list_sessions(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[SessionRecord]:
+        """Newest first, starting below the (created_at, session id) ``after``."""
+        pass
+
+    @abstractmethod
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def save_sessions(self, sessions: Sequence[SessionRecord]) -> None:
+        pass
+
+    @abstractmethod
+    def replace_session(self, record: SessionRecord, guess_count: int) -> bool:
+        """Save ``record`` only while the stored row has ``guess_count`` guesses.
+
+        Returns False, writing nothing, if the row is missing or another
+        writer got there first.
+        """
+        pass
+
+    @abstractmethod
+    def delete_sessions(self, session_ids: Sequence[str]) -> None:
+        pass
+
+    @abstractmethod
+    def delete_sessions_created_before(self, cutoff: datetime) -> int:
+        pass
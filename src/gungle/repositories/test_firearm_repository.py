@@ -1,12 +1,21 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
 
-from ..models.firearm import ActionType, Caliber, Firearm, FirearmType, ModelType
+from ..models.firearm import (
+    ActionType,
+    Caliber,
+    Firearm,
+    FirearmFilter,
+    FirearmType,
+    ModelType,
+)
 from .firearm_repository import FirearmRepository
 
 
 class TestFirearmRepository(FirearmRepository):
     def __init__(self) -> None:
         self._firearms = self._create_sample_data()
+        self._revision = 0
+        self._archive: Dict[str, Firearm] = {}
 
     def _create_sample_data(self) -> List[Firearm]:
         return [
@@ -22,6 +31,7 @@ class TestFirearmRepository(FirearmRepository):
                 action_type=ActionType.LONG_STROKE_GAS_PISTON,
                 description="Selective-fire assault rifle",
                 image_url="/uploads/images/ak47.jpg",
+                aliases=["AK", "Kalashnikov"],
             ),
             Firearm(
                 id="mp40",
@@ -35,6 +45,7 @@ class TestFirearmRepository(FirearmRepository):
                 action_type=ActionType.SIMPLE_BLOWBACK,
                 description="German submachine gun used in WWII",
                 image_url="/uploads/images/mp40.jpg",
+                aliases=["MP40", "Schmeisser"],
             ),
             Firearm(
                 id="colt_1911",
@@ -48,6 +59,7 @@ class TestFirearmRepository(FirearmRepository):
                 action_type=ActionType.SHOT_RECOIL,
                 description="Semi-automatic pistol",
                 image_url="/uploads/images/colt_1911.jpg",
+                aliases=["M1911", "1911"],
             ),
             Firearm(
                 id="thompson_m1928",
@@ -61,6 +73,7 @@ class TestFirearmRepository(FirearmRepository):
                 action_type=ActionType.SIMPLE_BLOWBACK,
                 description="Submachine gun known as Tommy Gun",
                 image_url="/uploads/images/thompson.jpg",
+                aliases=["Tommy Gun"],
             ),
             Firearm(
                 id="lee_enfield",
@@ -74,6 +87,7 @@ class TestFirearmRepository(FirearmRepository):
                 action_type=ActionType.ROTATING_BOLT_ACTION,
                 description="Bolt-action rifle used by British forces",
                 image_url="/uploads/images/lee_enfield.jpg",
+                aliases=["SMLE"],
             ),
             Firearm(
                 id="m1_garand",
@@ -87,12 +101,30 @@ class TestFirearmRepository(FirearmRepository):
                 action_type=ActionType.ROTATING_BOLT_ACTION,
                 description="Semi-automatic rifle used by US forces in WWII",
                 image_url="/uploads/images/m1_garand.jpg",
+                aliases=["Garand"],
             ),
         ]
 
     def get_all_firearms(self) -> List[Firearm]:
         return self._firearms.copy()
 
+    def iter_firearms(self, batch_size: int = 500) -> Iterator[Firearm]:
+        return iter(sorted(self._firearms, key=lambda f: (f.name, f.id)))
+
+    def list_firearms(
+        self,
+        filters: FirearmFilter,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Firearm]:
+        matches = sorted(
+            (f for f in self._firearms if filters.matches(f)),
+            key=lambda f: (f.name, f.id),
+        )
+        if after is not None:
+            matches = [f for f in matches if (f.name, f.id) > after]
+        return matches[:limit]
+
     def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
         return next((f for f in self._firearms if f.id == firearm_id), None)
 
@@ -103,18 +135,57 @@ class TestFirearmRepository(FirearmRepository):
         if self.firearm_exists(firearm.id):
             return False
         self._firearms.append(firearm)
+        self._revision += 1
         return True
 
     def update_firearm(self, firearm_id: str, firearm: Firearm) -> bool:
         for i, f in enumerate(self._firearms):
             if f.id == firearm_id:
                 self._firearms[i] = firearm
+                self._revision += 1
                 return True
         return False
 
     def delete_firearm(self, firearm_id: str) -> bool:
         for i, f in enumerate(self._firearms):
             if f.id == firearm_id:
-                del self._firearms[i]
+                self._archive[f.id] = self._firearms.pop(i)
+                self._revision += 1
                 return True
         return False
+
+    def get_archived_firearm(self, firearm_id: str) -> Optional[Firearm]:
+        return self._archive.get(firearm_id)
+
+    def catalog_fingerprint(self) -> str:
+        return f"{len(self._firearms)}:{self._revision}"
+
+    def upsert_firearms(self, firearms: Sequence[Firearm]) -> Set[str]:
+        self._revision += 1
+        positions = {f.id: i for i, f in enumerate(self._firearms)}
+        existing = {firearm.id for firearm in firearms if firearm.id in positions}
+        for firearm in firearms:
+            position = positions.get(firearm.id)
+            if position is None:
+                positions[firearm.id] = len(self._firearms)
+                self._firearms.append(firearm)
+            else:
+                self._firearms[position] = firearm
+        return existing
+
+    def patch_firearms(self, changes: Mapping[str, Mapping[str, Any]]) -> Set[str]:
+        self._revision += 1
+        found = set()
+        for i, f in enumerate(self._firearms):
+            if f.id in changes:
+                self._firearms[i] = f.model_copy(update=dict(changes[f.id]))
+                found.add(f.id)
+        return found
+
+    def delete_firearms(self, firearm_ids: Sequence[str]) -> Set[str]:
+        self._revision += 1
+        ids = set(firearm_ids)
+        found = {f.id for f in self._firearms if f.id in ids}
+        self._archive.update((f.id, f) for f in self._firearms if f.id in ids)
+        self._firearms = [f for f in self._firearms if f.id not in ids]
+        return found
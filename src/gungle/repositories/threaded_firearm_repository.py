@@ -0,0 +1,57 @@
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
+
+from ..models.firearm import Firearm, FirearmFilter
+from ..utils.threads import iterate_in_thread
+from .async_firearm_repository import AsyncFirearmRepository
+from .firearm_repository import FirearmRepository
+
+
+class ThreadedFirearmRepository(AsyncFirearmRepository):
+    """Runs a synchronous repository in the default thread pool.
+
+    ``iter_firearms`` is the exception: each stream gets a thread of its own.
+
+    Used when DATABASE_URL names a driver without asyncio support, so a slow
+    query still never runs on the event loop.
+    """
+
+    def __init__(self, repository: FirearmRepository):
+        self.repository = repository
+
+    async def get_all_firearms(self) -> List[Firearm]:
+        return await asyncio.to_thread(self.repository.get_all_firearms)
+
+    def iter_firearms(self, batch_size: int = 500) -> AsyncIterator[Firearm]:
+        return iterate_in_thread(
+            lambda: self.repository.iter_firearms(batch_size),
+            batch_size,
+            thread_name="firearm-stream",
+        )
+
+    async def list_firearms(
+        self,
+        filters: FirearmFilter,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Firearm]:
+        return await asyncio.to_thread(
+            self.repository.list_firearms, filters, limit, after
+        )
+
+    async def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
+        return await asyncio.to_thread(self.repository.get_firearm_by_id, firearm_id)
+
+    async def firearm_exists(self, firearm_id: str) -> bool:
+        return await asyncio.to_thread(self.repository.firearm_exists, firearm_id)
+
+    async def add_firearm(self, firearm: Firearm) -> bool:
+        return await asyncio.to_thread(self.repository.add_firearm, firearm)
+
+    async def update_firearm(self, firearm_id: str, firearm: Firearm) -> bool:
+        return await asyncio.to_thread(
+            self.repository.update_firearm, firearm_id, firearm
+        )
+
+    async def delete_firearm(self, firearm_id: str) -> bool:
+        return await asyncio.to_thread(self.repository.delete_firearm, firearm_id)
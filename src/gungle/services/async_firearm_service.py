@@ -0,0 +1,84 @@
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
+
+from ..database import USE_ASYNC_DB
+from ..models.firearm import Firearm, FirearmFilter
+from ..repositories.async_db_firearm_repository import AsyncDbFirearmRepository
+from ..repositories.async_firearm_repository import AsyncFirearmRepository
+from ..repositories.threaded_firearm_repository import ThreadedFirearmRepository
+from .catalog import CatalogCache, CatalogSnapshot
+from .firearm_service import firearm_service
+from .metrics import CATALOG_LOOKUPS
+
+
+class AsyncFirearmService:
+    """Async counterpart of FirearmService for use from request handlers.
+
+    It shares the catalog cache of a FirearmService, so a write through
+    either service invalidates the snapshot the game service reads.
+    """
+
+    def __init__(self, repository: AsyncFirearmRepository, catalog: CatalogCache):
+        self.repository = repository
+        self.catalog = catalog
+
+    async def get_catalog(self) -> CatalogSnapshot:
+        snapshot = self.catalog.peek()
+        # Counted here, once per request; the synchronous service then reads
+        # the same snapshot many times, which would inflate the hits.
+        CATALOG_LOOKUPS.inc("hit" if snapshot is not None else "miss")
+        if snapshot is None:
+            # Reading the compiled file and the fingerprint both block.
+            snapshot = await asyncio.to_thread(self.catalog.load_file)
+        if snapshot is not None:
+            return snapshot
+        version = self.catalog.version
+        fingerprint = await asyncio.to_thread(self.catalog.current_fingerprint)
+        firearms = await self.repository.get_all_firearms()
+        return self.catalog.install(version, firearms, fingerprint)
+
+    async def get_all_firearms(self) -> List[Firearm]:
+        return list((await self.get_catalog()).firearms)
+
+    def iter_firearms(self, batch_size: int = 500) -> AsyncIterator[Firearm]:
+        return self.repository.iter_firearms(batch_size)
+
+    async def list_firearms(
+        self,
+        filters: FirearmFilter,
+        limit: int,
+        after: Optional[Tuple[str, str]] = None,
+    ) -> List[Firearm]:
+        return await self.repository.list_firearms(filters, limit, after)
+
+    async def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
+        return (await self.get_catalog()).by_id.get(firearm_id)
+
+    async def add_firearm(self, firearm: Firearm) -> bool:
+        return self._invalidate_if(await self.repository.add_firearm(firearm))
+
+    async def update_firearm(self, firearm_id: str, firearm: Firearm) -> bool:
+        return self._invalidate_if(
+            await self.repository.update_firearm(firearm_id, firearm)
+        )
+
+    async def delete_firearm(self, firearm_id: str) -> bool:
+        return self._invalidate_if(await self.repository.delete_firearm(firearm_id))
+
+    async def firearm_exists(self, firearm_id: str) -> bool:
+        return firearm_id in (await self.get_catalog()).by_id
+
+    def _invalidate_if(self, changed: bool) -> bool:
+        if changed:
+            self.catalog.invalidate()
+        return changed
+
+
+async_firearm_service = AsyncFirearmService(
+    (
+        AsyncDbFirearmRepository()
+        if USE_ASYNC_DB
+        else ThreadedFirearmRepository(firearm_service.repository)
+    ),
+    firearm_service.catalog,
+)
@@ -0,0 +1,336 @@
+import hashlib
+import json
+import re
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from pydantic import TypeAdapter
+
+from ..models.firearm import Firearm
+from ..utils.text import normalize_name
+from .catalog_file import read_catalog_file, write_catalog_file
+from .comparison import AttributeEncoder
+
+_FIREARM_LIST = TypeAdapter(List[Firearm])
+
+_WORD_SEPARATOR = re.compile(r"[\W_]+")
+
+# (normalized key, display name, firearm id), sorted by key.
+SuggestEntry = Tuple[str, str, str]
+
+
+def dump_firearms(firearms: Sequence[Firearm]) -> bytes:
+    return _FIREARM_LIST.dump_json(list(firearms))
+
+
+class EncodedBody(NamedTuple):
+    """A serialized JSON response body and its strong ETag."""
+
+    content: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "EncodedBody":
+        return cls(content, f'"{hashlib.sha256(content).hexdigest()[:32]}"')
+
+
+def _word_suffixes(value: str) -> List[str]:
+    """Keys for every later word of a name, so "Model 29" matches "29"."""
+    words = [word for word in _WORD_SEPARATOR.split(value) if word]
+    return [normalize_name("".join(words[i:])) for i in range(1, len(words))]
+
+
+def _scan_prefix(
+    entries: Sequence[SuggestEntry],
+    prefix: str,
+    limit: int,
+    seen: Dict[str, str],
+) -> None:
+    position = bisect_left(entries, (prefix,))
+    while len(seen) < limit and position < len(entries):
+        key, name, firearm_id = entries[position]
+        if not key.startswith(prefix):
+            break
+        seen.setdefault(firearm_id, name)
+        position += 1
+
+
+class CatalogSnapshot:
+    """Immutable view of the firearm catalog at a given version."""
+
+    def __init__(self, version: int, firearms: Sequence[Firearm]):
+        self.version = version
+        self.firearms: Tuple[Firearm, ...] = tuple(firearms)
+        self.by_id: Mapping[str, Firearm] = MappingProxyType(
+            {firearm.id: firearm for firearm in self.firearms}
+        )
+        # Built eagerly: cached_property does not lock on every supported
+        # Python, and codes from two racing encoders would not compare.
+        self.encoder = AttributeEncoder()
+
+    def __len__(self) -> int:
+        return len(self.firearms)
+
+    @cached_property
+    def name_index(self) -> Mapping[str, Firearm]:
+        index: Dict[str, Firearm] = {}
+        for firearm in self.firearms:
+            index.setdefault(normalize_name(firearm.name), firearm)
+        # Aliases never shadow a real name, whichever firearm it belongs to.
+        for firearm in self.firearms:
+            for alias in firearm.aliases:
+                index.setdefault(normalize_name(alias), firearm)
+        index.pop("", None)
+        return MappingProxyType(index)
+
+    def find_by_name(self, name: str) -> Optional[Firearm]:
+        return self.name_index.get(normalize_name(name))
+
+    @cached_property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(firearm.name for firearm in self.firearms)
+
+    @cached_property
+    def firearms_body(self) -> EncodedBody:
+        return EncodedBody.from_content(dump_firearms(self.firearms))
+
+    @cached_property
+    def names_body(self) -> EncodedBody:
+        content = json.dumps(self.names, separators=(",", ":"), ensure_ascii=False)
+        return EncodedBody.from_content(content.encode("utf-8"))
+
+    @cached_property
+    def suggest_index(self) -> Tuple[Tuple[SuggestEntry, ...], ...]:
+        """Sorted prefix tiers: full names and aliases, then later words."""
+        full: List[SuggestEntry] = []
+        partial: List[SuggestEntry] = []
+        for firearm in self.firearms:
+            for label in (firearm.name, *firearm.aliases):
+                key = normalize_name(label)
+                if key:
+                    full.append((key, firearm.name, firearm.id))
+                partial.extend(
+                    (suffix, firearm.name, firearm.id)
+                    for suffix in _word_suffixes(label)
+                    if suffix
+                )
+        return tuple(sorted(full)), tuple(sorted(partial))
+
+    def suggest(self, query: str, limit: int = 10) -> List[str]:
+        """Names matching ``query`` as a prefix, full-name matches first."""
+        prefix = normalize_name(query)
+        if not prefix or limit <= 0:
+            return []
+        seen: Dict[str, str] = {}
+        for tier in self.suggest_index:
+            _scan_prefix(tier, prefix, limit, seen)
+        return list(seen.values())
+
+    @cached_property
+    def codes(self) -> Mapping[str, int]:
+        encoder = self.encoder
+        return MappingProxyType(
+            {firearm.id: encoder.encode(firearm) for firearm in self.firearms}
+        )
+
+    def encode(self, firearm: Firearm) -> int:
+        # Firearms held from an older snapshot are encoded on the fly so they
+        # are compared by their own attributes, not the current row's.
+        if self.by_id.get(firearm.id) is firearm:
+            return self.codes[firearm.id]
+        return self.encoder.encode(firearm)
+
+
+class CatalogCache:
+    """Holds the current catalog snapshot until a write invalidates it.
+
+    ``fingerprint`` reads a cheap token of the stored catalog's state (see
+    ``FirearmRepository.catalog_fingerprint``). With a ``snapshot_path`` the
+    first snapshot is read from that compiled file instead of the database,
+    provided the file was written at the current fingerprint. The file is
+    written on a background thread: after a boot that found it missing or
+    stale, and again, from ``loader``, after every invalidation.
+
+    Other processes write the same database, so ``sync`` is polled to drop a
+    snapshot whose fingerprint no longer matches the stored catalog.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Optional[str] = None,
+        loader: Optional[Callable[[], List[Firearm]]] = None,
+        fingerprint: Optional[Callable[[], str]] = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # The fingerprint the snapshot was loaded at, if known.
+        self._loaded_at: Optional[str] = None
+        self._snapshot_path = snapshot_path
+        self._loader = loader
+        self._fingerprint = fingerprint
+        self._file_checked = snapshot_path is None
+        self._file_current = False
+        self._writer: Optional[ThreadPoolExecutor] = None
+        if snapshot_path is not None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="catalog-snapshot"
+            )
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def peek(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    def get_or_load(self, loader: Callable[[], List[Firearm]]) -> CatalogSnapshot:
+        snapshot = self.peek()
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            snapshot = self._load_file()
+            if snapshot is not None:
+                return snapshot
+            version = self._version
+            fingerprint = self.current_fingerprint()
+            firearms = loader()
+            return self._install(version, firearms, fingerprint)
+
+    def load_file(self) -> Optional[CatalogSnapshot]:
+        """The snapshot, booted from the compiled file if it is still current."""
+        with self._lock:
+            return self._snapshot or self._load_file()
+
+    def install(
+        self,
+        version: int,
+        firearms: Sequence[Firearm],
+        fingerprint: Optional[str] = None,
+    ) -> CatalogSnapshot:
+        """Cache ``firearms``, loaded at ``version`` and ``fingerprint``."""
+        with self._lock:
+            return self._install(version, firearms, fingerprint)
+
+    def current_fingerprint(self) -> Optional[str]:
+        if self._fingerprint is None:
+            return None
+        try:
+            return self._fingerprint()
+        except Exception as e:
+            print(f"Error reading catalog fingerprint: {e}")
+            return None
+
+    def invalidate(self) -> None:
+        self._invalidate(regenerate=True)
+
+    def sync(self) -> bool:
+        """Invalidate if the stored catalog changed; returns whether it had.
+
+        This queries the database, so call it off the event loop.
+        """
+        snapshot, loaded_at = self._snapshot, self._loaded_at
+        if snapshot is None or self._fingerprint is None:
+            return False
+        fingerprint = self.current_fingerprint()
+        if fingerprint is None or fingerprint == loaded_at:
+            return False
+        with self._lock:
+            if self._snapshot is not snapshot:
+                return False  # Already replaced since it was looked at.
+            # The writer's own process regenerates the compiled file.
+            self._invalidate_locked(regenerate=False)
+        if self._loader is not None:
+            self.get_or_load(self._loader)
+        return True
+
+    def _invalidate(self, regenerate: bool) -> None:
+        with self._lock:
+            self._invalidate_locked(regenerate)
+
+    def _invalidate_locked(self, regenerate: bool) -> None:
+        self._version += 1
+        self._snapshot = None
+        self._loaded_at = None
+        self._file_checked = True
+        version = self._version
+        regenerate = regenerate and self._writer is not None and bool(self._loader)
+        # Without a regeneration the file is rewritten by the next install.
+        self._file_current = regenerate
+        if regenerate:
+            assert self._writer is not None
+            self._writer.submit(self._regenerate, version)
+
+    def flush(self) -> None:
+        """Wait for snapshot file writes queued so far."""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def _load_file(self) -> Optional[CatalogSnapshot]:
+        if self._file_checked or self._snapshot_path is None:
+            return None
+        self._file_checked = True
+        fingerprint = self.current_fingerprint()
+        if fingerprint is None and self._fingerprint is not None:
+            # The database could not be asked, so the file cannot be trusted.
+            return None
+        firearms = read_catalog_file(self._snapshot_path, fingerprint)
+        if firearms:
+            self._snapshot = CatalogSnapshot(self._version, firearms)
+            self._loaded_at = fingerprint
+            self._file_current = True
+        return self._snapshot
+
+    def _install(
+        self, version: int, firearms: Sequence[Firearm], fingerprint: Optional[str]
+    ) -> CatalogSnapshot:
+        snapshot = CatalogSnapshot(version, firearms)
+        # A load that raced with an invalidation, or one that came back empty
+        # because the repository failed, is served once but never cached.
+        if version == self._version and firearms:
+            self._snapshot = snapshot
+            self._loaded_at = fingerprint
+            self._file_checked = True
+            stamped = fingerprint is not None or self._fingerprint is None
+            if self._writer is not None and not self._file_current and stamped:
+                self._file_current = True
+                self._writer.submit(
+                    self._write_file, version, snapshot.firearms, fingerprint or ""
+                )
+        return snapshot
+
+    def _regenerate(self, version: int) -> None:
+        """Reload and rewrite the file after invalidation ``version``."""
+        assert self._loader is not None
+        if version != self._version:
+            return  # A later invalidation queued its own regeneration.
+        fingerprint = self.current_fingerprint()
+        if fingerprint is None and self._fingerprint is not None:
+            return
+        firearms = self._loader()
+        if not firearms:
+            return
+        with self._lock:
+            if version == self._version and self._snapshot is None:
+                # Warms the cache too, so no request has to wait on the load.
+                self._snapshot = CatalogSnapshot(version, firearms)
+                self._loaded_at = fingerprint
+        self._write_file(version, firearms, fingerprint or "")
+
+    def _write_file(
+        self, version: int, firearms: Sequence[Firearm], fingerprint: str
+    ) -> None:
+        assert self._snapshot_path is not None
+        if version != self._version:
+            return
+        try:
+            write_catalog_file(self._snapshot_path, firearms, fingerprint)
+        except OSError as e:
+            print(f"Error writing catalog snapshot: {e}")
@@ -0,0 +1,180 @@
+import gc
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Type, TypeVar
+
+from ..models.firearm import ActionType, Caliber, Firearm, FirearmType, ModelType
+from ..utils.models import construct_trusted
+
+# Layout, all little-endian:
+#   header   magic, format version, row count, string count, crc32 of the rest,
+#            sha256 of the database fingerprint the rows were loaded at
+#   rows     one fixed-size record per firearm: string-table refs plus the year
+#   offsets  string count + 1 offsets into the blob
+#   blob     the distinct strings, utf-8, back to back
+MAGIC = b"GUNGLCAT"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sIIII32s")
+ROW = struct.Struct("<11Ii")
+NO_STRING = 0xFFFFFFFF
+NO_YEAR = -(2**31)
+ALIAS_SEPARATOR = "\x1f"
+
+E = TypeVar("E", bound=Enum)
+
+
+def _digest(fingerprint: str) -> bytes:
+    return hashlib.sha256(fingerprint.encode("utf-8")).digest()
+
+
+def write_catalog_file(
+    path: str, firearms: Sequence[Firearm], fingerprint: str = ""
+) -> None:
+    """Compile ``firearms`` to ``path``, replacing any old file atomically.
+
+    ``fingerprint`` identifies the database state the firearms were read at;
+    see ``FirearmRepository.catalog_fingerprint``.
+    """
+    refs: Dict[str, int] = {}
+
+    def ref(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        return refs.setdefault(value, len(refs))
+
+    rows = bytearray()
+    for firearm in firearms:
+        rows += ROW.pack(
+            ref(firearm.id),
+            ref(firearm.name),
+            ref(firearm.manufacturer),
+            ref(firearm.type.value),
+            ref(firearm.caliber.value),
+            ref(firearm.country_of_origin),
+            ref(firearm.model_type.value),
+            ref(firearm.action_type.value),
+            ref(firearm.description),
+            ref(firearm.image_url),
+            ref(ALIAS_SEPARATOR.join(firearm.aliases)),
+            NO_YEAR if firearm.year_introduced is None else firearm.year_introduced,
+        )
+
+    encoded = [value.encode("utf-8") for value in refs]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    body = b"".join([bytes(rows), struct.pack(f"<{len(offsets)}I", *offsets), *encoded])
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(firearms),
+        len(refs),
+        zlib.crc32(body),
+        _digest(fingerprint),
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".catalog-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(header)
+            tmp.write(body)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_catalog_file(
+    path: str, fingerprint: Optional[str] = None
+) -> Optional[List[Firearm]]:
+    """Load a compiled catalog, or None if it is missing, stale or corrupt.
+
+    The file is stale when it was written at a ``fingerprint`` other than the
+    one given; with none given, any intact file is accepted.
+    """
+    try:
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _decode(data, fingerprint)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Ignoring catalog snapshot {path}: {e}")
+        return None
+
+
+def _decode(data: mmap.mmap, fingerprint: Optional[str]) -> List[Firearm]:
+    magic, version, row_count, string_count, crc, digest = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a catalog snapshot of this format")
+    if fingerprint is not None and digest != _digest(fingerprint):
+        raise ValueError("written from another database state")
+    if zlib.crc32(memoryview(data)[HEADER.size :]) != crc:
+        raise ValueError("checksum mismatch")
+
+    offsets_at = HEADER.size + row_count * ROW.size
+    offsets = struct.unpack_from(f"<{string_count + 1}I", data, offsets_at)
+    blob_at = offsets_at + (string_count + 1) * 4
+    strings = [
+        data[blob_at + start : blob_at + end].decode("utf-8")
+        for start, end in zip(offsets, offsets[1:])
+    ]
+
+    def text(ref: int) -> Optional[str]:
+        return None if ref == NO_STRING else strings[ref]
+
+    # Enum values are few and shared, so each is resolved once per file.
+    types: Dict[int, FirearmType] = {}
+    calibers: Dict[int, Caliber] = {}
+    model_types: Dict[int, ModelType] = {}
+    actions: Dict[int, ActionType] = {}
+
+    firearms = []
+    rows_end = HEADER.size + row_count * ROW.size
+    # Tens of thousands of fresh objects would otherwise trigger repeated
+    # full collections that find nothing to free.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for row in ROW.iter_unpack(data[HEADER.size : rows_end]):
+            aliases = strings[row[10]]
+            # Written from validated models, so validation is skipped on load.
+            firearms.append(
+                construct_trusted(
+                    Firearm,
+                    {
+                        "id": strings[row[0]],
+                        "name": strings[row[1]],
+                        "manufacturer": strings[row[2]],
+                        "type": _member(types, FirearmType, strings, row[3]),
+                        "caliber": _member(calibers, Caliber, strings, row[4]),
+                        "country_of_origin": strings[row[5]],
+                        "model_type": _member(model_types, ModelType, strings, row[6]),
+                        "year_introduced": None if row[11] == NO_YEAR else row[11],
+                        "action_type": _member(actions, ActionType, strings, row[7]),
+                        "description": text(row[8]),
+                        "image_url": text(row[9]),
+                        "aliases": aliases.split(ALIAS_SEPARATOR) if aliases else [],
+                    },
+                )
+            )
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return firearms
+
+
+def _member(cache: Dict[int, E], enum: Type[E], strings: List[str], ref: int) -> E:
+    member = cache.get(ref)
+    if member is None:
+        member = cache[ref] = enum(strings[ref])
+    return member
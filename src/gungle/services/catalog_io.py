@@ -0,0 +1,146 @@
+import csv
+import io
+from enum import Enum
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from ..models.firearm import CatalogImportError, CatalogImportResult, Firearm
+from ..utils.validation import validation_message
+from .firearm_service import FirearmService
+
+CSV_COLUMNS = tuple(Firearm.model_fields)
+ALIAS_SEPARATOR = "|"
+MAX_REPORTED_ERRORS = 100
+
+
+class CatalogFormat(str, Enum):
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    CatalogFormat.JSONL: "application/x-ndjson",
+    CatalogFormat.CSV: "text/csv",
+}
+
+# (line number, parsed firearm or None, error message or None)
+ParsedRow = Tuple[int, Optional[Firearm], Optional[str]]
+
+
+def _parse_jsonl(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, Firearm.model_validate_json(line), None
+        except ValidationError as e:
+            yield line_number, None, validation_message(e)
+
+
+def _csv_row_to_dict(row: Dict[str, Any]) -> Dict[str, Any]:
+    data = {key: value for key, value in row.items() if key and value != ""}
+    aliases = data.get("aliases")
+    data["aliases"] = (
+        [alias for alias in aliases.split(ALIAS_SEPARATOR) if alias] if aliases else []
+    )
+    return data
+
+
+def _parse_csv(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        try:
+            yield reader.line_num, Firearm.model_validate(_csv_row_to_dict(row)), None
+        except ValidationError as e:
+            yield reader.line_num, None, validation_message(e)
+
+
+def parse_firearms(lines: Iterable[str], fmt: CatalogFormat) -> Iterator[ParsedRow]:
+    """Lazily parse and validate catalog rows, one at a time."""
+    if fmt == CatalogFormat.CSV:
+        return _parse_csv(lines)
+    return _parse_jsonl(lines)
+
+
+def import_firearms(
+    service: FirearmService,
+    source: IO[bytes],
+    fmt: CatalogFormat,
+    batch_size: int = 1000,
+) -> CatalogImportResult:
+    """Stream ``source`` into the catalog, upserting ``batch_size`` rows at a time.
+
+    Only one batch is held in memory. Invalid rows are skipped and reported.
+    If the database rejects a batch, its rows are retried one by one so a
+    single bad row does not sink the other ``batch_size - 1``.
+    """
+    result = CatalogImportResult()
+    lines = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    batch: Dict[str, Tuple[int, Firearm]] = {}
+
+    def reject(line_number: int, message: str) -> None:
+        result.rejected += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(CatalogImportError(line=line_number, message=message))
+
+    def flush() -> None:
+        if not batch:
+            return
+        try:
+            # A later row with the same id wins, as it would row by row.
+            result.imported += service.upsert_firearms(
+                [firearm for _, firearm in batch.values()]
+            )
+        except Exception as e:
+            print(f"Error importing {len(batch)} firearms, retrying row by row: {e}")
+            for line_number, firearm in batch.values():
+                try:
+                    result.imported += service.upsert_firearms([firearm])
+                except Exception as row_error:
+                    print(f"Error importing firearm {firearm.id}: {row_error}")
+                    reject(line_number, "Row could not be written")
+        batch.clear()
+
+    try:
+        for line_number, firearm, error in parse_firearms(lines, fmt):
+            if firearm is None:
+                reject(line_number, error or "Invalid row")
+                continue
+            batch[firearm.id] = (line_number, firearm)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    finally:
+        lines.detach()
+    return result
+
+
+def _csv_row(firearm: Firearm) -> List[Any]:
+    data = firearm.model_dump(mode="json")
+    data["aliases"] = ALIAS_SEPARATOR.join(firearm.aliases)
+    return ["" if data[column] is None else data[column] for column in CSV_COLUMNS]
+
+
+def export_firearms(
+    firearms: Iterable[Firearm], fmt: CatalogFormat, chunk_rows: int = 500
+) -> Iterator[bytes]:
+    """Encode ``firearms`` in ``chunk_rows`` sized chunks for a streaming body."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if fmt == CatalogFormat.CSV:
+        writer.writerow(CSV_COLUMNS)
+
+    for count, firearm in enumerate(firearms, start=1):
+        if fmt == CatalogFormat.CSV:
+            writer.writerow(_csv_row(firearm))
+        else:
+            buffer.write(firearm.model_dump_json())
+            buffer.write("\n")
+        if count % chunk_rows == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
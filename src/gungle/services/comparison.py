@@ -0,0 +1,134 @@
+import threading
+from enum import Enum
+from typing import Callable, Dict, List, Tuple, Type
+
+from ..models.firearm import (
+    ActionType,
+    AttributeComparison,
+    Caliber,
+    ComparisonResult,
+    Firearm,
+    FirearmType,
+    ModelType,
+)
+from ..utils.models import construct_trusted
+
+# Each firearm is packed into a single integer of fixed-width lanes, one lane
+# per compared attribute. Comparing two firearms is then an XOR plus a SWAR
+# zero-lane test over the whole integer, instead of one branch per attribute.
+LANE_BITS = 24
+_LANE_VALUE_MASK = (1 << (LANE_BITS - 1)) - 1
+
+ATTRIBUTES: Tuple[str, ...] = (
+    "manufacturer",
+    "type",
+    "caliber",
+    "action_type",
+    "country_of_origin",
+    "adoption_status",
+    "year_introduced",
+)
+ALL_CORRECT = (1 << len(ATTRIBUTES)) - 1
+YEAR_BIT = 1 << ATTRIBUTES.index("year_introduced")
+_YEAR_SHIFT = ATTRIBUTES.index("year_introduced") * LANE_BITS
+
+_LOW_BITS = sum(_LANE_VALUE_MASK << (i * LANE_BITS) for i in range(len(ATTRIBUTES)))
+_HIGH_BITS = sum(1 << (i * LANE_BITS + LANE_BITS - 1) for i in range(len(ATTRIBUTES)))
+
+# Maps every combination of per-lane high bits to the compact bitmask.
+_LANE_TO_MASK: Dict[int, int] = {
+    sum(
+        1 << (i * LANE_BITS + LANE_BITS - 1)
+        for i in range(len(ATTRIBUTES))
+        if m >> i & 1
+    ): m
+    for m in range(ALL_CORRECT + 1)
+}
+
+
+def _ordinals(enum_type: Type[Enum]) -> Dict[Enum, int]:
+    return {member: i for i, member in enumerate(enum_type)}
+
+
+_TYPE_CODES = _ordinals(FirearmType)
+_CALIBER_CODES = _ordinals(Caliber)
+_ACTION_CODES = _ordinals(ActionType)
+_MODEL_CODES = _ordinals(ModelType)
+
+
+class AttributeEncoder:
+    """Packs firearms into lane-encoded integers, interning free-text fields."""
+
+    def __init__(self) -> None:
+        self._manufacturers: Dict[str, int] = {}
+        self._countries: Dict[str, int] = {}
+        # Snapshots share one encoder across request threads; two new values
+        # must never be handed the same code.
+        self._lock = threading.Lock()
+
+    def encode(self, firearm: Firearm) -> int:
+        year = firearm.year_introduced or 0
+        lanes = (
+            self._intern(self._manufacturers, firearm.manufacturer),
+            _TYPE_CODES[firearm.type],
+            _CALIBER_CODES[firearm.caliber],
+            _ACTION_CODES[firearm.action_type],
+            self._intern(self._countries, firearm.country_of_origin),
+            _MODEL_CODES[firearm.model_type],
+            year if 0 < year <= _LANE_VALUE_MASK else 0,
+        )
+        packed = 0
+        for i, value in enumerate(lanes):
+            packed |= value << (i * LANE_BITS)
+        return packed
+
+    def _intern(self, table: Dict[str, int], value: str) -> int:
+        code = table.get(value)
+        if code is None:
+            with self._lock:
+                code = table.setdefault(value, len(table) + 1)
+        return code
+
+
+def compare_codes(guess: int, target: int) -> int:
+    """Return a bitmask with bit ``i`` set when attribute ``i`` matches."""
+    diff = guess ^ target
+    differing = (diff + _LOW_BITS) & _HIGH_BITS
+    mask = _LANE_TO_MASK[_HIGH_BITS & ~differing]
+    # An unknown year never counts as a match, even against another unknown.
+    if not guess >> _YEAR_SHIFT & _LANE_VALUE_MASK:
+        mask &= ~YEAR_BIT
+    return mask
+
+
+_DISPLAY: Tuple[Callable[[Firearm], str], ...] = (
+    lambda f: f.manufacturer,
+    lambda f: f.type.value,
+    lambda f: f.caliber.value,
+    lambda f: f.action_type.value,
+    lambda f: f.country_of_origin,
+    lambda f: f.model_type.value,
+    lambda f: str(f.year_introduced or "Unknown"),
+)
+
+
+def build_comparisons(
+    guess_firearm: Firearm, target_firearm: Firearm, mask: int
+) -> List[AttributeComparison]:
+    # Built from catalog firearms only, so every value is already well typed.
+    return [
+        construct_trusted(
+            AttributeComparison,
+            {
+                "attribute": attribute,
+                "guess_value": display(guess_firearm),
+                "correct_value": display(target_firearm),
+                "result": (
+                    ComparisonResult.CORRECT
+                    if mask >> bit & 1
+                    else ComparisonResult.INCORRECT
+                ),
+            },
+        )
+        for bit, (attribute, display) in enumerate(zip(ATTRIBUTES, _DISPLAY))
+    ]
@@ -0,0 +1,133 @@
+import hashlib
+import threading
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..models.firearm import Firearm
+from ..repositories.daily_schedule_repository import DailyScheduleRepository
+from .catalog import CatalogSnapshot
+
+
+def hash_pick(day: date, firearm_ids: Sequence[str]) -> str:
+    """Deterministic pick for ``day``; the same on every process."""
+    seed_hash = hashlib.sha256(day.isoformat().encode()).hexdigest()
+    return firearm_ids[int(seed_hash[:8], 16) % len(firearm_ids)]
+
+
+class DailySchedule:
+    """Persisted date -> firearm id schedule, generated ahead of time.
+
+    A day is assigned once and stored, so catalog edits leave scheduled days
+    alone. No firearm repeats within ``no_repeat_days`` of itself, or within
+    the catalog size if that is smaller. Lookups hit an in-memory map of the
+    loaded days; a day nobody scheduled yet is scheduled on first use.
+
+    A scheduled firearm missing from the caller's catalog snapshot is looked
+    up with ``find_firearm``, since the snapshot may just be behind; only a
+    firearm that is really gone gets its day rescheduled.
+    """
+
+    def __init__(
+        self,
+        repository: DailyScheduleRepository,
+        find_firearm: Callable[[str], Optional[Firearm]],
+        days_ahead: int = 30,
+        no_repeat_days: int = 30,
+    ):
+        self.repository = repository
+        self.find_firearm = find_firearm
+        self.days_ahead = days_ahead
+        self.no_repeat_days = no_repeat_days
+        self._entries: Dict[date, str] = {}
+        self._lock = threading.Lock()
+
+    def firearm_for(self, day: date, catalog: CatalogSnapshot) -> Firearm:
+        firearm_id = self._entries.get(day)
+        if firearm_id is None:
+            try:
+                with self._lock:
+                    self._schedule_range(day, day, catalog)
+                firearm_id = self._entries[day]
+            except Exception as e:
+                print(f"Error loading daily schedule for {day}: {e}")
+                return catalog.by_id[hash_pick(day, sorted(catalog.by_id))]
+
+        firearm = catalog.by_id.get(firearm_id) or self.find_firearm(firearm_id)
+        if firearm is None:
+            # The scheduled firearm was deleted; that day needs a new one.
+            firearm = self._reschedule(day, firearm_id, catalog)
+        return firearm
+
+    def extend(self, today: date, catalog: CatalogSnapshot) -> int:
+        """Schedule any missing days from ``today`` through ``days_ahead``."""
+        with self._lock:
+            return self._schedule_range(
+                today, today + timedelta(days=self.days_ahead), catalog
+            )
+
+    def _window(self, catalog: CatalogSnapshot) -> int:
+        return max(0, min(self.no_repeat_days, len(catalog.by_id) - 1))
+
+    def _pick(
+        self,
+        day: date,
+        firearm_ids: List[str],
+        scheduled: Dict[date, str],
+        window: int,
+    ) -> str:
+        nearby = {
+            scheduled[other]
+            for offset in range(1, window + 1)
+            for other in (day - timedelta(days=offset), day + timedelta(days=offset))
+            if other in scheduled
+        }
+        candidates = [fid for fid in firearm_ids if fid not in nearby]
+        return hash_pick(day, candidates or firearm_ids)
+
+    def _schedule_range(self, start: date, end: date, catalog: CatalogSnapshot) -> int:
+        window = self._window(catalog)
+        margin = timedelta(days=window)
+        scheduled = self.repository.get_range(start - margin, end + margin)
+        firearm_ids = sorted(catalog.by_id)
+
+        new_entries: Dict[date, str] = {}
+        day = start
+        while day <= end:
+            if day not in scheduled:
+                scheduled[day] = self._pick(day, firearm_ids, scheduled, window)
+                new_entries[day] = scheduled[day]
+            day += timedelta(days=1)
+
+        if new_entries:
+            self.repository.add_entries(new_entries)
+            # Re-read so a concurrent writer's picks, which won, are served.
+            scheduled = self.repository.get_range(start, end)
+
+        if len(self._entries) > 4 * (self.days_ahead + 1):
+            self._entries = {
+                day: fid for day, fid in self._entries.items() if day >= start
+            }
+        self._entries.update(
+            (day, fid) for day, fid in scheduled.items() if start <= day <= end
+        )
+        return len(new_entries)
+
+    def _reschedule(
+        self, day: date, deleted_id: str, catalog: CatalogSnapshot
+    ) -> Firearm:
+        with self._lock:
+            window = self._window(catalog)
+            margin = timedelta(days=window)
+            try:
+                scheduled = self.repository.get_range(day - margin, day + margin)
+                scheduled.pop(day, None)
+                firearm_id = self._pick(day, sorted(catalog.by_id), scheduled, window)
+                self.repository.replace_entry(day, deleted_id, firearm_id)
+                # Serve whichever replacement won if another worker got there.
+                firearm_id = self.repository.get_range(day, day).get(day, firearm_id)
+                self._entries[day] = firearm_id
+            except Exception as e:
+                print(f"Error rescheduling daily firearm for {day}: {e}")
+                firearm_id = hash_pick(day, sorted(catalog.by_id))
+        firearm = catalog.by_id.get(firearm_id) or self.find_firearm(firearm_id)
+        return firearm or catalog.by_id[hash_pick(day, sorted(catalog.by_id))]
@@ -1,31 +1,161 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set
 
-from ..models.firearm import Firearm
+from ..config import settings
+from ..models.firearm import (
+    BatchItemStatus,
+    BatchResponse,
+    BatchStatus,
+    Firearm,
+    FirearmPatch,
+)
 from ..repositories.db_firearm_repository import DbFirearmRepository
 from ..repositories.firearm_repository import FirearmRepository
+from .catalog import CatalogCache, CatalogSnapshot
 
 
 class FirearmService:
-    def __init__(self, repository: Optional[FirearmRepository] = None):
+    def __init__(
+        self,
+        repository: Optional[FirearmRepository] = None,
+        snapshot_path: Optional[str] = None,
+    ):
         self.repository = repository or DbFirearmRepository()
+        self.catalog = CatalogCache(
+            snapshot_path,
+            loader=self.repository.get_all_firearms,
+            fingerprint=self.repository.catalog_fingerprint,
+        )
+        # Archive lookups, misses included, for the current catalog version.
+        self._archived: Dict[str, Optional[Firearm]] = {}
+        self._archived_version = self.catalog.version
+
+    def get_catalog(self) -> CatalogSnapshot:
+        return self.catalog.get_or_load(self.repository.get_all_firearms)
 
     def get_all_firearms(self) -> List[Firearm]:
-        return self.repository.get_all_firearms()
+        return list(self.get_catalog().firearms)
 
     def get_firearm_by_id(self, firearm_id: str) -> Optional[Firearm]:
-        return self.repository.get_firearm_by_id(firearm_id)
+        return self.get_catalog().by_id.get(firearm_id)
+
+    def get_archived_firearm(self, firearm_id: str) -> Optional[Firearm]:
+        # Sessions that refer to a deleted firearm resolve it on every status
+        # and reveal. Only a catalog write can change the answer.
+        version = self.catalog.version
+        if version != self._archived_version:
+            self._archived, self._archived_version = {}, version
+        archived = self._archived
+        if firearm_id not in archived:
+            archived[firearm_id] = self.repository.get_archived_firearm(firearm_id)
+        return archived[firearm_id]
 
     def add_firearm(self, firearm: Firearm) -> bool:
-        return self.repository.add_firearm(firearm)
+        return self._invalidate_if(self.repository.add_firearm(firearm))
 
     def update_firearm(self, firearm_id: str, firearm: Firearm) -> bool:
-        return self.repository.update_firearm(firearm_id, firearm)
+        return self._invalidate_if(self.repository.update_firearm(firearm_id, firearm))
 
     def delete_firearm(self, firearm_id: str) -> bool:
-        return self.repository.delete_firearm(firearm_id)
+        return self._invalidate_if(self.repository.delete_firearm(firearm_id))
+
+    def upsert_firearms(self, firearms: Sequence[Firearm]) -> int:
+        """Write ``firearms``; returns how many distinct ids were written."""
+        self._upsert(firearms)
+        return len({firearm.id for firearm in firearms})
+
+    def batch_upsert(self, firearms: Sequence[Firearm]) -> BatchResponse:
+        existing = self._upsert(firearms)
+        # Statuses follow the write itself, not the cached snapshot. A repeated
+        # id reports as updated after its first item, as it would row by row.
+        results: List[BatchItemStatus] = []
+        for firearm in firearms:
+            results.append(
+                BatchItemStatus(
+                    id=firearm.id,
+                    status=(
+                        BatchStatus.UPDATED
+                        if firearm.id in existing
+                        else BatchStatus.CREATED
+                    ),
+                )
+            )
+            existing.add(firearm.id)
+        return _batch_response(results)
+
+    def _upsert(self, firearms: Sequence[Firearm]) -> Set[str]:
+        if not firearms:
+            return set()
+        existing = self.repository.upsert_firearms(firearms)
+        self.catalog.invalidate()
+        return set(existing)
+
+    def batch_patch(self, patches: Sequence[FirearmPatch]) -> BatchResponse:
+        existing = self.get_catalog().by_id
+        changes: Dict[str, Dict[str, Any]] = {}
+        results: List[BatchItemStatus] = []
+        for patch in patches:
+            if patch.id not in existing:
+                results.append(
+                    BatchItemStatus(id=patch.id, status=BatchStatus.NOT_FOUND)
+                )
+                continue
+            # Repeated ids merge, later fields winning; unset fields stay as-is.
+            fields = changes.get(patch.id, {})
+            fields.update(patch.model_dump(exclude_none=True, exclude={"id"}))
+            changes[patch.id] = fields
+            results.append(BatchItemStatus(id=patch.id, status=BatchStatus.UPDATED))
+
+        found = self.repository.patch_firearms(changes)
+        self._invalidate_if(bool(found))
+        return _batch_response(_mark_missing(results, found, BatchStatus.UPDATED))
+
+    def set_image_url(self, firearm_id: str, image_url: str) -> bool:
+        """Point a firearm at a new image in one UPDATE."""
+        found = self.repository.patch_firearms({firearm_id: {"image_url": image_url}})
+        return self._invalidate_if(firearm_id in found)
+
+    def batch_delete(self, firearm_ids: Sequence[str]) -> BatchResponse:
+        found = self.repository.delete_firearms(firearm_ids)
+        self._invalidate_if(bool(found))
+        # A repeated id is deleted once; later copies find nothing left.
+        remaining = set(found)
+        results: List[BatchItemStatus] = []
+        for firearm_id in firearm_ids:
+            if firearm_id in remaining:
+                remaining.discard(firearm_id)
+                status = BatchStatus.DELETED
+            else:
+                status = BatchStatus.NOT_FOUND
+            results.append(BatchItemStatus(id=firearm_id, status=status))
+        return _batch_response(results)
 
     def firearm_exists(self, firearm_id: str) -> bool:
-        return self.repository.firearm_exists(firearm_id)
+        return firearm_id in self.get_catalog().by_id
+
+    def _invalidate_if(self, changed: bool) -> bool:
+        if changed:
+            self.catalog.invalidate()
+        return changed
+
+
+def _mark_missing(
+    results: List[BatchItemStatus], found: Set[str], status: BatchStatus
+) -> List[BatchItemStatus]:
+    # The catalog may be stale if another process deleted rows meanwhile.
+    for result in results:
+        if result.status == status and result.id not in found:
+            result.status = BatchStatus.NOT_FOUND
+    return results
+
+
+def _batch_response(results: List[BatchItemStatus]) -> BatchResponse:
+    succeeded = sum(
+        result.status in (BatchStatus.CREATED, BatchStatus.UPDATED, BatchStatus.DELETED)
+        for result in results
+    )
+    return BatchResponse(
+        succeeded=succeeded, failed=len(results) - succeeded, results=results
+    )
 
 
-firearm_service = FirearmService()
+firearm_service = FirearmService(snapshot_path=settings.CATALOG_SNAPSHOT_PATH or None)
@@ -1,282 +1,396 @@
-import hashlib
+import time
 import uuid
-from datetime import date, datetime
-from typing import Dict, List, Optional
+from datetime import date
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
 
+from ..config import settings
 from ..models.firearm import (
     AttributeComparison,
-    ComparisonResult,
+    DailyFirearmResponse,
     Firearm,
     GameRevealResponse,
     GameSession,
+    GameSessionSummary,
     GameStatusResponse,
     GuessResult,
     NewGameResponse,
+    SessionFilter,
+    SessionStats,
 )
+from ..models.session import SessionRecord
+from ..repositories.daily_schedule_repository import DailyScheduleRepository
+from ..repositories.db_daily_schedule_repository import DbDailyScheduleRepository
+from ..repositories.game_session_repository import GameSessionRepository
+from ..utils.models import construct_trusted
+from .catalog import EncodedBody
+from .comparison import build_comparisons, compare_codes
+from .daily_schedule import DailySchedule
 from .firearm_service import firearm_service
+from .image_variants import image_variant_index
+from .render_cache import RenderCache
+from .session_store import SessionStore, create_session_store
+
+# Attempts at a guess that keeps losing to concurrent guesses on the session.
+_SAVE_ATTEMPTS = 5
 
 
 class GameService:
-    def __init__(self) -> None:
-        self._sessions: Dict[str, GameSession] = {}
-        self._guess_history: Dict[str, List[GuessResult]] = {}
+    def __init__(
+        self,
+        session_repository: Optional[GameSessionRepository] = None,
+        schedule_repository: Optional[DailyScheduleRepository] = None,
+        session_store: Optional[SessionStore] = None,
+    ):
+        self._sessions = session_store or create_session_store(session_repository)
         self._current_daily_firearm: Optional[Firearm] = None
         self._current_date: Optional[date] = None
+        self._current_catalog_version: Optional[int] = None
+        self._rendered = RenderCache()
+        self._daily_schedule = DailySchedule(
+            schedule_repository or DbDailyScheduleRepository(),
+            self._find_stored_firearm,
+            days_ahead=settings.DAILY_SCHEDULE_DAYS_AHEAD,
+            no_repeat_days=settings.DAILY_NO_REPEAT_DAYS,
+        )
 
     def start_new_game(self) -> NewGameResponse:
         target_firearm = self._get_daily_firearm()
+        record = self._create_session(target_firearm)
+        return self._new_game_response(record.session_id, target_firearm)
 
-        session_id = str(uuid.uuid4())
-        game_session = GameSession(
-            session_id=session_id,
-            target_firearm=target_firearm,
-            guesses_made=[],
-            is_completed=False,
-            is_won=False,
-            created_at=datetime.now(),
-            max_guesses=5,
+    def start_new_game_json(self) -> bytes:
+        """``start_new_game`` serialized, spliced into the day's template.
+
+        Only the session id differs between responses, so the rest is
+        rendered once per day, catalog version and image manifest.
+        """
+        target_firearm = self._get_daily_firearm()
+        prefix, suffix = self._rendered.get(
+            "new_game",
+            self._render_key(),
+            lambda: self._render_new_game(
+                self._resolve_firearm(target_firearm.id) or target_firearm
+            ),
+        )
+        record = self._create_session(target_firearm)
+        return prefix + record.session_id.encode() + suffix
+
+    def get_daily_firearm_body(self) -> EncodedBody:
+        """The daily-firearm response, rendered once per day and catalog."""
+        daily_firearm = self._get_daily_firearm()
+        return self._rendered.get(
+            "daily_firearm",
+            self._render_key(),
+            lambda: self._render_daily_firearm(
+                self._resolve_firearm(daily_firearm.id) or daily_firearm
+            ),
         )
 
-        self._sessions[session_id] = game_session
-        self._guess_history[session_id] = []
+    def _create_session(self, target_firearm: Firearm) -> SessionRecord:
+        record = SessionRecord(
+            session_id=str(uuid.uuid4()),
+            target_id=target_firearm.id,
+            created_at=time.time(),
+            max_guesses=5,
+        )
+        self._sessions.save(record)
+        self._sessions.tally(record)
+        return record
 
+    def _new_game_response(
+        self, session_id: str, target_firearm: Firearm
+    ) -> NewGameResponse:
         return NewGameResponse(
             session_id=session_id,
             firearm_image_url=target_firearm.image_url,
-            max_guesses=game_session.max_guesses,
+            max_guesses=5,
+            firearm_image_variants=image_variant_index.variants_for(
+                target_firearm.image_url
+            ),
         )
 
-    def make_guess_by_name(self, session_id: str, firearm_name: str) -> GuessResult:
-        session = self._get_session(session_id)
-        if not session:
-            raise ValueError("Game session not found")
-
-        if session.is_completed:
-            raise ValueError("Game already completed")
-
-        if len(session.guesses_made) >= session.max_guesses:
-            raise ValueError("Maximum guesses reached")
-
-        guess_firearm = self._find_firearm_by_name(firearm_name)
-        if not guess_firearm:
-            raise ValueError(f"Firearm '{firearm_name}' not found")
-
-        session.guesses_made.append(guess_firearm.name)
-
-        is_correct = guess_firearm.name.lower() == session.target_firearm.name.lower()
+    def _render_key(self) -> Hashable:
+        return (
+            self._current_date,
+            firearm_service.get_catalog().version,
+            image_variant_index.version(),
+        )
 
-        comparisons = self._compare_firearms(guess_firearm, session.target_firearm)
+    def _render_new_game(self, target_firearm: Firearm) -> Tuple[bytes, bytes]:
+        placeholder = str(uuid.UUID(int=0))
+        rendered = self._new_game_response(
+            placeholder, target_firearm
+        ).model_dump_json()
+        prefix, suffix = rendered.split(placeholder, 1)
+        return prefix.encode(), suffix.encode()
+
+    def _render_daily_firearm(self, daily_firearm: Firearm) -> EncodedBody:
+        response = DailyFirearmResponse(
+            firearm=daily_firearm, message="Today's firearm"
+        )
+        return EncodedBody.from_content(response.model_dump_json().encode())
 
-        remaining_guesses = session.max_guesses - len(session.guesses_made)
+    def make_guess_by_name(self, session_id: str, firearm_name: str) -> GuessResult:
+        # Another worker may save a guess between our read and write, so the
+        # write only lands on the record as read; otherwise read it again.
+        for _ in range(_SAVE_ATTEMPTS):
+            record = self._get_record(session_id)
+            target_firearm = self._resolve_firearm(record.target_id) if record else None
+            if not record or not target_firearm:
+                raise ValueError("Game session not found")
+
+            if record.is_completed:
+                raise ValueError("Game already completed")
+
+            if record.guess_count >= record.max_guesses:
+                raise ValueError("Maximum guesses reached")
+
+            guess_firearm = self._find_firearm_by_name(firearm_name)
+            if not guess_firearm:
+                raise ValueError(f"Firearm '{firearm_name}' not found")
+
+            mask = self._comparison_mask(guess_firearm, target_firearm)
+            updated = record.copy()
+            finished = updated.add_guess(guess_firearm.id, mask)
+            if self._sessions.save_if_unchanged(updated, record.guess_count):
+                break
+        else:
+            raise ValueError("Game session is busy, please try again")
 
-        if is_correct:
-            session.is_completed = True
-            session.is_won = True
-        elif remaining_guesses == 0:
-            session.is_completed = True
-            session.is_won = False
+        if finished:
+            self._sessions.tally(updated)
 
-        guess_result = GuessResult(
-            is_correct=is_correct,
-            guess_firearm=guess_firearm,
-            target_firearm=(
-                session.target_firearm
-                if session.is_completed
-                else session.target_firearm
-            ),
-            comparisons=comparisons,
-            remaining_guesses=remaining_guesses,
-            game_completed=session.is_completed,
+        return self._build_guess_result(
+            updated, updated.guess_count, guess_firearm, target_firearm, mask
         )
 
-        self._guess_history[session_id].append(guess_result)
-
-        return guess_result
-
     def get_available_firearm_names(self) -> List[str]:
-        return [firearm.name for firearm in firearm_service.get_all_firearms()]
+        return list(firearm_service.get_catalog().names)
+
+    def suggest_firearm_names(self, query: str, limit: int = 10) -> List[str]:
+        return firearm_service.get_catalog().suggest(query, limit)
 
     def get_game_status(self, session_id: str) -> Optional[GameStatusResponse]:
-        session = self._get_session(session_id)
-        if not session:
+        record = self._get_record(session_id)
+        target_firearm = self._resolve_firearm(record.target_id) if record else None
+        if not record or not target_firearm:
             return None
 
         return GameStatusResponse(
             session_id=session_id,
-            target_firearm_name=(
-                session.target_firearm.name if session.is_completed else None
-            ),
-            guesses_made=len(session.guesses_made),
-            max_guesses=session.max_guesses,
-            is_completed=session.is_completed,
-            is_won=session.is_won,
-            target_firearm=(session.target_firearm if session.is_completed else None),
-            all_guess_results=self._guess_history.get(session_id, []),
+            target_firearm_name=(target_firearm.name if record.is_completed else None),
+            guesses_made=record.guess_count,
+            max_guesses=record.max_guesses,
+            is_completed=record.is_completed,
+            is_won=record.is_won,
+            target_firearm=(target_firearm if record.is_completed else None),
+            all_guess_results=self._build_guess_history(record, target_firearm),
         )
 
     def reveal_answer(self, session_id: str) -> Optional[GameRevealResponse]:
-        session = self._get_session(session_id)
-        if not session:
+        record = self._get_record(session_id)
+        target_firearm = self._resolve_firearm(record.target_id) if record else None
+        if not record or not target_firearm:
             return None
 
-        if not session.is_completed:
+        if not record.is_completed:
             raise ValueError("Game not yet completed")
 
+        history = self._build_guess_history(record, target_firearm)
         return GameRevealResponse(
-            target_firearm=session.target_firearm,
-            guesses_made=session.guesses_made,
-            is_won=session.is_won,
-            all_guess_results=self._guess_history.get(session_id, []),
+            target_firearm=target_firearm,
+            guesses_made=[result.guess_firearm.name for result in history],
+            is_won=record.is_won,
+            all_guess_results=history,
         )
 
     def get_all_sessions(self) -> List[GameSession]:
-        return list(self._sessions.values())
+        return list(self.iter_sessions())
+
+    def iter_sessions(self) -> Iterator[GameSession]:
+        """Build each session's response model only as it is consumed."""
+        for record in self._sessions.values():
+            session = self._to_game_session(record)
+            if session is not None:
+                yield session
+
+    def iter_session_summaries(self) -> Iterator[GameSessionSummary]:
+        return map(GameSessionSummary.from_record, self._sessions.values())
+
+    def list_sessions(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> Tuple[List[GameSessionSummary], Optional[Tuple[float, str]]]:
+        """A newest-first page below ``after``, and where the next one starts."""
+        # One extra record tells whether another page follows.
+        records = self._sessions.page(filters, limit + 1, after)
+        next_position = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_position = (records[-1].created_at, records[-1].session_id)
+        return [GameSessionSummary.from_record(r) for r in records], next_position
+
+    def get_session_stats(self) -> SessionStats:
+        """Totals kept up to date as games start and finish; nothing is scanned."""
+        stats = self.get_session_totals()
+        completed = stats.get("completed", 0)
+        won = stats.get("won", 0)
+        histogram = {
+            int(name[len("won_in_") :]): count
+            for name, count in stats.items()
+            if name.startswith("won_in_")
+        }
+        return SessionStats(
+            active=self._sessions.counts()["active"],
+            started=stats.get("started", 0),
+            completed=completed,
+            won=won,
+            lost=completed - won,
+            win_rate=won / completed if completed else 0.0,
+            guess_histogram=dict(sorted(histogram.items())),
+        )
 
-    def _get_session(self, session_id: str) -> Optional[GameSession]:
-        return self._sessions.get(session_id)
+    def get_session_counts(self) -> Dict[str, int]:
+        return self._sessions.counts()
 
-    def _find_firearm_by_name(self, name: str) -> Optional[Firearm]:
-        all_firearms = firearm_service.get_all_firearms()
-        for firearm in all_firearms:
-            if firearm.name.lower() == name.lower():
-                return firearm
-        return None
+    def get_session_totals(self) -> Dict[str, int]:
+        """Raw running totals, such as ``started`` and ``won_in_3``."""
+        return self._sessions.stats()
 
-    def _compare_firearms(
-        self, guess_firearm: Firearm, target_firearm: Firearm
-    ) -> List[AttributeComparison]:
-        comparisons = []
+    def close(self) -> None:
+        self._sessions.close()
 
-        manufacturer_result = (
-            ComparisonResult.CORRECT
-            if guess_firearm.manufacturer == target_firearm.manufacturer
-            else ComparisonResult.INCORRECT
-        )
-        comparisons.append(
-            AttributeComparison(
-                attribute="manufacturer",
-                guess_value=guess_firearm.manufacturer,
-                correct_value=target_firearm.manufacturer,
-                result=manufacturer_result,
-            )
-        )
+    def _get_session(self, session_id: str) -> Optional[GameSession]:
+        record = self._get_record(session_id)
+        return self._to_game_session(record) if record else None
 
-        type_result = (
-            ComparisonResult.CORRECT
-            if guess_firearm.type == target_firearm.type
-            else ComparisonResult.INCORRECT
-        )
-        comparisons.append(
-            AttributeComparison(
-                attribute="type",
-                guess_value=guess_firearm.type.value,
-                correct_value=target_firearm.type.value,
-                result=type_result,
-            )
-        )
+    def _get_record(self, session_id: str) -> Optional[SessionRecord]:
+        return self._sessions.get(session_id)
 
-        caliber_result = (
-            ComparisonResult.CORRECT
-            if guess_firearm.caliber == target_firearm.caliber
-            else ComparisonResult.INCORRECT
-        )
-        comparisons.append(
-            AttributeComparison(
-                attribute="caliber",
-                guess_value=guess_firearm.caliber,
-                correct_value=target_firearm.caliber,
-                result=caliber_result,
-            )
-        )
+    def _resolve_firearm(self, firearm_id: str) -> Optional[Firearm]:
+        firearm = firearm_service.get_catalog().by_id.get(firearm_id)
+        if firearm is None and self._current_daily_firearm is not None:
+            # Today's target stays playable even if it is edited out mid-day.
+            if self._current_daily_firearm.id == firearm_id:
+                firearm = self._current_daily_firearm
+        if firearm is None:
+            # Deleted since the session was played; sessions outlive the row.
+            firearm = firearm_service.get_archived_firearm(firearm_id)
+        return firearm
+
+    def _find_stored_firearm(self, firearm_id: str) -> Optional[Firearm]:
+        """Ask the repository, for when the catalog snapshot may be behind."""
+        return firearm_service.repository.get_firearm_by_id(firearm_id)
+
+    def _to_game_session(self, record: SessionRecord) -> Optional[GameSession]:
+        target_firearm = self._resolve_firearm(record.target_id)
+        if target_firearm is None:
+            return None
 
-        action_result = (
-            ComparisonResult.CORRECT
-            if guess_firearm.action_type == target_firearm.action_type
-            else ComparisonResult.INCORRECT
-        )
-        comparisons.append(
-            AttributeComparison(
-                attribute="action_type",
-                guess_value=guess_firearm.action_type,
-                correct_value=target_firearm.action_type,
-                result=action_result,
-            )
+        return GameSession(
+            session_id=record.session_id,
+            target_firearm=target_firearm,
+            guesses_made=[
+                firearm.name
+                for firearm in map(self._resolve_firearm, record.guess_ids)
+                if firearm is not None
+            ],
+            is_completed=record.is_completed,
+            is_won=record.is_won,
+            created_at=record.created_datetime,
+            max_guesses=record.max_guesses,
         )
 
-        country_result = (
-            ComparisonResult.CORRECT
-            if (guess_firearm.country_of_origin == target_firearm.country_of_origin)
-            else ComparisonResult.INCORRECT
-        )
-        comparisons.append(
-            AttributeComparison(
-                attribute="country_of_origin",
-                guess_value=guess_firearm.country_of_origin,
-                correct_value=target_firearm.country_of_origin,
-                result=country_result,
-            )
+    def _build_guess_history(
+        self, record: SessionRecord, target_firearm: Firearm
+    ) -> List[GuessResult]:
+        history = []
+        for guess_number, firearm_id in enumerate(record.guess_ids, start=1):
+            guess_firearm = self._resolve_firearm(firearm_id)
+            if guess_firearm is not None:
+                # The stored mask compared the firearms as they were then; an
+                # edit since would contradict the values shown, so compare the
+                # firearms being displayed.
+                mask = self._comparison_mask(guess_firearm, target_firearm)
+                history.append(
+                    self._build_guess_result(
+                        record, guess_number, guess_firearm, target_firearm, mask
+                    )
+                )
+        return history
+
+    def _build_guess_result(
+        self,
+        record: SessionRecord,
+        guess_number: int,
+        guess_firearm: Firearm,
+        target_firearm: Firearm,
+        mask: int,
+    ) -> GuessResult:
+        is_correct = guess_firearm.id == target_firearm.id
+        remaining_guesses = record.max_guesses - guess_number
+        return construct_trusted(
+            GuessResult,
+            {
+                "is_correct": is_correct,
+                "guess_firearm": guess_firearm,
+                "target_firearm": target_firearm,
+                "comparisons": build_comparisons(guess_firearm, target_firearm, mask),
+                "remaining_guesses": remaining_guesses,
+                "game_completed": is_correct or remaining_guesses == 0,
+            },
         )
 
-        adoption_result = (
-            ComparisonResult.CORRECT
-            if guess_firearm.model_type == target_firearm.model_type
-            else ComparisonResult.INCORRECT
-        )
-        comparisons.append(
-            AttributeComparison(
-                attribute="adoption_status",
-                guess_value=guess_firearm.model_type.value,
-                correct_value=target_firearm.model_type.value,
-                result=adoption_result,
-            )
-        )
+    def _find_firearm_by_name(self, name: str) -> Optional[Firearm]:
+        return firearm_service.get_catalog().find_by_name(name)
 
-        if guess_firearm.year_introduced and target_firearm.year_introduced:
-            year_diff = abs(
-                guess_firearm.year_introduced - target_firearm.year_introduced
-            )
-            if year_diff == 0:
-                year_result = ComparisonResult.CORRECT
-            else:
-                year_result = ComparisonResult.INCORRECT
-        else:
-            year_result = ComparisonResult.INCORRECT
-
-        comparisons.append(
-            AttributeComparison(
-                attribute="year_introduced",
-                guess_value=str(guess_firearm.year_introduced or "Unknown"),
-                correct_value=str(target_firearm.year_introduced or "Unknown"),
-                result=year_result,
-            )
-        )
+    def _compare_firearms(
+        self, guess_firearm: Firearm, target_firearm: Firearm
+    ) -> List[AttributeComparison]:
+        mask = self._comparison_mask(guess_firearm, target_firearm)
+        return build_comparisons(guess_firearm, target_firearm, mask)
 
-        return comparisons
+    def _comparison_mask(self, guess_firearm: Firearm, target_firearm: Firearm) -> int:
+        catalog = firearm_service.get_catalog()
+        return compare_codes(
+            catalog.encode(guess_firearm), catalog.encode(target_firearm)
+        )
 
     def _get_daily_firearm(self) -> Firearm:
         today = date.today()
-
-        if self._current_date != today or self._current_daily_firearm is None:
-            self._current_date = today
+        # Re-read after a catalog change too, which may have come from another
+        # worker that had to reschedule the day.
+        version = firearm_service.get_catalog().version
+
+        if (
+            self._current_date != today
+            or self._current_catalog_version != version
+            or self._current_daily_firearm is None
+        ):
             self._current_daily_firearm = self._select_daily_firearm(today)
+            self._current_date = today
+            self._current_catalog_version = version
 
         return self._current_daily_firearm
 
     def _select_daily_firearm(self, target_date: date) -> Firearm:
-        available_firearms = firearm_service.get_all_firearms()
-        if not available_firearms:
+        catalog = firearm_service.get_catalog()
+        if not catalog.firearms:
             raise ValueError("No firearms available for game")
 
-        date_string = target_date.isoformat()
-        seed_hash = hashlib.sha256(date_string.encode()).hexdigest()
-
-        seed_int = int(seed_hash[:8], 16)  # Use first 8 hex chars as integer
-        firearm_index = seed_int % len(available_firearms)
-
-        return available_firearms[firearm_index]
+        return self._daily_schedule.firearm_for(target_date, catalog)
 
     def get_daily_firearm(self) -> Firearm:
         return self._get_daily_firearm()
 
+    def extend_daily_schedule(self) -> int:
+        """Schedule the coming days' puzzles; returns how many were added."""
+        catalog = firearm_service.get_catalog()
+        if not catalog.firearms:
+            return 0
+        return self._daily_schedule.extend(date.today(), catalog)
+
 
 game_service = GameService()
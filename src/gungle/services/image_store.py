@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import IO, AsyncIterable, NamedTuple, Optional
+
+IMAGES_DIR = "images"
+
+# Leading bytes of each accepted format; WebP and AVIF are checked further on.
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+_SNIFF_BYTES = 16
+
+
+class ImageTooLargeError(ValueError):
+    pass
+
+
+class UnsupportedImageError(ValueError):
+    pass
+
+
+class StoredImage(NamedTuple):
+    url: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """File extension for the image format ``head`` starts with, if known."""
+    for signature, extension in _SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return "avif"
+    return None
+
+
+def _absorb(output: IO[bytes], digest: "hashlib._Hash", data: bytes) -> None:
+    # hashlib drops the GIL for large buffers, so this overlaps with the loop.
+    digest.update(data)
+    output.write(data)
+
+
+async def save_image_stream(
+    chunks: AsyncIterable[bytes],
+    upload_dir: str,
+    max_bytes: int,
+    flush_bytes: int = 1 << 20,
+) -> StoredImage:
+    """Write an uploaded image under a name derived from its SHA-256.
+
+    The body goes to a temporary file in ``flush_bytes`` batches, hashed as it
+    is written, so memory stays bounded and disk and hashing work runs off the
+    event loop. Identical content maps to the same file, which is kept once.
+    """
+    images_dir = os.path.join(upload_dir, IMAGES_DIR)
+    os.makedirs(images_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=images_dir, prefix=".upload-")
+    digest = hashlib.sha256()
+    size = 0
+    extension: Optional[str] = None
+    pending = bytearray()
+    try:
+        with os.fdopen(fd, "wb") as output:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageTooLargeError(
+                        f"Uploads are limited to {max_bytes} bytes"
+                    )
+                pending += chunk
+                if extension is None and len(pending) >= _SNIFF_BYTES:
+                    extension = _require_image(bytes(pending[:_SNIFF_BYTES]))
+                if len(pending) >= flush_bytes:
+                    await asyncio.to_thread(_absorb, output, digest, bytes(pending))
+                    pending.clear()
+            if extension is None:
+                extension = _require_image(bytes(pending))
+            if pending:
+                await asyncio.to_thread(_absorb, output, digest, bytes(pending))
+
+        sha256 = digest.hexdigest()
+        name = f"{sha256[:32]}.{extension}"
+        final_path = os.path.join(images_dir, name)
+        deduplicated = os.path.exists(final_path)
+        if deduplicated:
+            os.unlink(temp_path)
+        else:
+            os.replace(temp_path, final_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    return StoredImage(f"/uploads/{IMAGES_DIR}/{name}", sha256, size, deduplicated)
+
+
+def _require_image(head: bytes) -> str:
+    extension = sniff_image_type(head)
+    if extension is None:
+        raise UnsupportedImageError("Upload is not a JPEG, PNG, GIF, WebP or AVIF")
+    return extension
@@ -0,0 +1,229 @@
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ..config import settings
+from ..models.firearm import ImageVariant
+
+VARIANTS_DIR = "variants"
+MANIFEST_NAME = "manifest.json"
+UPLOADS_URL = "/uploads/"
+
+# Pillow format name and encoder options for each output extension.
+_ENCODERS: Dict[str, Any] = {
+    "avif": ("AVIF", {"quality": 55, "speed": 6}),
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def local_image_path(upload_dir: str, image_url: str) -> Optional[str]:
+    """Where an ``/uploads/...`` URL lives on disk, or None if it is not local."""
+    if not image_url.startswith(UPLOADS_URL):
+        return None
+    root = os.path.abspath(upload_dir)
+    path = os.path.abspath(os.path.join(root, image_url[len(UPLOADS_URL) :]))
+    return path if path.startswith(root + os.sep) else None
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomically(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as output:
+            output.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def encode_variants(
+    source_path: str,
+    variants_dir: str,
+    widths: Sequence[int],
+    formats: Sequence[str],
+) -> List[Dict[str, Any]]:
+    """Resize and re-encode one image; runs in a worker process.
+
+    Each file is named after a hash of its own bytes, so a URL never changes
+    meaning and can be cached forever. Images are never upscaled.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as opened:
+        image = ImageOps.exif_transpose(opened)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        image.load()
+
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    variants = []
+    for width in sorted({min(width, image.width) for width in widths}):
+        height = max(1, round(image.height * width / image.width))
+        resized = (
+            image
+            if width == image.width
+            else image.resize((width, height), Image.Resampling.LANCZOS)
+        )
+        for extension in formats:
+            pillow_format, options = _ENCODERS[extension]
+            frame = resized
+            if pillow_format == "JPEG" and frame.mode != "RGB":
+                frame = frame.convert("RGB")
+            buffer = io.BytesIO()
+            frame.save(buffer, format=pillow_format, **options)
+            data = buffer.getvalue()
+
+            digest = hashlib.sha256(data).hexdigest()[:16]
+            name = f"{stem}-{width}w.{digest}.{extension}"
+            path = os.path.join(variants_dir, name)
+            if not os.path.exists(path):
+                write_atomically(path, data)
+            variants.append({"name": name, "width": width, "format": extension})
+    return variants
+
+
+def _load_manifest(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as manifest:
+            loaded = json.load(manifest)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        print(f"Ignoring unreadable image manifest {path}: {e}")
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def _is_current(entry: Any, source_hash: str, variants_dir: str) -> bool:
+    return (
+        isinstance(entry, dict)
+        and entry.get("source") == source_hash
+        and all(
+            os.path.exists(os.path.join(variants_dir, variant["name"]))
+            for variant in entry.get("variants", [])
+        )
+    )
+
+
+def build_image_variants(
+    upload_dir: str,
+    image_urls: Iterable[str],
+    widths: Sequence[int],
+    formats: Sequence[str],
+    workers: Optional[int] = None,
+) -> int:
+    """Encode variants for every image that changed; returns how many did.
+
+    The manifest records each source's hash, so unchanged images are skipped
+    and the pipeline can be rerun after every catalog edit or upload.
+    """
+    if importlib.util.find_spec("PIL") is None:
+        raise RuntimeError(
+            "Image variants need Pillow: pip install 'gungle-backend[images]'"
+        )
+    unknown = set(formats) - set(_ENCODERS)
+    if unknown:
+        raise ValueError(f"Unsupported image formats: {sorted(unknown)}")
+
+    variants_dir = os.path.join(upload_dir, VARIANTS_DIR)
+    os.makedirs(variants_dir, exist_ok=True)
+    manifest_path = os.path.join(variants_dir, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+
+    pending: Dict[str, str] = {}
+    hashes: Dict[str, str] = {}
+    for image_url in set(image_urls):
+        path = local_image_path(upload_dir, image_url)
+        if path is None or not os.path.isfile(path):
+            continue
+        hashes[image_url] = file_digest(path)
+        if not _is_current(manifest.get(image_url), hashes[image_url], variants_dir):
+            pending[image_url] = path
+    if not pending:
+        return 0
+
+    encoded = 0
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        futures = {
+            image_url: pool.submit(
+                encode_variants, path, variants_dir, list(widths), list(formats)
+            )
+            for image_url, path in pending.items()
+        }
+        for image_url, future in futures.items():
+            try:
+                variants = future.result()
+            except Exception as e:
+                print(f"Error encoding variants for {image_url}: {e}")
+                continue
+            manifest[image_url] = {"source": hashes[image_url], "variants": variants}
+            encoded += 1
+
+    write_atomically(
+        manifest_path, json.dumps(manifest, indent=1, sort_keys=True).encode()
+    )
+    return encoded
+
+
+class ImageVariantIndex:
+    """Looks up an image's variants, rereading the manifest when it changes."""
+
+    def __init__(self, upload_dir: str):
+        self.manifest_path = os.path.join(upload_dir, VARIANTS_DIR, MANIFEST_NAME)
+        self._variants: Dict[str, List[ImageVariant]] = {}
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def variants_for(self, image_url: Optional[str]) -> List[ImageVariant]:
+        if not image_url:
+            return []
+        self._refresh()
+        return self._variants.get(image_url, [])
+
+    def version(self) -> Optional[float]:
+        """Changes whenever the manifest does; part of rendered-response keys."""
+        self._refresh()
+        return self._mtime
+
+    def _refresh(self) -> None:
+        try:
+            mtime: Optional[float] = os.stat(self.manifest_path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            manifest = _load_manifest(self.manifest_path) if mtime else {}
+            self._variants = {
+                image_url: [
+                    ImageVariant(
+                        url=f"{UPLOADS_URL}{VARIANTS_DIR}/{variant['name']}",
+                        width=variant["width"],
+                        format=variant["format"],
+                    )
+                    for variant in entry.get("variants", [])
+                ]
+                for image_url, entry in manifest.items()
+                if isinstance(entry, dict)
+            }
+            self._mtime = mtime
+
+
+image_variant_index = ImageVariantIndex(settings.UPLOAD_DIR)
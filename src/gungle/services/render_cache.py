@@ -0,0 +1,27 @@
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar, cast
+
+T = TypeVar("T")
+
+
+class RenderCache:
+    """One pre-rendered value per name, kept until its key changes.
+
+    The key captures everything the rendering depends on (the day, the
+    catalog version, ...), so a stale entry is replaced on its next use rather
+    than invalidated explicitly. Two threads may render the same entry at
+    once; both produce the same value, so no lock is taken.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[Hashable, Any]] = {}
+
+    def get(self, name: str, key: Hashable, render: Callable[[], T]) -> T:
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            return cast(T, entry[1])
+        value = render()
+        self._entries[name] = (key, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,129 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class _Entry(Generic[V]):
+    __slots__ = ("value", "expires_at", "ttl")
+
+    def __init__(self, value: V, expires_at: float, ttl: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.ttl = ttl
+
+
+class SessionCache(Generic[V]):
+    """Bounded in-memory session map with idle expiry and an LRU size cap.
+
+    Expiry times live in a min-heap. Touching an entry only moves its
+    deadline forward; stale heap items are re-queued when they surface, so
+    every access stays O(1) and every eviction costs O(log n) amortized.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        completed_ttl_seconds: float,
+        max_entries: int,
+        on_evict: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.completed_ttl_seconds = completed_ttl_seconds
+        self.max_entries = max_entries
+        self.evictions: Dict[str, int] = {"expired": 0, "lru": 0}
+        self._on_evict = on_evict
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry[V]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[V]:
+        with self._lock:
+            now = self._clock()
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = now + entry.ttl
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def put(self, key: str, value: V, completed: bool = False) -> None:
+        with self._lock:
+            now = self._clock()
+            self._evict_expired(now)
+            ttl = self.completed_ttl_seconds if completed else self.ttl_seconds
+            entry = self._entries.get(key)
+            if entry is not None and entry.ttl <= ttl:
+                # The deadline can only move later, so the queued one stays valid.
+                entry.value = value
+                entry.ttl = ttl
+                entry.expires_at = now + ttl
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = _Entry(value, now + ttl, ttl)
+            self._entries.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (now + ttl, key))
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self.evictions["lru"] += 1
+                self._notify(evicted)
+
+            if len(self._expiry_heap) > 2 * len(self._entries) + 64:
+                self._expiry_heap = [
+                    (entry.expires_at, key) for key, entry in self._entries.items()
+                ]
+                heapq.heapify(self._expiry_heap)
+
+    def pop(self, key: str) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry.value if entry is not None else None
+
+    def values(self) -> List[V]:
+        with self._lock:
+            self._evict_expired(self._clock())
+            return [entry.value for entry in self._entries.values()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._expiry_heap.clear()
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            return self._evict_expired(self._clock())
+
+    def _evict_expired(self, now: float) -> int:
+        heap = self._expiry_heap
+        evicted = 0
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if entry.expires_at > now:
+                heapq.heappush(heap, (entry.expires_at, key))
+                continue
+            del self._entries[key]
+            self.evictions["expired"] += 1
+            evicted += 1
+            self._notify(key)
+        return evicted
+
+    def _notify(self, key: str) -> None:
+        if self._on_evict is not None:
+            self._on_evict(key)
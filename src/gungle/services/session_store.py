@@ -0,0 +1,308 @@
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..config import settings
+from ..database import GameSessionDB, SessionStatDB, create_sqlite_engine
+from ..models.firearm import SessionFilter
+from ..models.session import SessionRecord
+from ..repositories.db_game_session_repository import DbGameSessionRepository
+from ..repositories.game_session_repository import GameSessionRepository
+from .session_cache import SessionCache
+from .session_writer import SessionWriteBehind
+
+
+class SessionStore(ABC):
+    """Where ``GameService`` keeps its sessions.
+
+    ``get`` hands out a record the caller may mutate; changes only become
+    visible to other workers once the record is passed back to ``save``.
+    Updates that depend on what was read go through ``save_if_unchanged``,
+    since another worker may save the same session in between.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        pass
+
+    @abstractmethod
+    def save(self, record: SessionRecord) -> None:
+        pass
+
+    @abstractmethod
+    def save_if_unchanged(self, record: SessionRecord, guess_count: int) -> bool:
+        """Save ``record`` only if the stored session has ``guess_count`` guesses.
+
+        Returns False, saving nothing, if the session is gone or was saved
+        with another guess count since it was read.
+        """
+        pass
+
+    @abstractmethod
+    def values(self) -> Iterator[SessionRecord]:
+        pass
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        pass
+
+    def page(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[SessionRecord]:
+        """Newest first, below the (created_at, session id) position ``after``."""
+        candidates = (
+            record
+            for record in self.values()
+            if filters.matches(record) and (after is None or _position(record) < after)
+        )
+        return heapq.nlargest(limit, candidates, key=_position)
+
+    def tally(self, record: SessionRecord) -> None:
+        """Fold a game that just started or just finished into the totals."""
+        self.add_stats(tally_deltas(record))
+
+    def close(self) -> None:
+        pass
+
+
+def _position(record: SessionRecord) -> Tuple[float, str]:
+    return record.created_at, record.session_id
+
+
+def tally_deltas(record: SessionRecord) -> Dict[str, int]:
+    if not record.is_completed:
+        return {"started": 1}
+    deltas = {"completed": 1}
+    if record.is_won:
+        deltas["won"] = 1
+        deltas[f"won_in_{record.guess_count}"] = 1
+    return deltas
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local LRU cache, written behind to a repository.
+
+    Fastest, but each worker sees only its own sessions (plus whatever it can
+    restore from the repository), so it suits single-worker deployments.
+    Running totals are read from the repository once and then kept here,
+    their deltas written behind with the sessions.
+    """
+
+    def __init__(
+        self,
+        repository: GameSessionRepository,
+        ttl_seconds: float,
+        completed_ttl_seconds: float,
+        max_entries: int,
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.repository = repository
+        self.sessions: SessionCache[SessionRecord] = SessionCache(
+            ttl_seconds=ttl_seconds,
+            completed_ttl_seconds=completed_ttl_seconds,
+            max_entries=max_entries,
+        )
+        self.writer = SessionWriteBehind(
+            repository,
+            flush_interval=flush_interval,
+            batch_size=batch_size,
+            retention=timedelta(seconds=ttl_seconds),
+        )
+        self._stats: Optional[Dict[str, int]] = None
+        self._stats_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        record = self.sessions.get(session_id)
+        if record is None:
+            record = self._restore(session_id)
+        return record
+
+    def save(self, record: SessionRecord) -> None:
+        self.sessions.put(record.session_id, record, completed=record.is_completed)
+        self.writer.enqueue(record.copy())
+
+    def save_if_unchanged(self, record: SessionRecord, guess_count: int) -> bool:
+        with self._save_lock:
+            current = self.get(record.session_id)
+            if current is None or current.guess_count != guess_count:
+                return False
+            self.save(record)
+            return True
+
+    def values(self) -> Iterator[SessionRecord]:
+        return iter(self.sessions.values())
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "active": len(self.sessions),
+            "evicted_expired": self.sessions.evictions["expired"],
+            "evicted_lru": self.sessions.evictions["lru"],
+        }
+
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        with self._stats_lock:
+            # Loaded before the first delta is queued, so never counts it.
+            stats = self._loaded_stats()
+            for name, value in deltas.items():
+                stats[name] = stats.get(name, 0) + value
+            self.writer.add_stats(deltas)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._loaded_stats())
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def _loaded_stats(self) -> Dict[str, int]:
+        if self._stats is None:
+            try:
+                self._stats = self.repository.get_stats()
+            except Exception as e:
+                print(f"Error loading session stats: {e}")
+                self._stats = {}
+        return self._stats
+
+    def _restore(self, session_id: str) -> Optional[SessionRecord]:
+        stored = self.writer.pending(session_id) or self.repository.get_session(
+            session_id
+        )
+        if stored is None or stored.created_at < time.time() - self.ttl_seconds:
+            return None
+
+        record = stored.copy()
+        self.sessions.put(session_id, record, completed=record.is_completed)
+        return record
+
+
+class DatabaseSessionStore(SessionStore):
+    """Writes every change straight through to a shared database.
+
+    With a SQLite file in WAL mode, readers never wait on the single writer,
+    so all workers on the host can share one file; any server database works
+    the same way across hosts.
+    """
+
+    def __init__(
+        self,
+        repository: GameSessionRepository,
+        ttl_seconds: float,
+        purge_interval: float = 300.0,
+    ):
+        self.repository = repository
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self._last_purge = time.monotonic()
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        record = self.repository.get_session(session_id)
+        if record is None or record.created_at < time.time() - self.ttl_seconds:
+            return None
+        return record
+
+    def save(self, record: SessionRecord) -> None:
+        self.repository.save_sessions([record])
+        self._purge_expired()
+
+    def save_if_unchanged(self, record: SessionRecord, guess_count: int) -> bool:
+        return self.repository.replace_session(record, guess_count)
+
+    def values(self) -> Iterator[SessionRecord]:
+        return self.repository.iter_sessions(self._cutoff())
+
+    def counts(self) -> Dict[str, int]:
+        return {"active": self.repository.count_sessions(self._cutoff())}
+
+    def page(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[SessionRecord]:
+        cutoff = self._cutoff()
+        if filters.created_after is None or filters.created_after < cutoff:
+            filters = filters.model_copy(update={"created_after": cutoff})
+        return self.repository.list_sessions(filters, limit, after)
+
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        self.repository.add_stats(deltas)
+
+    def stats(self) -> Dict[str, int]:
+        return self.repository.get_stats()
+
+    def _cutoff(self) -> datetime:
+        return datetime.fromtimestamp(time.time() - self.ttl_seconds)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        if now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        try:
+            self.repository.delete_sessions_created_before(self._cutoff())
+        except Exception as e:
+            print(f"Error purging expired game sessions: {e}")
+
+
+def sqlite_session_factory(path: str) -> "sessionmaker[Session]":
+    engine = create_sqlite_engine(path)
+    for model in (GameSessionDB, SessionStatDB):
+        model.__table__.create(bind=engine, checkfirst=True)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def create_session_store(
+    repository: Optional[GameSessionRepository] = None,
+) -> SessionStore:
+    """Build the store selected by ``settings.SESSION_BACKEND``."""
+    ttl_seconds = settings.SESSION_TIMEOUT_HOURS * 3600
+    backend = settings.SESSION_BACKEND
+
+    if backend == "shared_memory":
+        from .shm_session_store import SharedMemorySessionStore
+
+        return SharedMemorySessionStore(
+            settings.SESSION_SHM_NAME,
+            capacity=settings.SESSION_SHM_SLOTS,
+            ttl_seconds=ttl_seconds,
+            completed_ttl_seconds=settings.COMPLETED_SESSION_TTL_MINUTES * 60,
+        )
+
+    if backend == "sqlite":
+        if settings.SESSION_SQLITE_PATH:
+            repository = DbGameSessionRepository(
+                sqlite_session_factory(settings.SESSION_SQLITE_PATH)
+            )
+        return DatabaseSessionStore(
+            repository or DbGameSessionRepository(), ttl_seconds=ttl_seconds
+        )
+
+    if backend != "memory":
+        raise ValueError(f"Unknown session backend: {backend}")
+    return MemorySessionStore(
+        repository or DbGameSessionRepository(),
+        ttl_seconds=ttl_seconds,
+        completed_ttl_seconds=settings.COMPLETED_SESSION_TTL_MINUTES * 60,
+        max_entries=settings.MAX_ACTIVE_SESSIONS,
+        flush_interval=settings.SESSION_FLUSH_INTERVAL_SECONDS,
+        batch_size=settings.SESSION_FLUSH_BATCH_SIZE,
+    )
@@ -0,0 +1,142 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Mapping, Optional
+
+from ..models.session import SessionRecord
+from ..repositories.game_session_repository import GameSessionRepository
+
+
+class SessionWriteBehind:
+    """Coalesces session writes and flushes them in batched transactions.
+
+    Writes are keyed by session id, so a session that changes several times
+    between flushes is written once; running-total deltas are summed the same
+    way and written after the sessions. A daemon thread flushes every
+    ``flush_interval`` seconds, or sooner once ``batch_size`` writes queue up.
+    With a ``retention`` set, the same thread also purges rows older than it
+    every ``purge_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        repository: GameSessionRepository,
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+        retention: Optional[timedelta] = None,
+        purge_interval: float = 300.0,
+    ):
+        self.repository = repository
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention = retention
+        self.purge_interval = purge_interval
+        self._last_purge = 0.0
+        self._pending: Dict[str, SessionRecord] = {}
+        self._in_flight: Dict[str, SessionRecord] = {}
+        self._pending_stats: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+
+    def enqueue(self, session: SessionRecord) -> None:
+        with self._lock:
+            self._pending[session.session_id] = session
+            backlog = len(self._pending)
+            self._start_locked()
+
+        if backlog >= self.batch_size:
+            self._wakeup.set()
+
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        with self._lock:
+            _merge(self._pending_stats, deltas)
+            self._start_locked()
+
+    def pending(self, session_id: str) -> Optional[SessionRecord]:
+        with self._lock:
+            return self._pending.get(session_id) or self._in_flight.get(session_id)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._in_flight = batch
+            if not batch:
+                self._flush_stats()
+                return 0
+
+            try:
+                self.repository.save_sessions(list(batch.values()))
+            except Exception as e:
+                print(f"Error flushing {len(batch)} game sessions: {e}")
+                with self._lock:
+                    for session_id, session in batch.items():
+                        self._pending.setdefault(session_id, session)
+                return 0
+            finally:
+                with self._lock:
+                    self._in_flight = {}
+
+            self._flush_stats()
+            return len(batch)
+
+    def close(self) -> None:
+        with self._lock:
+            thread, stop = self._thread, self._stop
+            self._thread = self._stop = None
+
+        if thread is not None and stop is not None:
+            stop.set()
+            self._wakeup.set()
+            thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def _flush_stats(self) -> None:
+        with self._lock:
+            deltas, self._pending_stats = self._pending_stats, {}
+        if not deltas:
+            return
+        try:
+            self.repository.add_stats(deltas)
+        except Exception as e:
+            print(f"Error flushing session stats: {e}")
+            with self._lock:
+                _merge(self._pending_stats, deltas)
+
+    def _start_locked(self) -> None:
+        if self._thread is None:
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._stop,),
+                name="session-write-behind",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        if self.retention is None or now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        try:
+            self.repository.delete_sessions_created_before(
+                datetime.now() - self.retention
+            )
+        except Exception as e:
+            print(f"Error purging expired game sessions: {e}")
+
+
+def _merge(totals: Dict[str, int], deltas: Mapping[str, int]) -> None:
+    for name, value in deltas.items():
+        totals[name] = totals.get(name, 0) + value
@@ -0,0 +1,358 @@
+import fcntl
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from ..models.session import SessionRecord
+from .session_store import SessionStore
+
+MAGIC = b"GUNGLSHM"
+FORMAT_VERSION = 2
+MAX_GUESSES = 8
+
+# magic, version, capacity, slot size, live slots, tombstones
+HEADER = struct.Struct("<8sIIIII")
+STAT_NAMES = ("started", "completed", "won") + tuple(
+    f"won_in_{guesses}" for guesses in range(1, MAX_GUESSES + 1)
+)
+STATS = struct.Struct(f"<{len(STAT_NAMES)}Q")
+STATS_OFFSET = 32
+HEADER_SIZE = 128
+# state, flags, max guesses, guess count, expires at, created at,
+# session id length + bytes, target id length + bytes
+SLOT_HEAD = struct.Struct("<BBBBddB40sB64s")
+# mask, firearm id length + bytes
+GUESS = struct.Struct("<BB64s")
+SLOT_SIZE = SLOT_HEAD.size + MAX_GUESSES * GUESS.size
+
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+SCAN_CHUNK = 1024
+
+
+def _buffer(segment: SharedMemory) -> memoryview:
+    buf = segment.buf
+    assert buf is not None, "shared memory segment is closed"
+    return buf
+
+
+def _untrack(segment: SharedMemory) -> None:
+    # Before Python 3.13 every attach registers the segment with this process's
+    # resource tracker, which would unlink it on exit while other workers
+    # still use it. The segment deliberately outlives any single worker.
+    try:
+        resource_tracker.unregister(
+            getattr(segment, "_name", segment.name), "shared_memory"
+        )
+    except Exception:
+        pass
+
+
+class SharedMemorySessionStore(SessionStore):
+    """Open-addressing hash table of fixed-size slots in POSIX shared memory.
+
+    Every worker on the host attaches the same named segment, so a session is
+    visible to all of them without a round trip to a database. Writers are
+    serialized by an ``flock`` on a side file, plus a thread lock because
+    ``flock`` does not exclude threads sharing one descriptor. Sessions live
+    until the host reboots or their TTL passes; they are not persisted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        ttl_seconds: float,
+        completed_ttl_seconds: float,
+        lock_path: Optional[str] = None,
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.completed_ttl_seconds = completed_ttl_seconds
+        self._thread_lock = threading.Lock()
+        self._lock_fd = os.open(
+            lock_path or os.path.join(tempfile.gettempdir(), f"{name}.lock"),
+            os.O_RDWR | os.O_CREAT,
+            0o600,
+        )
+        with self._locked():
+            self._segment = self._attach(name, capacity)
+        self._buf = _buffer(self._segment)
+        _, _, self.capacity, _, _, _ = HEADER.unpack_from(self._buf, 0)
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        key = session_id.encode()
+        with self._locked():
+            index, _ = self._find(key, time.time())
+            return self._read(index) if index is not None else None
+
+    def save(self, record: SessionRecord) -> None:
+        encoded = self._encode(record)
+        with self._locked():
+            self._put(record, *encoded)
+
+    def save_if_unchanged(self, record: SessionRecord, guess_count: int) -> bool:
+        encoded = self._encode(record)
+        with self._locked():
+            index, _ = self._find(encoded[0], time.time())
+            if index is None or self._guess_count(index) != guess_count:
+                return False
+            self._put(record, *encoded)
+            return True
+
+    def values(self) -> Iterator[SessionRecord]:
+        # Scan in chunks so other workers are never locked out for long.
+        for start in range(0, self.capacity, SCAN_CHUNK):
+            with self._locked():
+                now = time.time()
+                records = [
+                    self._read(index)
+                    for index in range(start, min(start + SCAN_CHUNK, self.capacity))
+                    if self._is_live(index, now)
+                ]
+            yield from records
+
+    def counts(self) -> Dict[str, int]:
+        with self._locked():
+            _, _, capacity, _, live, tombstones = HEADER.unpack_from(self._buf, 0)
+        return {"active": live, "capacity": capacity, "tombstones": tombstones}
+
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        with self._locked():
+            values = list(STATS.unpack_from(self._buf, STATS_OFFSET))
+            for position, name in enumerate(STAT_NAMES):
+                values[position] += deltas.get(name, 0)
+            STATS.pack_into(self._buf, STATS_OFFSET, *values)
+
+    def stats(self) -> Dict[str, int]:
+        with self._locked():
+            values = STATS.unpack_from(self._buf, STATS_OFFSET)
+        return {name: value for name, value in zip(STAT_NAMES, values) if value}
+
+    def close(self) -> None:
+        del self._buf
+        self._segment.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Remove the segment; only for tests and operator cleanup."""
+        SharedMemory(self._segment.name).unlink()
+
+    def _encode(self, record: SessionRecord) -> Tuple[bytes, bytes, List[bytes]]:
+        key = record.session_id.encode()
+        target = record.target_id.encode()
+        guess_ids = [firearm_id.encode() for firearm_id in record.guess_ids]
+        if len(key) > 40 or len(target) > 64 or any(len(g) > 64 for g in guess_ids):
+            raise ValueError("Session or firearm id too long for shared memory")
+        if len(guess_ids) > MAX_GUESSES:
+            raise ValueError(f"Sessions are limited to {MAX_GUESSES} guesses")
+        return key, target, guess_ids
+
+    def _put(
+        self,
+        record: SessionRecord,
+        key: bytes,
+        target: bytes,
+        guess_ids: List[bytes],
+    ) -> None:
+        """Write ``record`` to its slot, or a free one; the lock must be held."""
+        now = time.time()
+        ttl = self.completed_ttl_seconds if record.is_completed else self.ttl_seconds
+        index, free = self._find(key, now)
+        if index is None:
+            if free is None or self._crowded():
+                self._compact(now)
+                index, free = self._find(key, now)
+            if free is None:
+                raise RuntimeError("Shared session table is full")
+            self._claim(free)
+            index = free
+        self._write(index, record, key, target, guess_ids, now + ttl)
+
+    def _guess_count(self, index: int) -> int:
+        return int(SLOT_HEAD.unpack_from(self._buf, self._offset(index))[3])
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _attach(self, name: str, capacity: int) -> SharedMemory:
+        size = HEADER_SIZE + capacity * SLOT_SIZE
+        try:
+            segment = SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            segment = SharedMemory(name)
+            _untrack(segment)
+            magic, version, _, slot_size, _, _ = HEADER.unpack_from(_buffer(segment), 0)
+            if (magic, version, slot_size) != (MAGIC, FORMAT_VERSION, SLOT_SIZE):
+                segment.close()
+                raise RuntimeError(f"Shared memory segment {name} has another layout")
+            return segment
+
+        _untrack(segment)
+        HEADER.pack_into(
+            _buffer(segment), 0, MAGIC, FORMAT_VERSION, capacity, SLOT_SIZE, 0, 0
+        )
+        return segment
+
+    def _offset(self, index: int) -> int:
+        return HEADER_SIZE + index * SLOT_SIZE
+
+    def _is_live(self, index: int, now: float) -> bool:
+        offset = self._offset(index)
+        if self._buf[offset] != LIVE:
+            return False
+        return bool(struct.unpack_from("<d", self._buf, offset + 4)[0] > now)
+
+    def _find(self, key: bytes, now: float) -> Tuple[Optional[int], Optional[int]]:
+        """Slot holding ``key``, and the first slot a new entry could take."""
+        buf = self._buf
+        home = zlib.crc32(key) % self.capacity
+        free: Optional[int] = None
+        for probe in range(self.capacity):
+            index = (home + probe) % self.capacity
+            offset = self._offset(index)
+            state = buf[offset]
+            if state == EMPTY:
+                return None, free if free is not None else index
+            if state == TOMBSTONE:
+                if free is None:
+                    free = index
+                continue
+
+            fields = SLOT_HEAD.unpack_from(buf, offset)
+            expired = fields[4] <= now
+            if fields[7][: fields[6]] == key:
+                if expired:
+                    self._bury(index)
+                    return None, free if free is not None else index
+                return index, None
+            if expired and free is None:
+                free = index
+        return None, free
+
+    def _crowded(self) -> bool:
+        _, _, capacity, _, live, tombstones = HEADER.unpack_from(self._buf, 0)
+        # Tombstones never stop a probe, so long runs of them make misses slow.
+        return bool(live + tombstones > capacity * 3 // 4)
+
+    def _claim(self, index: int) -> None:
+        offset = self._offset(index)
+        state = self._buf[offset]
+        live, tombstones = self._live_counts()
+        if state == TOMBSTONE:
+            tombstones -= 1
+        if state != LIVE:
+            live += 1
+        self._set_counts(live, tombstones)
+
+    def _bury(self, index: int) -> None:
+        self._buf[self._offset(index)] = TOMBSTONE
+        live, tombstones = self._live_counts()
+        self._set_counts(live - 1, tombstones + 1)
+
+    def _compact(self, now: float) -> None:
+        """Drop expired sessions and tombstones by rehashing the survivors."""
+        survivors: List[SessionRecord] = []
+        expiries: List[float] = []
+        for index in range(self.capacity):
+            if self._is_live(index, now):
+                survivors.append(self._read(index))
+                offset = self._offset(index)
+                expiries.append(struct.unpack_from("<d", self._buf, offset + 4)[0])
+
+        table_end = HEADER_SIZE + self.capacity * SLOT_SIZE
+        self._buf[HEADER_SIZE:table_end] = bytes(table_end - HEADER_SIZE)
+        self._set_counts(0, 0)
+        for record, expires_at in zip(survivors, expiries):
+            key = record.session_id.encode()
+            _, free = self._find(key, now)
+            assert free is not None
+            self._claim(free)
+            self._write(
+                free,
+                record,
+                key,
+                record.target_id.encode(),
+                [firearm_id.encode() for firearm_id in record.guess_ids],
+                expires_at,
+            )
+
+    def _live_counts(self) -> Tuple[int, int]:
+        _, _, _, _, live, tombstones = HEADER.unpack_from(self._buf, 0)
+        return live, tombstones
+
+    def _set_counts(self, live: int, tombstones: int) -> None:
+        struct.pack_into("<II", self._buf, HEADER.size - 8, live, tombstones)
+
+    def _write(
+        self,
+        index: int,
+        record: SessionRecord,
+        key: bytes,
+        target: bytes,
+        guess_ids: List[bytes],
+        expires_at: float,
+    ) -> None:
+        offset = self._offset(index)
+        guess_offset = offset + SLOT_HEAD.size
+        for firearm_id, mask in zip(guess_ids, record.masks):
+            GUESS.pack_into(self._buf, guess_offset, mask, len(firearm_id), firearm_id)
+            guess_offset += GUESS.size
+        SLOT_HEAD.pack_into(
+            self._buf,
+            offset,
+            LIVE,
+            record.flags,
+            record.max_guesses,
+            len(guess_ids),
+            expires_at,
+            record.created_at,
+            len(key),
+            key,
+            len(target),
+            target,
+        )
+
+    def _read(self, index: int) -> SessionRecord:
+        offset = self._offset(index)
+        (
+            _,
+            flags,
+            max_guesses,
+            guess_count,
+            _,
+            created_at,
+            key_length,
+            key,
+            target_length,
+            target,
+        ) = SLOT_HEAD.unpack_from(self._buf, offset)
+        guess_ids = []
+        masks = bytearray()
+        guess_offset = offset + SLOT_HEAD.size
+        for _ in range(guess_count):
+            mask, length, firearm_id = GUESS.unpack_from(self._buf, guess_offset)
+            guess_ids.append(firearm_id[:length].decode())
+            masks.append(mask)
+            guess_offset += GUESS.size
+        return SessionRecord(
+            session_id=key[:key_length].decode(),
+            target_id=target[:target_length].decode(),
+            created_at=created_at,
+            max_guesses=max_guesses,
+            guess_ids=guess_ids,
+            masks=masks,
+            flags=flags,
+        )
@@ -0,0 +1,64 @@
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+
+def _encode(position: List[Any]) -> str:
+    payload = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode(cursor: str) -> Optional[List[Any]]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        return None
+    return position if isinstance(position, list) and len(position) == 2 else None
+
+
+def encode_cursor(name: str, firearm_id: str) -> str:
+    """Opaque, URL-safe page cursor for a (name, id) position."""
+    return _encode([name, firearm_id])
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, str]]:
+    """The (name, id) position in ``cursor``, or None if it is malformed."""
+    position = _decode(cursor)
+    if position is None:
+        return None
+    name, firearm_id = position
+    if not isinstance(name, str) or not isinstance(firearm_id, str):
+        return None
+    return name, firearm_id
+
+
+def encode_session_cursor(created_at: float, session_id: str) -> str:
+    """Page cursor for a (created_at, session id) position."""
+    return _encode([created_at, session_id])
+
+
+def decode_session_cursor(cursor: str) -> Optional[Tuple[float, str]]:
+    """The (created_at, session id) position in ``cursor``, or None if malformed.
+
+    ``created_at`` must be a timestamp ``datetime`` can represent, since the
+    database backends compare it as one.
+    """
+    position = _decode(cursor)
+    if position is None:
+        return None
+    created_at, session_id = position
+    if (
+        isinstance(created_at, bool)
+        or not isinstance(created_at, (int, float))
+        or not isinstance(session_id, str)
+    ):
+        return None
+    try:
+        if not math.isfinite(created_at):
+            return None
+        datetime.fromtimestamp(created_at)
+    except (OverflowError, OSError, ValueError):
+        return None
+    return float(created_at), session_id
@@ -0,0 +1,27 @@
+from typing import Any, Dict, FrozenSet, Type, TypeVar
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+_FIELD_SETS: Dict[type, FrozenSet[str]] = {}
+_set = object.__setattr__
+
+
+def construct_trusted(model: Type[M], values: Dict[str, Any]) -> M:
+    """Build ``model`` from ``values`` with no validation or copying.
+
+    ``values`` must hold every field, already of the right type; it becomes
+    the instance's ``__dict__``. This is what ``model_construct`` does minus
+    its per-field default handling, which makes it several times faster on
+    hot paths that only ever see data this process has validated before.
+    """
+    fields_set = _FIELD_SETS.get(model)
+    if fields_set is None:
+        fields_set = _FIELD_SETS[model] = frozenset(model.model_fields)
+    instance = model.__new__(model)
+    _set(instance, "__dict__", values)
+    _set(instance, "__pydantic_fields_set__", set(fields_set))
+    _set(instance, "__pydantic_extra__", None)
+    _set(instance, "__pydantic_private__", None)
+    return instance
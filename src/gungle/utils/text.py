@@ -0,0 +1,11 @@
+import unicodedata
+
+
+def normalize_name(value: str) -> str:
+    """Fold a firearm name into its lookup key.
+
+    Case, punctuation and whitespace are dropped so that "AK-47", "ak47" and
+    "AK 47" all share the key "ak47".
+    """
+    folded = unicodedata.normalize("NFKC", value).casefold()
+    return "".join(ch for ch in folded if ch.isalnum())
@@ -0,0 +1,82 @@
+import asyncio
+import concurrent.futures
+import threading
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterator, List, TypeVar, Union
+
+T = TypeVar("T")
+
+_PUT_POLL_SECONDS = 0.2
+
+
+async def iterate_in_thread(
+    open_iterator: Callable[[], Iterator[T]],
+    batch_size: int = 500,
+    thread_name: str = "iterate-in-thread",
+) -> AsyncIterator[T]:
+    """Drive a blocking iterator from a dedicated thread, ``batch_size`` at a time.
+
+    An iterator that holds a session and server-side cursor has to be opened,
+    advanced and closed on one thread, so ``open_iterator`` is called there
+    too. A bounded queue keeps it from reading far ahead of a slow consumer,
+    and closing the stream early closes the iterator.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Union[List[T], Exception]]" = asyncio.Queue(2)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=_produce_batches,
+        args=(open_iterator, batch_size, loop, queue, stop),
+        name=thread_name,
+        daemon=True,
+    )
+    thread.start()
+    try:
+        while True:
+            batch = await queue.get()
+            if isinstance(batch, Exception):
+                raise batch
+            if not batch:
+                return
+            for item in batch:
+                yield item
+    finally:
+        # Also reached when a disconnect cancels the stream.
+        stop.set()
+
+
+def _produce_batches(
+    open_iterator: Callable[[], Iterator[T]],
+    batch_size: int,
+    loop: asyncio.AbstractEventLoop,
+    queue: "asyncio.Queue[Union[List[T], Exception]]",
+    stop: threading.Event,
+) -> None:
+    def put(item: Union[List[T], Exception]) -> bool:
+        future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        # Wake up now and then: a reader that went away never frees a slot.
+        while not stop.is_set():
+            try:
+                future.result(timeout=_PUT_POLL_SECONDS)
+                return True
+            except concurrent.futures.TimeoutError:
+                continue
+            except concurrent.futures.CancelledError:
+                break
+        future.cancel()
+        return False
+
+    iterator: Iterator[T] = iter(())
+    try:
+        iterator = open_iterator()
+        while not stop.is_set():
+            batch = list(islice(iterator, batch_size))
+            if not put(batch) or not batch:
+                return
+    except Exception as e:
+        if not stop.is_set() and not loop.is_closed():
+            put(e)
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,9 @@
+from pydantic import ValidationError
+
+
+def validation_message(error: ValidationError) -> str:
+    """One-line summary of a ValidationError, e.g. "caliber: Input should be ..."."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
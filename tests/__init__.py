@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# Keep the suite off the developer's database; settings are read on import.
+_test_dir = tempfile.mkdtemp(prefix="gungle-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_test_dir}/gungle.db")
+os.environ.setdefault("CATALOG_SNAPSHOT_PATH", f"{_test_dir}/gungle-catalog.bin")
+os.environ.setdefault("UPLOAD_DIR", f"{_test_dir}/uploads")
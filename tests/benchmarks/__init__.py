@@ -0,0 +1,9 @@
+import importlib
+import pkgutil
+
+
+def load_benchmarks() -> None:
+    """Import every ``bench_*`` module so its benchmarks register."""
+    for module in pkgutil.iter_modules(__path__):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"{__name__}.{module.name}")
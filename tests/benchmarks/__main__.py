@@ -0,0 +1,85 @@
+"""Run the hot-path microbenchmarks and compare them with a saved baseline.
+
+From the repository root::
+
+    python -m tests.benchmarks --save          # record a baseline
+    python -m tests.benchmarks                 # report regressions against it
+    python -m tests.benchmarks --sizes 1000 --filter make_guess
+
+Baselines are per machine, so they are kept out of git. The run exits with
+status 1 when any benchmark is slower than its baseline by more than the
+tolerance.
+"""
+
+import argparse
+import sys
+
+from . import load_benchmarks
+from .harness import (
+    BenchResult,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+DEFAULT_SIZES = [10, 1000, 100000]
+DEFAULT_BASELINE = ".benchmarks/baseline.json"
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--filter", help="only run benchmarks whose name has this")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="update the baseline")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="slowdown over the baseline reported as a regression (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    load_benchmarks()
+    baseline = load_baseline(args.baseline)
+
+    def report(result: BenchResult) -> None:
+        line = f"{result.key:<45}{_format_seconds(result.seconds):>12}"
+        previous = baseline.get(result.key)
+        if previous:
+            line += f"{result.seconds / previous:>9.2f}x baseline"
+        print(line, flush=True)
+
+    results = run_benchmarks(
+        args.sizes, args.filter, args.min_time, args.repeat, report=report
+    )
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Saved {len(results)} results to {args.baseline}")
+        return
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.result.key}: "
+            f"{_format_seconds(regression.baseline)} -> "
+            f"{_format_seconds(regression.result.seconds)} "
+            f"({regression.ratio:.2f}x)"
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+from itertools import cycle
+from typing import Callable, List, Tuple
+
+from src.gungle.models.firearm import Firearm
+
+from .fixtures import BenchContext
+from .harness import benchmark
+
+
+def _wrong_guesses(context: BenchContext) -> List[Tuple[str, str]]:
+    # Guessing the next firearm over is always wrong, so a session never ends.
+    names = context.catalog.names
+    positions = {firearm.id: i for i, firearm in enumerate(context.catalog.firearms)}
+    return [
+        (record.session_id, names[(positions[record.target_id] + 1) % len(names)])
+        for record in context.sessions
+    ]
+
+
+@benchmark("game.make_guess_by_name")
+def bench_make_guess(context: BenchContext) -> Callable[[], object]:
+    guesses = cycle(_wrong_guesses(context))
+    service = context.service
+    store = context.store
+
+    def guess() -> object:
+        session_id, name = next(guesses)
+        # Guesses save a new record, so rewind whichever one is stored now.
+        record = store.get(session_id)
+        if record is not None and record.guess_count >= record.max_guesses - 1:
+            # Rewind rather than create sessions, keeping the population fixed.
+            record.guess_ids.clear()
+            record.masks.clear()
+        return service.make_guess_by_name(session_id, name)
+
+    return guess
+
+
+@benchmark("game.compare_firearms")
+def bench_compare_firearms(context: BenchContext) -> Callable[[], object]:
+    firearms = context.catalog.firearms
+    pairs: List[Tuple[Firearm, Firearm]] = [
+        (firearms[i], firearms[i * 7919 % len(firearms)])
+        for i in range(min(len(firearms), 4096))
+    ]
+    pending = cycle(pairs)
+    compare = context.service._compare_firearms
+    return lambda: compare(*next(pending))
+
+
+@benchmark("game.find_firearm_by_name")
+def bench_find_firearm_by_name(context: BenchContext) -> Callable[[], object]:
+    # Players type names in any case and spacing; aliases resolve too.
+    queries = [
+        variant
+        for firearm in context.firearms[:4096]
+        for variant in (firearm.name.upper(), f"  {firearm.name.lower()} ")
+    ]
+    pending = cycle(queries)
+    find = context.service._find_firearm_by_name
+    return lambda: find(next(pending))
+
+
+@benchmark("game.select_daily_firearm")
+def bench_select_daily_firearm(context: BenchContext) -> Callable[[], object]:
+    today = date.today()
+    days = [today + timedelta(days=offset) for offset in range(30)]
+    select = context.service._select_daily_firearm
+    for day in days:
+        select(day)  # schedule every day up front; timing covers lookups
+    pending = cycle(days)
+    return lambda: select(next(pending))
+
+
+@benchmark("game.guess_result_json")
+def bench_guess_result_json(context: BenchContext) -> Callable[[], object]:
+    session_id, name = _wrong_guesses(context)[0]
+    result = context.service.make_guess_by_name(session_id, name)
+    return result.model_dump_json
@@ -0,0 +1,9 @@
+from typing import Callable
+
+from .fixtures import BenchContext
+from .harness import benchmark
+
+
+@benchmark("repository.get_all_firearms")
+def bench_get_all_firearms(context: BenchContext) -> Callable[[], object]:
+    return context.firearm_repository.get_all_firearms
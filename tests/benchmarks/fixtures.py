@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from types import TracebackType
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from src.gungle.config import settings
+from src.gungle.database import Base, FirearmDB, create_sqlite_engine
+from src.gungle.models.firearm import (
+    ActionType,
+    Caliber,
+    Firearm,
+    FirearmType,
+    ModelType,
+    SessionFilter,
+)
+from src.gungle.models.session import SessionRecord
+from src.gungle.repositories.db_daily_schedule_repository import (
+    DbDailyScheduleRepository,
+)
+from src.gungle.repositories.db_firearm_repository import (
+    DbFirearmRepository,
+    firearm_columns,
+)
+from src.gungle.repositories.game_session_repository import GameSessionRepository
+from src.gungle.services import firearm_service as firearm_service_module
+from src.gungle.services.catalog import CatalogSnapshot
+from src.gungle.services.game_service import GameService
+from src.gungle.services.session_store import MemorySessionStore
+
+MANUFACTURERS = (
+    "Colt",
+    "Kalashnikov Concern",
+    "Heckler & Koch",
+    "Beretta",
+    "Walther",
+    "FN Herstal",
+    "Springfield Armory",
+    "Mauser",
+    "Sako",
+    "Steyr Mannlicher",
+)
+COUNTRIES = (
+    "United States",
+    "Soviet Union",
+    "Germany",
+    "Italy",
+    "Belgium",
+    "Finland",
+    "Austria",
+    "United Kingdom",
+)
+
+
+def synthetic_firearms(count: int) -> List[Firearm]:
+    """``count`` distinct, deterministic firearms spread over every enum."""
+    types = list(FirearmType)
+    calibers = list(Caliber)
+    model_types = list(ModelType)
+    actions = list(ActionType)
+    firearms = []
+    for i in range(count):
+        manufacturer = MANUFACTURERS[i % len(MANUFACTURERS)]
+        firearms.append(
+            Firearm(
+                id=f"bench-{i:06d}",
+                name=f"{manufacturer} Model {i}",
+                manufacturer=manufacturer,
+                type=types[i % len(types)],
+                caliber=calibers[i * 7 % len(calibers)],
+                country_of_origin=COUNTRIES[i * 3 % len(COUNTRIES)],
+                model_type=model_types[i % len(model_types)],
+                year_introduced=1850 + i % 175,
+                action_type=actions[i * 5 % len(actions)],
+                description=f"Synthetic benchmark firearm {i}",
+                image_url=f"/uploads/images/bench-{i:06d}.jpg",
+                aliases=[f"M{i}"] if i % 3 == 0 else [],
+            )
+        )
+    return firearms
+
+
+class NullSessionRepository(GameSessionRepository):
+    """Discards writes, so write-behind flushes never land inside a timing."""
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        return None
+
+    def iter_sessions(self, created_after: datetime) -> Iterator[SessionRecord]:
+        return iter(())
+
+    def count_sessions(self, created_after: datetime) -> int:
+        return 0
+
+    def list_sessions(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[SessionRecord]:
+        return []
+
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        pass
+
+    def get_stats(self) -> Dict[str, int]:
+        return {}
+
+    def save_sessions(self, sessions: Sequence[SessionRecord]) -> None:
+        pass
+
+    def replace_session(self, record: SessionRecord, guess_count: int) -> bool:
+        return True
+
+    def delete_sessions(self, session_ids: Sequence[str]) -> None:
+        pass
+
+    def delete_sessions_created_before(self, cutoff: datetime) -> int:
+        return 0
+
+
+class BenchContext:
+    """A synthetic catalog and session population of ``size`` each.
+
+    The catalog is written to a throwaway SQLite file and installed as the
+    shared catalog snapshot, which is what the game service reads; closing
+    the context invalidates it again so the real catalog reloads.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.firearms = synthetic_firearms(size)
+        self._directory = tempfile.mkdtemp(prefix="gungle-bench-")
+        self.engine = create_sqlite_engine(os.path.join(self._directory, "bench.db"))
+        Base.metadata.create_all(bind=self.engine)
+        self.session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine
+        )
+        with self.session_factory() as db:
+            db.execute(insert(FirearmDB), [firearm_columns(f) for f in self.firearms])
+            db.commit()
+        # A session per call, as in production: a long-lived one would serve
+        # repeat reads from its identity map and skip row hydration.
+        self.firearm_repository = DbFirearmRepository(
+            session_factory=self.session_factory
+        )
+
+        # Looked up per context, since test fixtures swap the shared service.
+        self._catalog_cache = firearm_service_module.firearm_service.catalog
+        self._catalog_cache.invalidate()
+        self.catalog: CatalogSnapshot = self._catalog_cache.install(
+            self._catalog_cache.version, self.firearms
+        )
+
+        self.store = MemorySessionStore(
+            NullSessionRepository(),
+            ttl_seconds=settings.SESSION_TIMEOUT_HOURS * 3600,
+            completed_ttl_seconds=settings.COMPLETED_SESSION_TTL_MINUTES * 60,
+            max_entries=max(size, settings.MAX_ACTIVE_SESSIONS),
+        )
+        now = time.time()
+        self.sessions: List[SessionRecord] = []
+        for i in range(size):
+            record = SessionRecord(
+                f"bench-session-{i:06d}",
+                self.firearms[i * 7919 % size].id,
+                created_at=now,
+                max_guesses=settings.MAX_GUESSES,
+            )
+            self.store.sessions.put(record.session_id, record)
+            self.sessions.append(record)
+        self.service = GameService(
+            schedule_repository=DbDailyScheduleRepository(self.session_factory),
+            session_store=self.store,
+        )
+
+    def close(self) -> None:
+        self.service.close()
+        self._catalog_cache.invalidate()
+        self.engine.dispose()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self) -> "BenchContext":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,114 @@
+import json
+import os
+import timeit
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .fixtures import BenchContext
+
+# A benchmark sets up against a context and returns the operation to time.
+Setup = Callable[[BenchContext], Callable[[], object]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Setup
+
+
+class BenchResult(NamedTuple):
+    name: str
+    size: int
+    seconds: float  # best time per operation over all repeats
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+
+class Regression(NamedTuple):
+    result: BenchResult
+    baseline: float
+
+    @property
+    def ratio(self) -> float:
+        return self.result.seconds / self.baseline
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS.append(Benchmark(name, setup))
+        return setup
+
+    return register
+
+
+def time_operation(
+    operation: Callable[[], object], min_time: float = 0.2, repeat: int = 5
+) -> float:
+    """Best seconds per call, each repeat running for at least ``min_time``."""
+    timer = timeit.Timer(operation)
+    number = 1
+    elapsed = timer.timeit(number)
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, timer.timeit(number))
+    return best / number
+
+
+def run_benchmarks(
+    sizes: Sequence[int],
+    selected: Optional[str] = None,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    report: Callable[[BenchResult], None] = lambda result: None,
+) -> List[BenchResult]:
+    results = []
+    for size in sizes:
+        with BenchContext(size) as context:
+            for bench in BENCHMARKS:
+                if selected and selected not in bench.name:
+                    continue
+                operation = bench.setup(context)
+                operation()  # warm caches and lazy indexes before timing
+                seconds = time_operation(operation, min_time, repeat)
+                result = BenchResult(bench.name, size, seconds)
+                report(result)
+                results.append(result)
+    return results
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    try:
+        with open(path) as source:
+            loaded = json.load(source)
+    except FileNotFoundError:
+        return {}
+    return {key: float(seconds) for key, seconds in loaded.items()}
+
+
+def save_baseline(path: str, results: Iterable[BenchResult]) -> None:
+    baseline = load_baseline(path)
+    baseline.update({result.key: result.seconds for result in results})
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as output:
+        json.dump(baseline, output, indent=1, sort_keys=True)
+        output.write("\n")
+
+
+def find_regressions(
+    results: Iterable[BenchResult], baseline: Dict[str, float], tolerance: float
+) -> List[Regression]:
+    """Results slower than their baseline by more than ``tolerance``."""
+    return [
+        Regression(result, baseline[result.key])
+        for result in results
+        if result.key in baseline
+        and result.seconds > baseline[result.key] * (1 + tolerance)
+    ]
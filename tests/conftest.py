@@ -8,6 +8,10 @@ from sqlalchemy.orm import sessionmaker
 from src.gungle.database import Base, get_db
 from src.gungle.main import app
 from src.gungle.repositories.test_firearm_repository import TestFirearmRepository
+from src.gungle.repositories.threaded_firearm_repository import (
+    ThreadedFirearmRepository,
+)
+from src.gungle.services.async_firearm_service import AsyncFirearmService
 from src.gungle.services.firearm_service import FirearmService
 
 
@@ -38,21 +42,35 @@ def client() -> Generator[TestClient, None, None]:
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_firearm_service() -> Generator:
     import src.gungle.api.v1.endpoints.firearms as firearms_endpoint_module
+    import src.gungle.api.v1.endpoints.game as game_endpoint_module
+    import src.gungle.services.async_firearm_service as async_service_module
     import src.gungle.services.firearm_service as firearm_service_module
     import src.gungle.services.game_service as game_service_module
 
     test_repository = TestFirearmRepository()
     test_service = FirearmService(repository=test_repository)
+    test_async_service = AsyncFirearmService(
+        ThreadedFirearmRepository(test_repository), test_service.catalog
+    )
 
     original_service = firearm_service_module.firearm_service
+    original_async_service = async_service_module.async_firearm_service
 
     firearm_service_module.firearm_service = test_service
     game_service_module.firearm_service = test_service
     firearms_endpoint_module.firearm_service = test_service
+    async_service_module.async_firearm_service = test_async_service
+    firearms_endpoint_module.async_firearm_service = test_async_service
+    game_endpoint_module.async_firearm_service = test_async_service
 
     yield test_service
 
     firearm_service_module.firearm_service = original_service
+    game_service_module.firearm_service = original_service
+    firearms_endpoint_module.firearm_service = original_service
+    game_endpoint_module.async_firearm_service = original_async_service
+    firearms_endpoint_module.async_firearm_service = original_async_service
+    async_service_module.async_firearm_service = original_async_service
 
 
 @pytest.fixture
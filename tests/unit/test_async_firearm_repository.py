@@ -0,0 +1,61 @@
+import asyncio
+import tempfile
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.gungle.database import Base
+from src.gungle.repositories.async_db_firearm_repository import (
+    AsyncDbFirearmRepository,
+)
+
+
+async def _exercise_repository(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    repository = AsyncDbFirearmRepository(async_sessionmaker(engine))
+
+    firearms = await repository.get_all_firearms()
+    assert len(firearms) == 6
+
+    ak47 = await repository.get_firearm_by_id("ak47")
+    assert ak47 is not None
+    assert ak47.aliases == ["AK", "Kalashnikov"]
+
+    assert not await repository.add_firearm(ak47)
+    renamed = ak47.model_copy(update={"id": "akm", "name": "AKM"})
+    assert await repository.add_firearm(renamed)
+    assert await repository.update_firearm(
+        "akm", renamed.model_copy(update={"year_introduced": 1959})
+    )
+    updated = await repository.get_firearm_by_id("akm")
+    assert updated is not None
+    assert updated.year_introduced == 1959
+    assert not await repository.update_firearm("missing", renamed)
+    assert await repository.delete_firearm("akm")
+    assert not await repository.firearm_exists("akm")
+
+    names = [firearm.name async for firearm in repository.iter_firearms(batch_size=2)]
+    assert names == sorted(firearm.name for firearm in firearms)
+
+    await engine.dispose()
+
+
+def test_async_db_repository() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(_exercise_repository(f"sqlite+aiosqlite:///{directory}/async.db"))
+
+
+def test_firearm_endpoints_use_async_service(client: TestClient) -> None:
+    response = client.get("/api/v1/firearms/")
+    assert response.status_code == 200
+    assert len(response.json()) == 6
+
+    firearm = client.get("/api/v1/firearms/mp40").json()
+    firearm.update(id="mp40_copy", name="MP 40 Copy")
+    assert client.post("/api/v1/firearms/", json=firearm).status_code == 200
+    assert len(client.get("/api/v1/firearms/").json()) == 7
+
+    assert client.delete("/api/v1/firearms/mp40_copy").status_code == 200
+    assert client.get("/api/v1/firearms/mp40_copy").status_code == 404
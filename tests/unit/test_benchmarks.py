@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from tests.benchmarks import load_benchmarks
+from tests.benchmarks.harness import (
+    BENCHMARKS,
+    BenchResult,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+def test_every_benchmark_runs_on_a_small_catalog() -> None:
+    load_benchmarks()
+
+    results = run_benchmarks([10], min_time=0.001, repeat=1)
+
+    assert {result.name for result in results} == {b.name for b in BENCHMARKS}
+    assert "game.make_guess_by_name" in {result.name for result in results}
+    assert all(result.seconds > 0 for result in results)
+
+
+def test_regressions_are_reported_against_the_baseline(tmp_path: Path) -> None:
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, [BenchResult("a", 10, 1.0), BenchResult("b", 10, 1.0)])
+    save_baseline(path, [BenchResult("b", 10, 2.0)])
+    baseline = load_baseline(path)
+    assert baseline == {"a[10]": 1.0, "b[10]": 2.0}
+
+    results = [
+        BenchResult("a", 10, 1.2),
+        BenchResult("b", 10, 3.0),
+        BenchResult("c", 10, 9.0),
+    ]
+    regressions = find_regressions(results, baseline, tolerance=0.25)
+
+    assert [r.result.key for r in regressions] == ["b[10]"]
+    assert regressions[0].ratio == 1.5
@@ -0,0 +1,96 @@
+from typing import List
+
+from src.gungle.models.firearm import Firearm
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.services.catalog import CatalogCache
+from src.gungle.services.catalog_file import read_catalog_file, write_catalog_file
+from src.gungle.services.firearm_service import FirearmService
+
+
+def _firearms() -> List[Firearm]:
+    firearms = InMemoryFirearmRepository().get_all_firearms()
+    firearms.append(
+        firearms[0].model_copy(
+            update={
+                "id": "vz58",
+                "name": "Sa vz. 58 – Samopal",
+                "description": None,
+                "image_url": None,
+                "year_introduced": None,
+                "aliases": [],
+            }
+        )
+    )
+    return firearms
+
+
+def test_round_trip(tmp_path) -> None:
+    path = str(tmp_path / "catalog.bin")
+    write_catalog_file(path, _firearms())
+
+    assert read_catalog_file(path) == _firearms()
+    assert read_catalog_file(str(tmp_path / "missing.bin")) is None
+
+
+def test_corrupt_file_is_ignored(tmp_path) -> None:
+    path = tmp_path / "catalog.bin"
+    write_catalog_file(str(path), _firearms())
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert read_catalog_file(str(path)) is None
+    path.write_bytes(b"")
+    assert read_catalog_file(str(path)) is None
+
+
+def test_cache_boots_from_file_and_rewrites_it_on_change(tmp_path) -> None:
+    path = str(tmp_path / "catalog.bin")
+    loads: List[int] = []
+
+    def loader() -> List[Firearm]:
+        loads.append(1)
+        return _firearms()
+
+    cold = CatalogCache(path)
+    cold.get_or_load(loader)
+    cold.flush()
+    assert len(loads) == 1
+
+    warm = CatalogCache(path)
+    assert len(warm.get_or_load(loader)) == 7
+    assert len(loads) == 1
+
+    warm.invalidate()
+    warm.get_or_load(lambda: _firearms()[:3])
+    warm.flush()
+    assert len(CatalogCache(path).get_or_load(loader)) == 3
+    assert len(loads) == 1
+
+
+def test_stale_file_is_ignored_and_rewritten_on_invalidate(tmp_path) -> None:
+    path = str(tmp_path / "catalog.bin")
+    repository = InMemoryFirearmRepository()
+    first = FirearmService(repository, snapshot_path=path)
+    first.get_catalog()
+    first.catalog.flush()
+    assert read_catalog_file(path, repository.catalog_fingerprint()) is not None
+
+    # Written behind the file's back, as another process or a script would.
+    repository.delete_firearm("ak47")
+    assert read_catalog_file(path, repository.catalog_fingerprint()) is None
+    second = FirearmService(repository, snapshot_path=path)
+    assert "ak47" not in second.get_catalog().by_id
+    second.catalog.flush()
+
+    # A write through the service regenerates the file straight away.
+    second.delete_firearm("mp40")
+    second.catalog.flush()
+    firearms = read_catalog_file(path, repository.catalog_fingerprint())
+    assert firearms is not None
+    assert {firearm.id for firearm in firearms} == {
+        firearm.id for firearm in repository.get_all_firearms()
+    }
+    assert "mp40" not in second.get_catalog().by_id
@@ -0,0 +1,132 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.gungle.config import settings
+from src.gungle.database import Base
+from src.gungle.repositories.db_firearm_repository import DbFirearmRepository
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.services.catalog_io import (
+    CatalogFormat,
+    export_firearms,
+    import_firearms,
+)
+from src.gungle.services.firearm_service import FirearmService
+
+
+def _export(service: FirearmService, fmt: CatalogFormat) -> bytes:
+    return b"".join(export_firearms(service.get_catalog().firearms, fmt, 2))
+
+
+def test_export_import_round_trip() -> None:
+    source = FirearmService(InMemoryFirearmRepository())
+    for fmt in CatalogFormat:
+        target = FirearmService(InMemoryFirearmRepository())
+        target.repository._firearms = []  # type: ignore[attr-defined]
+
+        result = import_firearms(
+            target, io.BytesIO(_export(source, fmt)), fmt, batch_size=4
+        )
+
+        assert result.imported == 6
+        assert result.rejected == 0
+        assert target.get_all_firearms() == source.get_all_firearms()
+
+
+def test_import_reports_invalid_rows_and_keeps_the_rest() -> None:
+    service = FirearmService(InMemoryFirearmRepository())
+    ak47 = service.get_firearm_by_id("ak47")
+    assert ak47 is not None
+    body = "\n".join(
+        [
+            ak47.model_copy(update={"id": "akm", "name": "AKM"}).model_dump_json(),
+            "",
+            '{"id": "broken"}',
+            "not json",
+        ]
+    )
+
+    result = import_firearms(
+        service, io.BytesIO(body.encode()), CatalogFormat.JSONL, batch_size=1
+    )
+
+    assert result.imported == 1
+    assert result.rejected == 2
+    assert [error.line for error in result.errors] == [3, 4]
+    assert service.get_catalog().find_by_name("akm") is not None
+
+
+def test_db_repository_upserts_in_batches(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/catalog.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repository = DbFirearmRepository(db)
+    template = repository.get_firearm_by_id("ak47")
+    assert template is not None
+
+    firearms = [
+        template.model_copy(
+            update={"id": f"f{i}", "name": f"F{i}", "year_introduced": 1900 + i % 100}
+        )
+        for i in range(2000)
+    ]
+    assert repository.upsert_firearms(firearms) == set()
+    renamed = template.model_copy(update={"name": "Kalashnikov AK-47"})
+    assert repository.upsert_firearms([renamed]) == {"ak47"}
+
+    all_firearms = repository.get_all_firearms()
+    assert len(all_firearms) == 2006
+    updated = repository.get_firearm_by_id("ak47")
+    assert updated is not None and updated.name == "Kalashnikov AK-47"
+    f99 = repository.get_firearm_by_id("f99")
+    assert f99 is not None and f99.year_introduced == 1999
+    db.close()
+    engine.dispose()
+
+
+def test_import_and_export_endpoints(client: TestClient) -> None:
+    header = "id,name,manufacturer,type,caliber,country_of_origin,model_type,"
+    header += "year_introduced,action_type,description,image_url,aliases\n"
+    body = header + (
+        "vz58,Sa vz. 58,CZ,Rifle,7.62x39mm,Czechoslovakia,Military,1958,"
+        'Short-stroke Gas Piston,"Czech, not an AK",,Vz58|Samopal\n'
+    )
+
+    response = client.post(
+        "/api/v1/firearms/import", params={"format": "csv"}, content=body
+    )
+    try:
+        assert response.status_code == 200
+        assert response.json() == {"imported": 1, "rejected": 0, "errors": []}
+        vz58 = client.get("/api/v1/firearms/vz58").json()
+        assert vz58["aliases"] == ["Vz58", "Samopal"]
+        assert vz58["description"] == "Czech, not an AK"
+
+        export = client.get("/api/v1/firearms/export", params={"format": "csv"})
+        assert export.status_code == 200
+        assert export.headers["content-type"].startswith("text/csv")
+        assert export.text.startswith(header)
+        assert "vz58,Sa vz. 58" in export.text
+    finally:
+        client.delete("/api/v1/firearms/vz58")
+
+
+def test_import_rejects_bodies_that_are_not_utf8_or_too_large(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    line = b'{"id": "x", "name": "Caf\xe9"}\n'
+    response = client.post("/api/v1/firearms/import", content=line)
+    assert response.status_code == 400
+    assert "byte 24" in response.json()["detail"]
+
+    response = client.post("/api/v1/firearms/import", content=b"\xe2\x82")
+    assert response.status_code == 400
+
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 16)
+    response = client.post("/api/v1/firearms/import", content=b"{}\n" * 10)
+    assert response.status_code == 413
@@ -0,0 +1,101 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from src.gungle.models.firearm import AttributeComparison, ComparisonResult
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.services.comparison import (
+    ALL_CORRECT,
+    ATTRIBUTES,
+    LANE_BITS,
+    YEAR_BIT,
+    AttributeEncoder,
+    build_comparisons,
+    compare_codes,
+)
+
+
+def test_compare_codes_matches_attribute_equality() -> None:
+    firearms = InMemoryFirearmRepository().get_all_firearms()
+    encoder = AttributeEncoder()
+    fields = [
+        "manufacturer",
+        "type",
+        "caliber",
+        "action_type",
+        "country_of_origin",
+        "model_type",
+        "year_introduced",
+    ]
+
+    for guess in firearms:
+        for target in firearms:
+            mask = compare_codes(encoder.encode(guess), encoder.encode(target))
+            expected = sum(
+                1 << bit
+                for bit, field in enumerate(fields)
+                if getattr(guess, field) == getattr(target, field)
+            )
+            assert mask == expected
+
+        assert compare_codes(encoder.encode(guess), encoder.encode(guess)) == (
+            ALL_CORRECT
+        )
+
+
+def test_unknown_year_never_matches() -> None:
+    firearm = InMemoryFirearmRepository().get_all_firearms()[0]
+    unknown = firearm.model_copy(update={"year_introduced": None})
+    encoder = AttributeEncoder()
+
+    mask = compare_codes(encoder.encode(unknown), encoder.encode(unknown))
+
+    assert mask == ALL_CORRECT & ~YEAR_BIT
+
+
+def test_build_comparisons() -> None:
+    guess, target = InMemoryFirearmRepository().get_all_firearms()[:2]
+    encoder = AttributeEncoder()
+
+    mask = compare_codes(encoder.encode(guess), encoder.encode(target))
+    comparisons = build_comparisons(guess, target, mask)
+
+    assert [c.attribute for c in comparisons] == list(ATTRIBUTES)
+    caliber = comparisons[ATTRIBUTES.index("caliber")]
+    assert caliber.guess_value == guess.caliber.value
+    assert caliber.correct_value == target.caliber.value
+    assert caliber.result == ComparisonResult.INCORRECT
+    year = comparisons[ATTRIBUTES.index("year_introduced")]
+    assert year.guess_value == str(guess.year_introduced)
+
+
+def test_trusted_comparisons_match_validated_models() -> None:
+    guess, target = InMemoryFirearmRepository().get_all_firearms()[:2]
+    encoder = AttributeEncoder()
+    mask = compare_codes(encoder.encode(guess), encoder.encode(target))
+
+    for comparison in build_comparisons(guess, target, mask):
+        validated = AttributeComparison.model_validate(comparison.model_dump())
+        assert comparison == validated
+        assert comparison.model_dump_json() == validated.model_dump_json()
+
+
+def test_concurrent_encoding_never_shares_a_code() -> None:
+    template = InMemoryFirearmRepository().get_all_firearms()[0]
+    firearms = [
+        template.model_copy(update={"id": f"f{i}", "manufacturer": f"maker {i}"})
+        for i in range(2000)
+    ]
+    encoder = AttributeEncoder()
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            codes = list(pool.map(encoder.encode, firearms))
+    finally:
+        sys.setswitchinterval(previous)
+
+    shift = ATTRIBUTES.index("manufacturer") * LANE_BITS
+    lane = (1 << LANE_BITS) - 1
+    assert len({code >> shift & lane for code in codes}) == len(firearms)
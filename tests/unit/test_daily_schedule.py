@@ -0,0 +1,160 @@
+from datetime import date, timedelta
+from typing import Dict, Mapping, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.gungle.database import Base
+from src.gungle.repositories.daily_schedule_repository import DailyScheduleRepository
+from src.gungle.repositories.db_daily_schedule_repository import (
+    DbDailyScheduleRepository,
+)
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.services.catalog import CatalogSnapshot
+from src.gungle.services.daily_schedule import DailySchedule
+
+START = date(2024, 1, 1)
+
+
+class InMemoryScheduleRepository(DailyScheduleRepository):
+    def __init__(self) -> None:
+        self.entries: Dict[date, str] = {}
+        self.reads = 0
+
+    def get_range(self, start: date, end: date) -> Dict[date, str]:
+        self.reads += 1
+        return {d: fid for d, fid in self.entries.items() if start <= d <= end}
+
+    def add_entries(self, entries: Mapping[date, str]) -> None:
+        for day, firearm_id in entries.items():
+            self.entries.setdefault(day, firearm_id)
+
+    def replace_entry(self, day: date, previous_id: str, firearm_id: str) -> None:
+        if self.entries.get(day) == previous_id:
+            self.entries[day] = firearm_id
+
+
+class RacingScheduleRepository(InMemoryScheduleRepository):
+    """Another worker schedules ``rival_entries`` just after each read."""
+
+    def __init__(self, rival_entries: Mapping[date, str]) -> None:
+        super().__init__()
+        self.rival_entries = dict(rival_entries)
+
+    def get_range(self, start: date, end: date) -> Dict[date, str]:
+        entries = super().get_range(start, end)
+        self.entries.update(self.rival_entries)
+        self.rival_entries = {}
+        return entries
+
+
+def _catalog() -> CatalogSnapshot:
+    return CatalogSnapshot(1, InMemoryFirearmRepository().get_all_firearms())
+
+
+def _schedule(
+    repository: DailyScheduleRepository,
+    firearms: Optional[InMemoryFirearmRepository] = None,
+    **options: int,
+) -> DailySchedule:
+    firearms = firearms or InMemoryFirearmRepository()
+    return DailySchedule(repository, firearms.get_firearm_by_id, **options)
+
+
+def test_extend_schedules_ahead_without_repeats() -> None:
+    repository = InMemoryScheduleRepository()
+    schedule = _schedule(repository, days_ahead=29, no_repeat_days=30)
+
+    assert schedule.extend(START, _catalog()) == 30
+    assert schedule.extend(START, _catalog()) == 0
+
+    days = [repository.entries[START + timedelta(days=i)] for i in range(30)]
+    # Six firearms, so any six consecutive days are all different.
+    for i in range(len(days) - 5):
+        assert len(set(days[i : i + 6])) == 6
+
+
+def test_lookups_are_served_from_memory_and_survive_catalog_edits() -> None:
+    repository = InMemoryScheduleRepository()
+    schedule = _schedule(repository, days_ahead=7)
+    catalog = _catalog()
+    schedule.extend(START, catalog)
+    before = {d: schedule.firearm_for(d, catalog).id for d in repository.entries}
+    reads = repository.reads
+
+    template = catalog.firearms[0]
+    extra = [template.model_copy(update={"id": f"x{i}"}) for i in range(20)]
+    edited = CatalogSnapshot(2, list(catalog.firearms) + extra)
+
+    assert {d: schedule.firearm_for(d, edited).id for d in before} == before
+    assert repository.reads == reads
+
+
+def test_deleted_firearm_is_rescheduled() -> None:
+    repository = InMemoryScheduleRepository()
+    repository.entries[START] = "mp40"
+    firearms = InMemoryFirearmRepository()
+    schedule = _schedule(repository, firearms, days_ahead=0)
+    catalog = _catalog()
+
+    assert schedule.firearm_for(START, catalog).id == "mp40"
+
+    firearms.delete_firearm("mp40")
+    without_mp40 = CatalogSnapshot(2, firearms.get_all_firearms())
+    replacement = schedule.firearm_for(START, without_mp40)
+    assert replacement.id != "mp40"
+    assert repository.entries[START] == replacement.id
+
+
+def test_stale_catalog_never_reschedules_a_live_firearm() -> None:
+    repository = InMemoryScheduleRepository()
+    repository.entries[START] = "mp40"
+    schedule = _schedule(repository, days_ahead=0)
+
+    # mp40 is only missing from this worker's out-of-date snapshot.
+    stale = CatalogSnapshot(1, [f for f in _catalog().firearms if f.id != "mp40"])
+
+    assert schedule.firearm_for(START, stale).id == "mp40"
+    assert repository.entries[START] == "mp40"
+
+
+def test_concurrent_picks_win() -> None:
+    repository = RacingScheduleRepository({START: "m1_garand"})
+    schedule = _schedule(repository, days_ahead=0)
+
+    assert schedule.firearm_for(START, _catalog()).id == "m1_garand"
+    assert repository.entries[START] == "m1_garand"
+
+
+def test_concurrent_reschedule_keeps_the_first_replacement() -> None:
+    repository = RacingScheduleRepository({})
+    repository.entries[START] = "mp40"
+    firearms = InMemoryFirearmRepository()
+    firearms.delete_firearm("mp40")
+    catalog = CatalogSnapshot(2, firearms.get_all_firearms())
+    schedule = _schedule(repository, firearms, days_ahead=0)
+    # Another worker replaces the deleted pick between our read and write.
+    repository.rival_entries = {START: "lee_enfield"}
+
+    assert schedule.firearm_for(START, catalog).id == "lee_enfield"
+    assert repository.entries[START] == "lee_enfield"
+
+
+def test_db_repository_keeps_existing_days(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/schedule.db")
+    Base.metadata.create_all(bind=engine)
+    repository = DbDailyScheduleRepository(sessionmaker(bind=engine))
+
+    repository.add_entries({START: "ak47", START + timedelta(days=1): "mp40"})
+    repository.add_entries({START: "m1_garand", START + timedelta(days=2): "ak47"})
+    repository.replace_entry(START + timedelta(days=1), "mp40", "colt_1911")
+    repository.replace_entry(START + timedelta(days=2), "mp40", "colt_1911")
+
+    assert repository.get_range(START, START + timedelta(days=5)) == {
+        START: "ak47",
+        START + timedelta(days=1): "colt_1911",
+        START + timedelta(days=2): "ak47",
+    }
+    engine.dispose()
@@ -0,0 +1,133 @@
+import tempfile
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.gungle.database import (
+    Base,
+    create_tables,
+    current_db_session,
+    session_scope,
+)
+from src.gungle.database.database import _configure, _engine_options
+from src.gungle.models.firearm import Firearm
+from src.gungle.repositories.db_firearm_repository import (
+    DbFirearmRepository,
+    firearm_from_db,
+    firearm_to_db,
+)
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+
+
+def test_file_sqlite_connections_use_wal_and_pooling() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = make_url(f"sqlite:///{directory}/pragmas.db")
+        options = _engine_options(url)
+        assert options["pool_size"] > 0
+        engine = _configure(create_engine(url, **options), url)
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        engine.dispose()
+
+
+def test_memory_sqlite_shares_one_connection() -> None:
+    options = _engine_options(make_url("sqlite://"))
+    assert options["poolclass"] is StaticPool
+
+
+def test_session_scope_reuses_the_request_session() -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    token = current_db_session.set(db)
+    try:
+        with session_scope() as scoped:
+            assert scoped is db
+
+        repository = DbFirearmRepository()
+        assert len(repository.get_all_firearms()) == 6
+        assert repository.firearm_exists("ak47")
+    finally:
+        current_db_session.reset(token)
+        db.close()
+        engine.dispose()
+
+    with session_scope() as scoped:
+        assert scoped is not db
+
+
+def test_firearm_rows_round_trip_without_validation() -> None:
+    repository = InMemoryFirearmRepository()
+
+    for firearm in repository.get_all_firearms():
+        loaded = firearm_from_db(firearm_to_db(firearm))
+        assert loaded == firearm
+        assert Firearm.model_validate(loaded.model_dump()) == loaded
+
+
+def test_create_tables_upgrades_a_baseline_database() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{directory}/baseline.db")
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE firearms ("
+                    "id VARCHAR PRIMARY KEY, name VARCHAR NOT NULL, "
+                    "manufacturer VARCHAR NOT NULL, type VARCHAR NOT NULL, "
+                    "caliber VARCHAR NOT NULL, country_of_origin VARCHAR NOT NULL, "
+                    "model_type VARCHAR NOT NULL, year_introduced INTEGER NOT NULL, "
+                    "description TEXT NOT NULL, action_type VARCHAR NOT NULL, "
+                    "image_url VARCHAR NOT NULL, created_at DATETIME, "
+                    "updated_at DATETIME)"
+                )
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO firearms VALUES ('ak47', 'AK-47', 'Kalashnikov', "
+                    "'Rifle', '7.62x39mm', 'Soviet Union', 'Military', 1947, "
+                    "'Assault rifle', 'Long-stroke Gas Piston', '/ak47.jpg', "
+                    "NULL, NULL)"
+                )
+            )
+
+        create_tables(bind=engine)
+        create_tables(bind=engine)
+
+        db = sessionmaker(bind=engine)()
+        try:
+            firearms = DbFirearmRepository(db).get_all_firearms()
+        finally:
+            db.close()
+            engine.dispose()
+
+    assert [firearm.id for firearm in firearms] == ["ak47"]
+    assert firearms[0].aliases == []
+
+
+def test_failed_write_leaves_the_request_session_usable() -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repository = DbFirearmRepository(db)
+    ak47 = repository.get_firearm_by_id("ak47")
+    assert ak47 is not None
+    try:
+        # A NOT NULL violation fails the flush inside the shared session.
+        broken = ak47.model_copy(update={"id": "broken", "name": None})
+        assert not repository.add_firearm(broken)
+        assert not repository.update_firearm("ak47", broken)
+
+        assert repository.delete_firearm("mp40")
+        assert not repository.firearm_exists("mp40")
+    finally:
+        db.close()
+        engine.dispose()
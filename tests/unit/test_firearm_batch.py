@@ -0,0 +1,162 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.gungle.database import Base
+from src.gungle.models.firearm import BatchStatus, FirearmPatch
+from src.gungle.repositories.db_firearm_repository import DbFirearmRepository
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.services.firearm_service import FirearmService
+
+
+def test_db_repository_bulk_patch_and_delete(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/batch.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repository = DbFirearmRepository(db)
+
+    found = repository.patch_firearms(
+        {
+            "ak47": {"year_introduced": 1948, "aliases": ["AK"]},
+            "mp40": {"name": "MP-40"},
+            "missing": {"name": "Nope"},
+        }
+    )
+    assert found == {"ak47", "mp40"}
+    ak47 = repository.get_firearm_by_id("ak47")
+    assert ak47 is not None
+    assert (ak47.year_introduced, ak47.aliases) == (1948, ["AK"])
+    mp40 = repository.get_firearm_by_id("mp40")
+    assert mp40 is not None and mp40.name == "MP-40"
+
+    assert repository.update_firearm("mp40", mp40.model_copy(update={"name": "MP40"}))
+    assert not repository.update_firearm("missing", mp40)
+
+    assert repository.delete_firearms(["ak47", "missing"]) == {"ak47"}
+    assert len(repository.get_all_firearms()) == 5
+    assert repository.delete_firearm("mp40")
+    # Deleted firearms stay resolvable for the sessions that used them.
+    archived = repository.get_archived_firearm("ak47")
+    assert archived is not None and archived.aliases == ["AK"]
+    archived = repository.get_archived_firearm("mp40")
+    assert archived is not None and archived.name == "MP40"
+    assert repository.get_archived_firearm("colt_1911") is None
+    db.close()
+    engine.dispose()
+
+
+def test_batch_upsert_reports_what_the_database_held(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/upsert.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    service = FirearmService(DbFirearmRepository(db))
+    ak47 = service.get_catalog().by_id["ak47"]
+    # Another writer adds a firearm after the snapshot was cached.
+    other = DbFirearmRepository(sessionmaker(bind=engine)())
+    assert other.upsert_firearms([ak47.model_copy(update={"id": "akm"})]) == set()
+
+    response = service.batch_upsert(
+        [
+            ak47.model_copy(update={"id": "akm", "name": "AKM"}),
+            ak47.model_copy(update={"id": "ak74", "name": "AK-74"}),
+            ak47.model_copy(update={"id": "ak74", "name": "AK-74M"}),
+        ]
+    )
+
+    assert [result.status for result in response.results] == [
+        BatchStatus.UPDATED,
+        BatchStatus.CREATED,
+        BatchStatus.UPDATED,
+    ]
+    catalog = service.get_catalog()
+    assert (catalog.by_id["akm"].name, catalog.by_id["ak74"].name) == (
+        "AKM",
+        "AK-74M",
+    )
+    other.db_session.close()
+    db.close()
+    engine.dispose()
+
+
+def test_batch_delete_reports_a_repeated_id_once() -> None:
+    service = FirearmService(InMemoryFirearmRepository())
+
+    response = service.batch_delete(["ak47", "missing", "ak47"])
+
+    assert [result.status for result in response.results] == [
+        BatchStatus.DELETED,
+        BatchStatus.NOT_FOUND,
+        BatchStatus.NOT_FOUND,
+    ]
+    assert (response.succeeded, response.failed) == (1, 2)
+    assert "ak47" not in service.get_catalog().by_id
+
+
+def test_batch_patch_reports_each_item_and_invalidates_once() -> None:
+    service = FirearmService(InMemoryFirearmRepository())
+    version = service.get_catalog().version
+
+    response = service.batch_patch(
+        [
+            FirearmPatch(id="ak47", year_introduced=1949),
+            FirearmPatch(id="missing", name="Nope"),
+            FirearmPatch(id="m1_garand", description="Semi-automatic rifle"),
+            FirearmPatch(id="m1_garand", name="M1 Rifle"),
+        ]
+    )
+
+    assert [result.status for result in response.results] == [
+        BatchStatus.UPDATED,
+        BatchStatus.NOT_FOUND,
+        BatchStatus.UPDATED,
+        BatchStatus.UPDATED,
+    ]
+    assert (response.succeeded, response.failed) == (3, 1)
+    assert service.catalog.version == version + 1
+    catalog = service.get_catalog()
+    assert catalog.by_id["ak47"].year_introduced == 1949
+    m1 = catalog.by_id["m1_garand"]
+    assert (m1.name, m1.description) == ("M1 Rifle", "Semi-automatic rifle")
+
+
+def test_batch_endpoints(client: TestClient) -> None:
+    ak47 = client.get("/api/v1/firearms/ak47").json()
+    copies = [dict(ak47, id=f"batch{i}", name=f"Batch {i}") for i in range(3)]
+
+    response = client.post("/api/v1/firearms/batch", json=copies + [ak47])
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == [
+        "created",
+        "created",
+        "created",
+        "updated",
+    ]
+
+    response = client.patch(
+        "/api/v1/firearms/batch",
+        json=[{"id": "batch0", "caliber": "9mm"}, {"id": "batch1", "caliber": "x"}],
+    )
+    assert response.status_code == 422
+
+    response = client.patch(
+        "/api/v1/firearms/batch", json=[{"id": "batch0", "caliber": "9mm"}]
+    )
+    assert response.json()["succeeded"] == 1
+    assert client.get("/api/v1/firearms/batch0").json()["caliber"] == "9mm"
+
+    response = client.post(
+        "/api/v1/firearms/batch/delete", json=["batch0", "batch1", "batch2", "nope"]
+    )
+    assert response.json() == {
+        "succeeded": 3,
+        "failed": 1,
+        "results": [
+            {"id": "batch0", "status": "deleted", "detail": None},
+            {"id": "batch1", "status": "deleted", "detail": None},
+            {"id": "batch2", "status": "deleted", "detail": None},
+            {"id": "nope", "status": "not_found", "detail": None},
+        ],
+    }
+    assert client.get("/api/v1/firearms/batch0").status_code == 404
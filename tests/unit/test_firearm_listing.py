@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.gungle.database import Base
+from src.gungle.models.firearm import FirearmFilter, FirearmType
+from src.gungle.repositories.db_firearm_repository import DbFirearmRepository
+from src.gungle.utils.cursor import decode_cursor, encode_cursor
+
+
+def test_db_repository_filters_and_pages_by_name_and_id(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/listing.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    repository = DbFirearmRepository(db)
+
+    rifles = FirearmFilter(type=FirearmType.RIFLE)
+    first = repository.list_firearms(rifles, 2)
+    assert [f.name for f in first] == ["AK-47", "Lee-Enfield"]
+    rest = repository.list_firearms(rifles, 2, (first[-1].name, first[-1].id))
+    assert [f.name for f in rest] == ["M1 Garand"]
+
+    ww2 = FirearmFilter(country_of_origin="United States", year_min=1920, year_max=1940)
+    assert [f.id for f in repository.list_firearms(ww2, 10)] == [
+        "m1_garand",
+        "thompson_m1928",
+    ]
+
+    plan = db.execute(
+        text("EXPLAIN QUERY PLAN SELECT id FROM firearms WHERE caliber = '9mm'")
+    ).fetchall()
+    assert any("ix_firearms_caliber" in str(row) for row in plan)
+    db.close()
+    engine.dispose()
+
+
+def test_cursor_round_trip() -> None:
+    assert decode_cursor(encode_cursor("AK-47", "ak47")) == ("AK-47", "ak47")
+    assert decode_cursor("not a cursor") is None
+    assert decode_cursor(encode_cursor("x", "y")[:-4]) is None
+
+
+def test_list_endpoint_filters_and_paginates(client: TestClient) -> None:
+    response = client.get("/api/v1/firearms/", params={"type": "Rifle", "limit": 2})
+    assert response.status_code == 200
+    assert [f["id"] for f in response.json()] == ["ak47", "lee_enfield"]
+    cursor = response.headers["x-next-cursor"]
+
+    response = client.get(
+        "/api/v1/firearms/", params={"type": "Rifle", "limit": 2, "cursor": cursor}
+    )
+    assert [f["id"] for f in response.json()] == ["m1_garand"]
+    assert "x-next-cursor" not in response.headers
+
+    response = client.get("/api/v1/firearms/", params={"year_max": 1911})
+    assert {f["id"] for f in response.json()} == {"colt_1911", "lee_enfield"}
+
+    assert client.get("/api/v1/firearms/", params={"cursor": "bad"}).status_code == 400
+    assert client.get("/api/v1/firearms/", params={"type": "Laser"}).status_code == 422
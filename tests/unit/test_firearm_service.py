@@ -0,0 +1,95 @@
+from typing import List, Optional
+
+from src.gungle.models.firearm import Firearm
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.services.firearm_service import FirearmService
+
+
+class CountingRepository(InMemoryFirearmRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.load_count = 0
+        self.archive_reads = 0
+
+    def get_all_firearms(self) -> List[Firearm]:
+        self.load_count += 1
+        return super().get_all_firearms()
+
+    def get_archived_firearm(self, firearm_id: str) -> Optional[Firearm]:
+        self.archive_reads += 1
+        return super().get_archived_firearm(firearm_id)
+
+
+def test_catalog_loaded_once() -> None:
+    repository = CountingRepository()
+    service = FirearmService(repository=repository)
+
+    for _ in range(10):
+        service.get_all_firearms()
+        service.get_firearm_by_id("ak47")
+        service.firearm_exists("mp40")
+
+    assert repository.load_count == 1
+
+
+def test_catalog_invalidated_on_write() -> None:
+    repository = CountingRepository()
+    service = FirearmService(repository=repository)
+
+    snapshot = service.get_catalog()
+    ak47 = service.get_firearm_by_id("ak47")
+    assert ak47 is not None
+
+    assert service.update_firearm("ak47", ak47.model_copy(update={"name": "AKM"}))
+    updated = service.get_catalog()
+
+    assert updated.version > snapshot.version
+    assert updated.by_id["ak47"].name == "AKM"
+    assert snapshot.by_id["ak47"].name == "AK-47"
+    assert repository.load_count == 2
+
+
+def test_failed_write_keeps_catalog() -> None:
+    repository = CountingRepository()
+    service = FirearmService(repository=repository)
+
+    snapshot = service.get_catalog()
+    assert not service.delete_firearm("does_not_exist")
+
+    assert service.get_catalog() is snapshot
+    assert repository.load_count == 1
+
+
+def test_archived_firearms_are_read_once_per_catalog_version() -> None:
+    repository = CountingRepository()
+    service = FirearmService(repository=repository)
+    ak47 = service.get_firearm_by_id("ak47")
+    assert ak47 is not None
+    assert service.delete_firearm("ak47")
+
+    for _ in range(5):
+        assert service.get_archived_firearm("ak47") == ak47
+        assert service.get_archived_firearm("missing") is None
+    assert repository.archive_reads == 2
+
+    renamed = ak47.model_copy(update={"name": "AKM"})
+    assert service.add_firearm(renamed)
+    assert service.delete_firearm("ak47")
+    assert service.get_archived_firearm("ak47") == renamed
+
+
+def test_sync_picks_up_writes_from_another_process() -> None:
+    repository = CountingRepository()
+    worker_a = FirearmService(repository=repository)
+    worker_b = FirearmService(repository=repository)
+    worker_b.get_catalog()
+    assert not worker_b.catalog.sync()
+
+    assert worker_a.delete_firearm("ak47")
+    assert "ak47" in worker_b.get_catalog().by_id
+
+    assert worker_b.catalog.sync()
+    assert "ak47" not in worker_b.get_catalog().by_id
+    assert not worker_b.catalog.sync()
@@ -0,0 +1,83 @@
+import hashlib
+import os
+from typing import Iterator
+
+from fastapi.testclient import TestClient
+
+from src.gungle.config import settings
+from src.gungle.services.image_store import IMAGES_DIR, sniff_image_type
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 64
+
+
+def _images() -> set:
+    return set(os.listdir(os.path.join(settings.UPLOAD_DIR, IMAGES_DIR)))
+
+
+def test_sniff_image_type() -> None:
+    assert sniff_image_type(PNG[:16]) == "png"
+    assert sniff_image_type(b"\xff\xd8\xff\xe0" + bytes(12)) == "jpg"
+    assert sniff_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert sniff_image_type(b"\x00\x00\x00\x1cftypavif\x00\x00") == "avif"
+    assert sniff_image_type(b"<html><body>") is None
+
+
+def test_upload_stores_by_hash_and_dedupes(client: TestClient) -> None:
+    original = client.get("/api/v1/firearms/ak47").json()["image_url"]
+    try:
+        response = client.put("/api/v1/firearms/ak47/image", content=PNG)
+        assert response.status_code == 200
+        body = response.json()
+        sha256 = hashlib.sha256(PNG).hexdigest()
+        assert body["sha256"] == sha256
+        assert body["size"] == len(PNG)
+        assert body["image_url"] == f"/uploads/images/{sha256[:32]}.png"
+        assert body["deduplicated"] is False
+        assert client.get("/api/v1/firearms/ak47").json()["image_url"] == (
+            body["image_url"]
+        )
+
+        def chunks() -> Iterator[bytes]:
+            for start in range(0, len(PNG), 1000):
+                yield PNG[start : start + 1000]
+
+        again = client.put("/api/v1/firearms/mp40/image", content=chunks()).json()
+        assert again["image_url"] == body["image_url"]
+        assert again["deduplicated"] is True
+        assert [name for name in _images() if name.startswith(".")] == []
+    finally:
+        client.patch(
+            "/api/v1/firearms/batch",
+            json=[
+                {"id": "ak47", "image_url": original},
+                {"id": "mp40", "image_url": "/uploads/images/mp40.jpg"},
+            ],
+        )
+
+
+def test_upload_rejections(client: TestClient) -> None:
+    before = _images()
+    limit = settings.MAX_UPLOAD_SIZE
+
+    response = client.put("/api/v1/firearms/missing/image", content=PNG)
+    assert response.status_code == 404
+
+    response = client.put("/api/v1/firearms/ak47/image", content=b"not an image!!!!")
+    assert response.status_code == 415
+
+    def oversized() -> Iterator[bytes]:
+        yield PNG
+        for _ in range(limit // 65536 + 1):
+            yield bytes(65536)
+
+    # Chunked, so only the streaming check can catch it.
+    response = client.put("/api/v1/firearms/ak47/image", content=oversized())
+    assert response.status_code == 413
+
+    response = client.put(
+        "/api/v1/firearms/ak47/image",
+        content=PNG,
+        headers={"Content-Length": str(limit + 1)},
+    )
+    assert response.status_code == 413
+    assert _images() == before
@@ -0,0 +1,64 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.gungle.api.static import ImmutableStaticFiles
+from src.gungle.services.image_variants import (
+    MANIFEST_NAME,
+    VARIANTS_DIR,
+    ImageVariantIndex,
+    build_image_variants,
+    local_image_path,
+)
+
+
+def test_local_image_path_stays_inside_upload_dir(tmp_path: Path) -> None:
+    upload_dir = str(tmp_path)
+    expected = os.path.join(upload_dir, "images", "ak47.jpg")
+
+    assert local_image_path(upload_dir, "/uploads/images/ak47.jpg") == expected
+    assert local_image_path(upload_dir, "/uploads/../secret.jpg") is None
+    assert local_image_path(upload_dir, "https://cdn.example.com/ak47.jpg") is None
+
+
+def test_build_image_variants(tmp_path: Path) -> None:
+    image_module = pytest.importorskip("PIL.Image")
+    images = tmp_path / "images"
+    images.mkdir()
+    image_module.new("RGB", (400, 200), (120, 80, 40)).save(images / "ak47.jpg")
+    url = "/uploads/images/ak47.jpg"
+
+    encoded = build_image_variants(
+        str(tmp_path), [url, "/uploads/images/missing.jpg"], [100, 800], ["webp"], 1
+    )
+
+    assert encoded == 1
+    manifest = json.loads((tmp_path / VARIANTS_DIR / MANIFEST_NAME).read_text())
+    variants = manifest[url]["variants"]
+    # 800 is wider than the source, so it is capped instead of upscaled.
+    assert [v["width"] for v in variants] == [100, 400]
+    for variant in variants:
+        assert variant["name"].startswith(f"ak47-{variant['width']}w.")
+        assert (tmp_path / VARIANTS_DIR / variant["name"]).is_file()
+
+    assert build_image_variants(str(tmp_path), [url], [100, 800], ["webp"], 1) == 0
+
+    index = ImageVariantIndex(str(tmp_path))
+    urls = [variant.url for variant in index.variants_for(url)]
+    assert urls == [f"/uploads/{VARIANTS_DIR}/{v['name']}" for v in variants]
+    assert index.variants_for("/uploads/images/other.jpg") == []
+
+
+def test_variants_are_served_as_immutable(tmp_path: Path) -> None:
+    (tmp_path / "ak47-100w.0123abcd.webp").write_bytes(b"RIFF")
+    app = FastAPI()
+    app.mount("/v", ImmutableStaticFiles(directory=str(tmp_path), max_age=60))
+
+    response = TestClient(app).get("/v/ak47-100w.0123abcd.webp")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "public, max-age=60, immutable"
@@ -16,3 +16,43 @@ def test_health_check(client: TestClient) -> None:
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
+
+
+def test_suggest_firearm_names_endpoint(client: TestClient) -> None:
+    response = client.get("/api/v1/game/firearm-names/suggest", params={"q": "tommy"})
+    assert response.status_code == 200
+    assert response.json() == ["Thompson M1928"]
+
+    response = client.get("/api/v1/game/firearm-names/suggest", params={"q": ""})
+    assert response.status_code == 422
+
+
+def test_catalog_endpoints_honor_if_none_match(client: TestClient) -> None:
+    for path in ("/api/v1/firearms/", "/api/v1/game/firearm-names"):
+        response = client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert response.json()
+
+        cached = client.get(path, headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        stale = client.get(path, headers={"If-None-Match": '"stale"'})
+        assert stale.status_code == 200
+
+
+def test_catalog_etag_changes_after_edit(client: TestClient) -> None:
+    etag = client.get("/api/v1/firearms/").headers["etag"]
+    original = client.get("/api/v1/firearms/ak47").json()
+    edited = dict(original, year_introduced=1948)
+    assert client.put("/api/v1/firearms/ak47", json=edited).status_code == 200
+    try:
+        response = client.get("/api/v1/firearms/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    finally:
+        client.put("/api/v1/firearms/ak47", json=original)
+
+    assert client.get("/api/v1/firearms/").headers["etag"] == etag
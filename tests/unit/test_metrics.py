@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.gungle.services.metrics import (
+    CATALOG_LOOKUPS,
+    DB_QUERY_DURATION,
+    HTTP_REQUESTS,
+    MetricsRegistry,
+    instrument_engine,
+)
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram(
+        "test_latency_seconds", "Test latency.", ("route",), buckets=(0.1, 1.0)
+    )
+    requests = registry.counter("test_requests_total", "Test requests.", ("route",))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/a")
+    requests.inc("/a")
+    requests.inc("/a", amount=2)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE test_latency_seconds histogram" in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_sum{route="/a"} 3.65' in lines
+    assert 'test_latency_seconds_count{route="/a"} 4' in lines
+    assert 'test_requests_total{route="/a"} 3' in lines
+
+
+def test_instrumented_engine_times_queries() -> None:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)
+    before = DB_QUERY_DURATION.count("SELECT")
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert DB_QUERY_DURATION.count("SELECT") == before + 1
+
+
+def test_metrics_endpoint_reports_route_templates(client: TestClient) -> None:
+    session_id = client.post("/api/v1/game/new").json()["session_id"]
+    route = "/api/v1/game/{session_id}/status"
+    before = HTTP_REQUESTS.value("GET", route, "200")
+    lookups = CATALOG_LOOKUPS.value("hit") + CATALOG_LOOKUPS.value("miss")
+
+    assert client.get(f"/api/v1/game/{session_id}/status").status_code == 200
+    # One lookup per request, however often the game service reads it.
+    assert CATALOG_LOOKUPS.value("hit") + CATALOG_LOOKUPS.value("miss") == lookups + 1
+    assert client.get("/api/v1/game/missing/status").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert HTTP_REQUESTS.value("GET", route, "200") == before + 1
+    body = response.text
+    not_found = f'{{method="GET",route="{route}",status="404"}}'
+    assert f"gungle_http_requests_total{not_found}" in body
+    assert "gungle_http_requests_in_flight 1" in body
+    assert 'gungle_catalog_cache_lookups_total{result="hit"}' in body
+    assert 'gungle_session_store{kind="active"}' in body
+    assert 'gungle_games_total{event="started"}' in body
+    assert session_id not in body
@@ -11,6 +11,7 @@ from src.gungle.models.firearm import (
     ModelType,
     NewGameResponse,
 )
+from src.gungle.models.session import SessionRecord
 
 
 def test_firearm_model() -> None:
@@ -87,3 +88,24 @@ def test_new_game_response() -> None:
     assert response.session_id == "test-session-123"
     assert response.firearm_image_url == "/uploads/images/test.jpg"
     assert response.max_guesses == 5
+
+
+def test_session_record() -> None:
+    record = SessionRecord("test-session-123", "target", created_at=0.0, max_guesses=2)
+
+    assert record.add_guess("other", 0b0000101) is False
+    assert record.add_guess("target", 0b1111111) is True
+    assert record.is_won
+    assert list(record.guesses()) == [("other", 5), ("target", 127)]
+
+    copy = record.copy()
+    copy.guess_ids.append("extra")
+    assert record.guess_count == 2
+
+
+def test_session_record_lost() -> None:
+    record = SessionRecord("test-session-123", "target", created_at=0.0, max_guesses=1)
+
+    assert record.add_guess("other", 0) is True
+    assert record.is_completed
+    assert not record.is_won
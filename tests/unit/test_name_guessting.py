@@ -4,6 +4,7 @@ from unittest.mock import patch
 import pytest
 
 from src.gungle.services.game_service import GameService
+from src.gungle.utils.text import normalize_name
 
 
 def test_get_available_firearm_names() -> None:
@@ -81,6 +82,19 @@ def test_case_insensitive_guessing() -> None:
     assert result.is_correct is True
 
 
+def test_normalized_name_guessing() -> None:
+    service = GameService()
+
+    for variant in ["AK-47", "ak47", "AK 47", "  ak_47 ", "Kalashnikov"]:
+        firearm = service._find_firearm_by_name(variant)
+        assert firearm is not None
+        assert firearm.id == "ak47"
+
+    assert normalize_name("Colt M1911") == normalize_name("colt-m 1911")
+    assert service._find_firearm_by_name("") is None
+    assert service._find_firearm_by_name("---") is None
+
+
 def test_game_status_with_guess_history() -> None:
     service = GameService()
 
@@ -275,3 +289,19 @@ def test_get_daily_firearm_public_method() -> None:
 
     assert daily_firearm.name == session.target_firearm.name
     assert daily_firearm.id == session.target_firearm.id
+
+
+def test_suggest_firearm_names_matches_names_aliases_and_words() -> None:
+    service = GameService()
+
+    assert service.suggest_firearm_names("ak") == ["AK-47"]
+    assert service.suggest_firearm_names("kalash") == ["AK-47"]
+    assert service.suggest_firearm_names("garand") == ["M1 Garand"]
+    assert service.suggest_firearm_names("m1") == [
+        "Colt M1911",
+        "M1 Garand",
+        "Thompson M1928",
+    ]
+    assert service.suggest_firearm_names("m", limit=2) == ["Colt M1911", "M1 Garand"]
+    assert service.suggest_firearm_names("- ") == []
+    assert service.suggest_firearm_names("zz") == []
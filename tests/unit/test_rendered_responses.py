@@ -0,0 +1,80 @@
+import json
+from datetime import date
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.gungle.models.firearm import DailyFirearmResponse, NewGameResponse
+from src.gungle.services import game_service as game_service_module
+from src.gungle.services.game_service import GameService
+from src.gungle.services.render_cache import RenderCache
+
+
+def test_render_cache_replaces_entries_when_key_changes() -> None:
+    cache = RenderCache()
+    renders = []
+
+    def render() -> int:
+        renders.append(1)
+        return len(renders)
+
+    assert cache.get("a", (1,), render) == 1
+    assert cache.get("a", (1,), render) == 1
+    assert cache.get("a", (2,), render) == 2
+    assert cache.get("b", (2,), render) == 3
+
+
+def test_new_game_json_splices_session_id_into_template() -> None:
+    service = GameService()
+    with patch.object(
+        service, "_render_new_game", wraps=service._render_new_game
+    ) as render:
+        first = NewGameResponse.model_validate_json(service.start_new_game_json())
+        second = NewGameResponse.model_validate_json(service.start_new_game_json())
+
+    assert render.call_count == 1
+    assert first.session_id != second.session_id
+    assert first.model_dump(exclude={"session_id"}) == second.model_dump(
+        exclude={"session_id"}
+    )
+    assert service._get_session(first.session_id) is not None
+    expected = service.start_new_game()
+    assert first.firearm_image_url == expected.firearm_image_url
+
+
+def test_rendered_responses_follow_date_and_catalog() -> None:
+    service = GameService()
+    catalog = game_service_module.firearm_service.catalog
+
+    with patch("src.gungle.services.game_service.date") as mock_date:
+        mock_date.today.return_value = date(2024, 1, 15)
+        first = service.get_daily_firearm_body()
+        assert service.get_daily_firearm_body() is first
+
+        catalog.invalidate()
+        after_edit = service.get_daily_firearm_body()
+        assert after_edit is not first
+        assert after_edit.etag == first.etag
+
+        mock_date.today.return_value = date(2024, 1, 16)
+        next_day = service.get_daily_firearm_body()
+        firearm = DailyFirearmResponse.model_validate_json(next_day.content).firearm
+        assert firearm.id == service._get_daily_firearm().id
+
+
+def test_game_endpoints_serve_rendered_bytes(client: TestClient) -> None:
+    response = client.post("/api/v1/game/new")
+    assert response.status_code == 200
+    session_id = response.json()["session_id"]
+    assert client.get(f"/api/v1/game/{session_id}/status").status_code == 200
+
+    response = client.get("/api/v1/game/daily-firearm")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Today's firearm"
+    assert json.loads(response.content)["firearm"]["id"]
+
+    cached = client.get(
+        "/api/v1/game/daily-firearm",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == 304
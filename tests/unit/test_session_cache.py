@@ -0,0 +1,79 @@
+from typing import List
+
+from src.gungle.services.session_cache import SessionCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(
+    clock: FakeClock, evicted: List[str], max_entries: int = 100
+) -> SessionCache:
+    return SessionCache(
+        ttl_seconds=60,
+        completed_ttl_seconds=10,
+        max_entries=max_entries,
+        on_evict=evicted.append,
+        clock=clock,
+    )
+
+
+def test_idle_sessions_expire() -> None:
+    clock = FakeClock()
+    evicted: List[str] = []
+    cache = _cache(clock, evicted)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    clock.now = 50
+    assert cache.get("a") == 1
+
+    clock.now = 70
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert evicted == ["b"]
+    assert cache.evictions == {"expired": 1, "lru": 0}
+
+
+def test_completed_sessions_expire_sooner() -> None:
+    clock = FakeClock()
+    evicted: List[str] = []
+    cache = _cache(clock, evicted)
+    cache.put("active", 1)
+    cache.put("done", 2)
+    cache.put("done", 2, completed=True)
+
+    clock.now = 11
+    assert cache.evict_expired() == 1
+    assert "done" not in cache
+    assert "active" in cache
+
+
+def test_size_cap_evicts_least_recently_used() -> None:
+    clock = FakeClock()
+    evicted: List[str] = []
+    cache = _cache(clock, evicted, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert evicted == ["b"]
+    assert sorted(cache.values()) == [1, 3]
+    assert cache.evictions == {"expired": 0, "lru": 1}
+
+
+def test_expiry_heap_stays_bounded() -> None:
+    clock = FakeClock()
+    evicted: List[str] = []
+    cache = _cache(clock, evicted, max_entries=10)
+    for i in range(1000):
+        cache.put(str(i), i)
+
+    assert len(cache) == 10
+    assert len(cache._expiry_heap) <= 2 * len(cache) + 64
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.gungle.models.firearm import SessionFilter
+from src.gungle.repositories.db_game_session_repository import (
+    DbGameSessionRepository,
+)
+from src.gungle.services.game_service import GameService
+from src.gungle.services.session_store import (
+    DatabaseSessionStore,
+    SessionStore,
+    sqlite_session_factory,
+)
+from src.gungle.utils.cursor import _encode, decode_session_cursor
+
+
+def _memory_service(tmp_path: Path) -> GameService:
+    # Totals are persisted, so each run needs a database of its own.
+    return GameService(session_repository=_sqlite_repository(tmp_path))
+
+
+def _sqlite_repository(tmp_path: Path) -> DbGameSessionRepository:
+    return DbGameSessionRepository(
+        sqlite_session_factory(str(tmp_path / "sessions.db"))
+    )
+
+
+def _sqlite_service(tmp_path: Path) -> GameService:
+    store: SessionStore = DatabaseSessionStore(
+        _sqlite_repository(tmp_path), ttl_seconds=3600
+    )
+    return GameService(session_store=store)
+
+
+def _play(service: GameService) -> List[str]:
+    """Five games: won in one guess, won in two, lost, and two unfinished."""
+    session_ids = [service.start_new_game().session_id for _ in range(5)]
+    session = service._get_session(session_ids[0])
+    assert session is not None
+    target = session.target_firearm.name
+    wrong = next(n for n in service.get_available_firearm_names() if n != target)
+
+    service.make_guess_by_name(session_ids[0], target)
+    service.make_guess_by_name(session_ids[1], wrong)
+    service.make_guess_by_name(session_ids[1], target)
+    for _ in range(5):
+        service.make_guess_by_name(session_ids[2], wrong)
+    service.make_guess_by_name(session_ids[3], wrong)
+    return session_ids
+
+
+@pytest.mark.parametrize("make_service", [_memory_service, _sqlite_service])
+def test_sessions_page_newest_first(make_service, tmp_path: Path) -> None:
+    service = make_service(tmp_path)
+    session_ids = _play(service)
+    started = datetime.now() - timedelta(minutes=1)
+    filters = SessionFilter(created_after=started)
+
+    seen: List[str] = []
+    page, after = service.list_sessions(filters, 2)
+    seen += [summary.session_id for summary in page]
+    while after is not None:
+        page, after = service.list_sessions(filters, 2, after)
+        seen += [summary.session_id for summary in page]
+
+    assert seen == list(reversed(session_ids))
+
+    completed, _ = service.list_sessions(SessionFilter(is_completed=True), 10)
+    assert {s.session_id for s in completed} == set(session_ids[:3])
+    won, _ = service.list_sessions(SessionFilter(is_won=True), 10)
+    assert {s.session_id for s in won} == set(session_ids[:2])
+    assert won[0].target_firearm_id and won[0].guesses_made in (1, 2)
+    future = SessionFilter(created_after=datetime.now() + timedelta(hours=1))
+    assert service.list_sessions(future, 10) == ([], None)
+    service.close()
+
+
+@pytest.mark.parametrize("make_service", [_memory_service, _sqlite_service])
+def test_session_stats_are_incremental(make_service, tmp_path: Path) -> None:
+    service = make_service(tmp_path)
+    _play(service)
+
+    stats = service.get_session_stats()
+
+    assert stats.started == 5
+    assert stats.completed == 3
+    assert stats.won == 2
+    assert stats.lost == 1
+    assert stats.win_rate == pytest.approx(2 / 3)
+    assert stats.guess_histogram == {1: 1, 2: 1}
+    assert stats.active >= 5
+    service.close()
+
+
+@pytest.mark.parametrize(
+    "position",
+    [
+        [float("inf"), "x"],
+        [float("nan"), "x"],
+        [1e300, "x"],
+        [10**400, "x"],
+        [True, "x"],
+        ["1700000000", "x"],
+        [1700000000, 7],
+    ],
+)
+def test_session_cursor_rejects_unusable_timestamps(
+    client: TestClient, position: List[object]
+) -> None:
+    cursor = _encode(position)
+    assert decode_session_cursor(cursor) is None
+    response = client.get("/api/v1/game/admin/sessions", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_session_cursor_round_trip() -> None:
+    assert decode_session_cursor(_encode([1700000000, "x"])) == (1700000000.0, "x")
+
+
+def test_admin_session_endpoints(client: TestClient) -> None:
+    for _ in range(3):
+        client.post("/api/v1/game/new")
+
+    response = client.get("/api/v1/game/admin/sessions", params={"limit": 2})
+    assert response.status_code == 200
+    first = response.json()
+    assert len(first) == 2 and "target_firearm" not in first[0]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/api/v1/game/admin/sessions", params={"limit": 2, "cursor": cursor}
+    )
+    assert response.status_code == 200
+    assert first[-1]["created_at"] >= response.json()[0]["created_at"]
+    assert not {s["session_id"] for s in first} & {
+        s["session_id"] for s in response.json()
+    }
+
+    response = client.get("/api/v1/game/admin/sessions", params={"cursor": "bad"})
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/v1/game/admin/sessions", params={"completed": "true", "limit": 500}
+    )
+    assert all(s["is_completed"] for s in response.json())
+
+    summary = client.get("/api/v1/game/admin/sessions/summary").json()
+    assert summary["started"] >= 3
+    assert set(summary) >= {"completed", "won", "win_rate", "guess_histogram"}
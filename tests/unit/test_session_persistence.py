@@ -0,0 +1,189 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import pytest
+
+import src.gungle.services.game_service as game_service_module
+from src.gungle.models.firearm import ComparisonResult, SessionFilter
+from src.gungle.models.session import SessionRecord
+from src.gungle.repositories.db_game_session_repository import (
+    DbGameSessionRepository,
+)
+from src.gungle.repositories.game_session_repository import GameSessionRepository
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.services.firearm_service import FirearmService
+from src.gungle.services.game_service import GameService
+from src.gungle.services.session_store import MemorySessionStore
+
+
+class RecordingSessionRepository(GameSessionRepository):
+    def __init__(self) -> None:
+        self.rows: Dict[str, SessionRecord] = {}
+        self.batches: List[int] = []
+        self.stats: Dict[str, int] = {}
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        return self.rows.get(session_id)
+
+    def iter_sessions(self, created_after: datetime) -> Iterator[SessionRecord]:
+        return (
+            row for row in self.rows.values() if row.created_datetime >= created_after
+        )
+
+    def count_sessions(self, created_after: datetime) -> int:
+        return sum(1 for _ in self.iter_sessions(created_after))
+
+    def list_sessions(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[SessionRecord]:
+        rows = sorted(
+            (row for row in self.rows.values() if filters.matches(row)),
+            key=lambda row: (row.created_at, row.session_id),
+            reverse=True,
+        )
+        if after is not None:
+            rows = [row for row in rows if (row.created_at, row.session_id) < after]
+        return rows[:limit]
+
+    def add_stats(self, deltas: Mapping[str, int]) -> None:
+        for name, value in deltas.items():
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+    def save_sessions(self, sessions: Sequence[SessionRecord]) -> None:
+        self.batches.append(len(sessions))
+        for session in sessions:
+            self.rows[session.session_id] = session
+
+    def replace_session(self, record: SessionRecord, guess_count: int) -> bool:
+        stored = self.rows.get(record.session_id)
+        if stored is None or stored.guess_count != guess_count:
+            return False
+        self.rows[record.session_id] = record
+        return True
+
+    def delete_sessions(self, session_ids: Sequence[str]) -> None:
+        for session_id in session_ids:
+            self.rows.pop(session_id, None)
+
+    def delete_sessions_created_before(self, cutoff: datetime) -> int:
+        expired = [
+            sid for sid, row in self.rows.items() if row.created_datetime < cutoff
+        ]
+        self.delete_sessions(expired)
+        return len(expired)
+
+
+def _wrong_name(service: GameService, session_id: str) -> str:
+    session = service._get_session(session_id)
+    assert session is not None
+    return next(
+        name
+        for name in service.get_available_firearm_names()
+        if name != session.target_firearm.name
+    )
+
+
+def test_writes_are_coalesced_into_one_batch() -> None:
+    repository = RecordingSessionRepository()
+    service = GameService(session_repository=repository)
+
+    session_ids = [service.start_new_game().session_id for _ in range(3)]
+    for session_id in session_ids:
+        service.make_guess_by_name(session_id, _wrong_name(service, session_id))
+
+    assert isinstance(service._sessions, MemorySessionStore)
+    service._sessions.writer.flush()
+
+    assert repository.batches == [3]
+    assert all(repository.rows[sid].guess_count == 1 for sid in session_ids)
+    service.close()
+
+
+def test_session_survives_restart() -> None:
+    repository = RecordingSessionRepository()
+    service = GameService(session_repository=repository)
+    session_id = service.start_new_game().session_id
+    wrong_name = _wrong_name(service, session_id)
+    service.make_guess_by_name(session_id, wrong_name)
+    stats = service.get_session_stats()
+    service.close()
+
+    restarted = GameService(session_repository=repository)
+    status = restarted.get_game_status(session_id)
+    restarted_stats = restarted.get_session_stats()
+
+    assert status is not None
+    assert status.guesses_made == 1
+    assert status.all_guess_results[0].guess_firearm.name == wrong_name
+    assert restarted.make_guess_by_name(session_id, wrong_name).remaining_guesses == 3
+    # The totals come back with the sessions, so the two views agree.
+    assert restarted_stats.started == stats.started == 1
+
+
+def test_unflushed_session_is_visible() -> None:
+    repository = RecordingSessionRepository()
+    service = GameService(session_repository=repository)
+    session_id = service.start_new_game().session_id
+    assert isinstance(service._sessions, MemorySessionStore)
+    service._sessions.sessions.clear()
+
+    assert service._get_session(session_id) is not None
+    assert repository.rows == {}
+    service.close()
+
+
+def test_db_repository_upserts() -> None:
+    service = GameService(session_repository=DbGameSessionRepository())
+    session_id = service.start_new_game().session_id
+    service.make_guess_by_name(session_id, _wrong_name(service, session_id))
+    service.close()
+
+    stored = DbGameSessionRepository().get_session(session_id)
+
+    assert stored is not None
+    assert stored.guess_count == 1
+    assert stored.is_completed is False
+
+
+def test_history_follows_catalog_edits_and_deletions(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    firearms = FirearmService(InMemoryFirearmRepository())
+    monkeypatch.setattr(game_service_module, "firearm_service", firearms)
+    service = GameService(session_repository=RecordingSessionRepository())
+    session_id = service.start_new_game().session_id
+    wrong_name = _wrong_name(service, session_id)
+    service.make_guess_by_name(session_id, wrong_name)
+    record = service._get_record(session_id)
+    assert record is not None
+    target = firearms.get_firearm_by_id(record.target_id)
+    guess = firearms.get_firearm_by_id(record.guess_ids[0])
+    assert target is not None and guess is not None
+
+    # The edit turns a mismatch into a match; history must show both sides.
+    edited = guess.model_copy(update={"manufacturer": target.manufacturer})
+    assert firearms.update_firearm(guess.id, edited)
+    assert firearms.delete_firearm(target.id)
+
+    status = service.get_game_status(session_id)
+    assert status is not None
+    [result] = status.all_guess_results
+    assert result.target_firearm == target
+    assert result.guess_firearm == edited
+    for comparison in result.comparisons:
+        matches = comparison.guess_value == comparison.correct_value
+        assert (comparison.result == ComparisonResult.CORRECT) == matches
+
+    assert firearms.delete_firearm(guess.id)
+    status = service.get_game_status(session_id)
+    assert status is not None
+    assert [r.guess_firearm.name for r in status.all_guess_results] == [wrong_name]
+    service.close()
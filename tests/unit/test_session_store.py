@@ -0,0 +1,289 @@
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import httpx
+import pytest
+
+import src.gungle.api.v1.endpoints.game as game_endpoint_module
+from src.gungle.main import app
+from src.gungle.models.firearm import SessionFilter
+from src.gungle.models.session import COMPLETED, SessionRecord
+from src.gungle.repositories.db_game_session_repository import (
+    DbGameSessionRepository,
+)
+from src.gungle.services.game_service import GameService
+from src.gungle.services.session_store import (
+    DatabaseSessionStore,
+    sqlite_session_factory,
+)
+from src.gungle.services.shm_session_store import SharedMemorySessionStore
+
+
+def _record(session_id: str, flags: int = 0) -> SessionRecord:
+    return SessionRecord(session_id, "ak47", created_at=time.time(), flags=flags)
+
+
+def _shm_store(
+    name: str, tmp_path: Path, capacity: int = 64, completed_ttl: float = 60
+) -> SharedMemorySessionStore:
+    return SharedMemorySessionStore(
+        name,
+        capacity=capacity,
+        ttl_seconds=3600,
+        completed_ttl_seconds=completed_ttl,
+        lock_path=str(tmp_path / "sessions.lock"),
+    )
+
+
+def _wrong_name(service: GameService, session_id: str) -> str:
+    session = service._get_session(session_id)
+    assert session is not None
+    return next(
+        name
+        for name in service.get_available_firearm_names()
+        if name != session.target_firearm.name
+    )
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path: Path) -> None:
+    path = str(tmp_path / "sessions.db")
+    worker_a = GameService(
+        session_store=DatabaseSessionStore(
+            DbGameSessionRepository(sqlite_session_factory(path)), ttl_seconds=3600
+        )
+    )
+    worker_b = GameService(
+        session_store=DatabaseSessionStore(
+            DbGameSessionRepository(sqlite_session_factory(path)), ttl_seconds=3600
+        )
+    )
+
+    session_id = worker_a.start_new_game().session_id
+    wrong_name = _wrong_name(worker_b, session_id)
+
+    assert worker_b.make_guess_by_name(session_id, wrong_name).remaining_guesses == 4
+    status = worker_a.get_game_status(session_id)
+    assert status is not None and status.guesses_made == 1
+    assert worker_a.get_session_counts() == {"active": 1}
+    assert [s.session_id for s in worker_b.iter_sessions()] == [session_id]
+
+
+def test_shm_store_is_shared_between_attachments(tmp_path: Path) -> None:
+    name = f"gungle-test-{uuid.uuid4().hex[:12]}"
+    first = _shm_store(name, tmp_path)
+    second = _shm_store(name, tmp_path)
+    try:
+        record = _record(str(uuid.uuid4()))
+        record.add_guess("mp40", 0b1010)
+        first.save(record)
+
+        stored = second.get(record.session_id)
+        assert stored is not None
+        assert stored.guess_ids == ["mp40"]
+        assert stored.masks == bytearray([0b1010])
+        assert stored.created_at == record.created_at
+
+        stored.add_guess("ak47", 0x7F)
+        second.save(stored)
+        updated = first.get(record.session_id)
+        assert updated is not None and updated.is_won
+        assert first.counts()["active"] == 1
+
+        second.tally(_record("a"))
+        first.tally(updated)
+        assert second.stats() == {"started": 1, "completed": 1, "won": 1, "won_in_2": 1}
+        assert first.get("missing") is None
+    finally:
+        first.unlink()
+        first.close()
+        second.close()
+
+
+def test_shm_store_reclaims_expired_slots(tmp_path: Path) -> None:
+    name = f"gungle-test-{uuid.uuid4().hex[:12]}"
+    store = _shm_store(name, tmp_path, capacity=8, completed_ttl=-1)
+    try:
+        # Completed sessions expire at once here, so their slots are reused.
+        for _ in range(20):
+            store.save(_record(str(uuid.uuid4()), flags=COMPLETED))
+        live = [_record(str(uuid.uuid4())) for _ in range(5)]
+        for record in live:
+            store.save(record)
+
+        assert sorted(r.session_id for r in store.values()) == sorted(
+            r.session_id for r in live
+        )
+        assert all(store.get(r.session_id) is not None for r in live)
+
+        for _ in range(3):
+            store.save(_record(str(uuid.uuid4())))
+        with pytest.raises(RuntimeError, match="full"):
+            store.save(_record(str(uuid.uuid4())))
+    finally:
+        store.unlink()
+        store.close()
+
+
+def test_game_service_runs_on_shm_store(tmp_path: Path) -> None:
+    name = f"gungle-test-{uuid.uuid4().hex[:12]}"
+    store = _shm_store(name, tmp_path)
+    try:
+        service = GameService(session_store=store)
+        session_id = service.start_new_game().session_id
+        session = service._get_session(session_id)
+        assert session is not None
+
+        result = service.make_guess_by_name(session_id, session.target_firearm.name)
+
+        assert result.is_correct is True
+        reveal = service.reveal_answer(session_id)
+        assert reveal is not None and reveal.is_won is True
+    finally:
+        store.unlink()
+        store.close()
+
+
+def test_stale_guess_saves_are_rejected_by_shared_stores(tmp_path: Path) -> None:
+    name = f"gungle-test-{uuid.uuid4().hex[:12]}"
+    shm = _shm_store(name, tmp_path)
+    path = str(tmp_path / "sessions.db")
+    sqlite = DatabaseSessionStore(
+        DbGameSessionRepository(sqlite_session_factory(path)), ttl_seconds=3600
+    )
+    try:
+        for store in (shm, sqlite):
+            record = _record(str(uuid.uuid4()))
+            store.save(record)
+            # Two workers read the same session, then both guess.
+            first, second = store.get(record.session_id), store.get(record.session_id)
+            assert first is not None and second is not None
+            first.add_guess("mp40", 0)
+            second.add_guess("colt_1911", 0)
+
+            assert store.save_if_unchanged(first, 0)
+            assert not store.save_if_unchanged(second, 0)
+            stored = store.get(record.session_id)
+            assert stored is not None and stored.guess_ids == ["mp40"]
+            assert not store.save_if_unchanged(_record("missing"), 0)
+    finally:
+        shm.unlink()
+        shm.close()
+
+
+def test_guess_is_retried_after_losing_to_another_worker(tmp_path: Path) -> None:
+    path = str(tmp_path / "sessions.db")
+    store, other_store = (
+        DatabaseSessionStore(
+            DbGameSessionRepository(sqlite_session_factory(path)), ttl_seconds=3600
+        )
+        for _ in range(2)
+    )
+    service = GameService(session_store=store)
+    session_id = service.start_new_game().session_id
+    wrong_name = _wrong_name(service, session_id)
+    other_worker = GameService(session_store=other_store)
+
+    read = store.get
+
+    def read_then_lose_the_race(session_id: str) -> Optional[SessionRecord]:
+        record = read(session_id)
+        if record is not None and record.guess_count == 0:
+            other_worker.make_guess_by_name(session_id, wrong_name)
+        return record
+
+    store.get = read_then_lose_the_race  # type: ignore[method-assign]
+    result = service.make_guess_by_name(session_id, wrong_name)
+
+    assert result.remaining_guesses == 3
+    status = other_worker.get_game_status(session_id)
+    assert status is not None and status.guesses_made == 2
+
+
+class ThreadRecordingRepository(DbGameSessionRepository):
+    """Notes the thread behind every session read and write."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(sqlite_session_factory(path))
+        self.threads: List[int] = []
+
+    def get_session(self, session_id: str) -> Optional[SessionRecord]:
+        self.threads.append(threading.get_ident())
+        return super().get_session(session_id)
+
+    def save_sessions(self, sessions: Sequence[SessionRecord]) -> None:
+        self.threads.append(threading.get_ident())
+        super().save_sessions(sessions)
+
+    def replace_session(self, record: SessionRecord, guess_count: int) -> bool:
+        self.threads.append(threading.get_ident())
+        return super().replace_session(record, guess_count)
+
+    def iter_sessions(self, created_after: datetime) -> Iterator[SessionRecord]:
+        for record in super().iter_sessions(created_after):
+            self.threads.append(threading.get_ident())
+            yield record
+
+    def list_sessions(
+        self,
+        filters: SessionFilter,
+        limit: int,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> List[SessionRecord]:
+        self.threads.append(threading.get_ident())
+        return super().list_sessions(filters, limit, after)
+
+    def get_stats(self) -> Dict[str, int]:
+        self.threads.append(threading.get_ident())
+        return super().get_stats()
+
+
+def test_sqlite_store_is_used_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repository = ThreadRecordingRepository(str(tmp_path / "sessions.db"))
+    service = GameService(
+        session_store=DatabaseSessionStore(repository, ttl_seconds=3600)
+    )
+    monkeypatch.setattr(game_endpoint_module, "game_service", service)
+
+    async def play() -> List[int]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test/api/v1/game"
+        ) as client:
+            started = await asyncio.gather(*(client.post("/new") for _ in range(8)))
+            session_ids = [response.json()["session_id"] for response in started]
+            wrong_name = await asyncio.to_thread(_wrong_name, service, session_ids[0])
+            guesses = await asyncio.gather(
+                *(
+                    client.post(f"/{session_id}/guess", json={"firearm_name": name})
+                    for session_id in session_ids
+                    for name in (wrong_name, wrong_name)
+                )
+            )
+            statuses = await asyncio.gather(
+                *(client.get(f"/{session_id}/status") for session_id in session_ids)
+            )
+            admin = await asyncio.gather(
+                client.get("/admin/sessions", params={"limit": 3}),
+                client.get(
+                    "/admin/sessions", headers={"Accept": "application/x-ndjson"}
+                ),
+                client.get("/admin/sessions/summary"),
+            )
+        responses = started + guesses + statuses + admin
+        assert all(r.status_code == 200 for r in responses)
+        page, dump, summary = admin
+        assert len(page.json()) == 3
+        assert len(dump.text.splitlines()) == 8
+        assert summary.json()["started"] == 8
+        return [status.json()["guesses_made"] for status in statuses]
+
+    loop_thread = threading.get_ident()
+    assert asyncio.run(play()) == [2] * 8
+    assert repository.threads and loop_thread not in repository.threads
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import threading
+from typing import Iterator, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.gungle.api.streaming import encode_json_stream
+from src.gungle.database import Base
+from src.gungle.models.firearm import Firearm, NameGuessRequest
+from src.gungle.repositories.db_firearm_repository import DbFirearmRepository
+from src.gungle.repositories.test_firearm_repository import (
+    TestFirearmRepository as InMemoryFirearmRepository,
+)
+from src.gungle.repositories.threaded_firearm_repository import (
+    ThreadedFirearmRepository,
+)
+
+
+def _encode(count: int, ndjson: bool) -> List[bytes]:
+    items = [NameGuessRequest(firearm_name=f"f{i}") for i in range(count)]
+
+    async def collect() -> List[bytes]:
+        return [chunk async for chunk in encode_json_stream(items, ndjson, 2)]
+
+    return asyncio.run(collect())
+
+
+def test_encode_json_stream_chunks_arrays_and_ndjson() -> None:
+    chunks = _encode(5, ndjson=False)
+    assert len(chunks) == 3
+    assert json.loads(b"".join(chunks)) == [{"firearm_name": f"f{i}"} for i in range(5)]
+    assert json.loads(b"".join(_encode(0, ndjson=False))) == []
+
+    lines = b"".join(_encode(3, ndjson=True)).splitlines()
+    assert [json.loads(line)["firearm_name"] for line in lines] == ["f0", "f1", "f2"]
+    assert _encode(0, ndjson=True) == []
+
+
+def test_db_repository_iterates_with_a_server_side_cursor(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/stream.db")
+    Base.metadata.create_all(bind=engine)
+    repository = DbFirearmRepository()
+    repository.db_session = sessionmaker(bind=engine)()
+
+    ids = [firearm.id for firearm in repository.iter_firearms(batch_size=2)]
+    assert len(ids) == 6 and ids[0] == "ak47"
+    repository.db_session.close()
+    engine.dispose()
+
+
+class CursorRepository(InMemoryFirearmRepository):
+    """Records which threads advance and close the row iterator."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads: List[str] = []
+        self.closed = threading.Event()
+
+    def iter_firearms(self, batch_size: int = 500) -> Iterator[Firearm]:
+        try:
+            for firearm in super().iter_firearms(batch_size):
+                self.threads.append(threading.current_thread().name)
+                yield firearm
+        finally:
+            self.threads.append(threading.current_thread().name)
+            self.closed.set()
+
+
+def test_threaded_stream_stays_on_one_thread_and_closes_early() -> None:
+    repository = CursorRepository()
+    threaded = ThreadedFirearmRepository(repository)
+
+    async def read(count: int) -> List[str]:
+        stream = threaded.iter_firearms(batch_size=2)
+        ids = []
+        async for firearm in stream:
+            ids.append(firearm.id)
+            if len(ids) == count:
+                break
+        await stream.aclose()
+        return ids
+
+    assert len(asyncio.run(read(100))) == 6
+    assert repository.closed.wait(5)
+    assert set(repository.threads) == {"firearm-stream"}
+
+    repository.closed.clear()
+    repository.threads.clear()
+    # A client that disconnects early must not leave the cursor open.
+    assert len(asyncio.run(read(1))) == 1
+    assert repository.closed.wait(5)
+    assert set(repository.threads) == {"firearm-stream"}
+
+
+def test_streaming_endpoints(client: TestClient) -> None:
+    response = client.get(
+        "/api/v1/firearms/", headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    firearms = [json.loads(line) for line in response.text.splitlines()]
+    assert len(firearms) == 6
+
+    session_id = client.post("/api/v1/game/new").json()["session_id"]
+    response = client.get("/api/v1/game/admin/sessions")
+    assert response.status_code == 200
+    sessions = response.json()
+    assert session_id in {session["session_id"] for session in sessions}